@@ -0,0 +1,67 @@
+"""add chat message seq
+
+Revision ID: add_chat_message_seq
+Revises: add_chat_unread_counters
+Create Date: 2026-10-19
+
+"""
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_chat_message_seq'
+down_revision = 'add_chat_unread_counters'
+branch_labels = None
+depends_on = None
+
+# app/core/snowflake.py 와 같은 비트 구성 (시간 41비트 | 워커 10비트 | 순번 12비트)
+EPOCH_MS = 1577836800000
+LOW_BITS = 22
+BATCH_SIZE = 5000
+
+
+def _seq(created_at, offset):
+    if isinstance(created_at, str):
+        created_at = datetime.strptime(created_at[:19], '%Y-%m-%d %H:%M:%S')
+    timestamp_ms = int(created_at.replace(tzinfo=timezone.utc).timestamp() * 1000) if created_at else EPOCH_MS
+    return ((timestamp_ms - EPOCH_MS) << LOW_BITS) | (offset & ((1 << LOW_BITS) - 1))
+
+
+def _offset(message_id):
+    """같은 시각 안의 순번: ID 앞 22비트 (같은 초 안에서는 ID 순서, 값이 겹치면 조회 시 (seq, id) 순서로 구분)"""
+    return int(message_id.replace('-', '')[:6], 16) >> 2
+
+
+def upgrade():
+    op.add_column('chat_messages', sa.Column('seq', sa.BigInteger(), nullable=True))
+
+    # Backfill: id 순서로 BATCH_SIZE씩 읽어 created_at(초 단위)과 ID로 seq 부여 (배치마다 커밋)
+    messages = sa.table('chat_messages', sa.column('id'), sa.column('seq'), sa.column('created_at'))
+    update = messages.update().where(messages.c.id == sa.bindparam('message_id')).values(seq=sa.bindparam('value'))
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        last_id = ''
+        while True:
+            rows = conn.execute(
+                sa.select(messages.c.id, messages.c.created_at)
+                .where(messages.c.id > last_id)
+                .order_by(messages.c.id)
+                .limit(BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+            conn.execute(update, [
+                {'message_id': message_id, 'value': _seq(created_at, _offset(message_id))}
+                for message_id, created_at in rows
+            ])
+            last_id = rows[-1][0]
+
+    with op.batch_alter_table('chat_messages') as batch_op:
+        batch_op.alter_column('seq', existing_type=sa.BigInteger(), nullable=False)
+    op.create_index('ix_chat_messages_room_seq', 'chat_messages', ['chat_room_id', 'seq'])
+
+
+def downgrade():
+    op.drop_index('ix_chat_messages_room_seq', table_name='chat_messages')
+    op.drop_column('chat_messages', 'seq')
@@ -0,0 +1,26 @@
+"""add id to chat message seq index
+
+Revision ID: add_chat_message_seq_id_index
+Revises: convert_ids_to_binary_uuid
+Create Date: 2026-10-19
+
+워커 ID가 겹치면 seq가 같은 메시지가 생길 수 있으므로 채팅 기록 커서를 (seq, id)로 비교.
+커서 조회가 인덱스만으로 처리되도록 (chat_room_id, seq) 인덱스를 (chat_room_id, seq, id)로 교체
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_chat_message_seq_id_index'
+down_revision = 'convert_ids_to_binary_uuid'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_chat_messages_room_seq_id', 'chat_messages', ['chat_room_id', 'seq', 'id'])
+    op.drop_index('ix_chat_messages_room_seq', table_name='chat_messages')
+
+
+def downgrade():
+    op.create_index('ix_chat_messages_room_seq', 'chat_messages', ['chat_room_id', 'seq'])
+    op.drop_index('ix_chat_messages_room_seq_id', table_name='chat_messages')
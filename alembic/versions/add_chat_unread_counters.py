@@ -0,0 +1,39 @@
+"""add chat unread counters
+
+Revision ID: add_chat_unread_counters
+Revises: create_story_reports
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_chat_unread_counters'
+down_revision = 'create_story_reports'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create chat_unread_counters table
+    op.create_table('chat_unread_counters',
+        sa.Column('chat_room_id', sa.String(36), nullable=False),
+        sa.Column('user_id', sa.String(36), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['chat_room_id'], ['chat_rooms.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('chat_room_id', 'user_id')
+    )
+    
+    # Backfill from existing unread messages
+    op.execute(
+        "INSERT INTO chat_unread_counters (chat_room_id, user_id, count) "
+        "SELECT chat_room_id, receiver_id, COUNT(*) FROM chat_messages "
+        "WHERE chat_room_id IS NOT NULL AND is_read = false "
+        "GROUP BY chat_room_id, receiver_id"
+    )
+
+
+def downgrade():
+    op.drop_table('chat_unread_counters')
@@ -0,0 +1,24 @@
+"""add matching request list indexes
+
+Revision ID: add_matching_request_list_indexes
+Revises: add_chat_message_seq
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_matching_request_list_indexes'
+down_revision = 'add_chat_message_seq'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_matching_requests_user_created', 'matching_requests', ['user_id', 'created_at'])
+    op.create_index('ix_matching_requests_guide_created', 'matching_requests', ['guide_id', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_matching_requests_guide_created', table_name='matching_requests')
+    op.drop_index('ix_matching_requests_user_created', table_name='matching_requests')
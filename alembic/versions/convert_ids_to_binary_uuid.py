@@ -0,0 +1,127 @@
+"""convert uuid keys to BINARY(16)
+
+Revision ID: convert_ids_to_binary_uuid
+Revises: convert_timestamps_to_datetime
+Create Date: 2026-10-19
+
+id와 이를 참조하는 컬럼을 VARCHAR(36)에서 BINARY(16)으로 변환 (MySQL 8.0+).
+새 컬럼 추가 -> 배치 백필(배치마다 커밋) -> 외래 키 삭제 -> 테이블별로 기본 키/인덱스를 다시 만들며
+컬럼 교체 -> 외래 키 재생성 순서로 진행.
+이전 버전 앱은 문자열 ID를 쓰므로 앱을 내린 상태에서 실행해야 함.
+기존 행의 ID 값(UUIDv4)은 그대로 유지되고, 새로 추가되는 행부터 시간순 UUIDv7 사용
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'convert_ids_to_binary_uuid'
+down_revision = 'convert_timestamps_to_datetime'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+BINARY = mysql.BINARY(16)
+STRING = sa.String(36)
+
+# 테이블 -> 변환할 컬럼 (첫 번째 컬럼 순서로 백필)
+ID_COLUMNS = {
+    'users': ('id',),
+    'refresh_tokens': ('id', 'user_id'),
+    'regions': ('id',),
+    'guides': ('id', 'user_id'),
+    'stories': ('id', 'user_id', 'guide_id'),
+    'story_likes': ('id', 'user_id', 'story_id'),
+    'story_comments': ('id', 'story_id', 'user_id', 'parent_id'),
+    'story_bookmarks': ('id', 'user_id', 'story_id'),
+    'story_reports': ('id', 'story_id', 'reporter_id'),
+    'matching_requests': ('id', 'user_id', 'guide_id', 'story_id'),
+    'chat_rooms': ('id', 'user_id', 'guide_id', 'matching_request_id'),
+    'chat_messages': ('id', 'chat_room_id', 'matching_request_id', 'sender_id', 'receiver_id'),
+    'chat_unread_counters': ('chat_room_id', 'user_id'),
+}
+
+
+def _backfill(table_name, columns, convert):
+    """첫 번째 컬럼 순서로 BATCH_SIZE개 값씩 *_new 컬럼을 채움 (배치마다 커밋해 행 잠금을 짧게 유지)"""
+    table = sa.table(table_name, *(sa.column(name) for name in columns), *(sa.column(name + '_new') for name in columns))
+    key = table.c[columns[0]]
+    values = {name + '_new': convert(table.c[name]) for name in columns}
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        last_key = None
+        while True:
+            query = sa.select(key).distinct().order_by(key).limit(BATCH_SIZE)
+            if last_key is not None:
+                query = query.where(key > last_key)
+            keys = conn.execute(query).scalars().all()
+            if not keys:
+                break
+            conn.execute(table.update().where(key.in_(keys)).values(values))
+            last_key = keys[-1]
+
+
+def _drop_foreign_keys(inspector):
+    """변환 대상 테이블의 외래 키를 모두 지우고 재생성용 정의 반환"""
+    foreign_keys = []
+    for table_name in ID_COLUMNS:
+        for fk in inspector.get_foreign_keys(table_name):
+            op.drop_constraint(fk['name'], table_name, type_='foreignkey')
+            foreign_keys.append((table_name, fk))
+    return foreign_keys
+
+
+def _create_foreign_keys(foreign_keys):
+    for table_name, fk in foreign_keys:
+        op.create_foreign_key(
+            fk['name'], table_name, fk['referred_table'],
+            fk['constrained_columns'], fk['referred_columns'],
+            ondelete=fk.get('options', {}).get('ondelete')
+        )
+
+
+def _swap(inspector, table_name, columns, column_type):
+    """기존 컬럼을 지우고 *_new 컬럼을 원래 이름으로 변경 (기본 키, 인덱스는 같은 정의로 다시 생성)"""
+    nullable = {column['name']: column['nullable'] for column in inspector.get_columns(table_name)}
+    primary_key = inspector.get_pk_constraint(table_name)['constrained_columns']
+    # 외래 키용 인덱스와 UNIQUE 키 포함
+    indexes = [index for index in inspector.get_indexes(table_name) if set(index['column_names']) & set(columns)]
+
+    for index in indexes:
+        op.drop_index(index['name'], table_name=table_name)
+    op.drop_constraint(f'pk_{table_name}', table_name, type_='primary')
+    for name in columns:
+        op.drop_column(table_name, name)
+        op.alter_column(
+            table_name, name + '_new',
+            new_column_name=name,
+            existing_type=column_type,
+            existing_nullable=True,
+            nullable=nullable[name]
+        )
+    op.create_primary_key(f'pk_{table_name}', table_name, primary_key)
+    for index in indexes:
+        op.create_index(index['name'], table_name, index['column_names'], unique=index['unique'])
+
+
+def _convert(column_type, convert):
+    for table_name, columns in ID_COLUMNS.items():
+        for name in columns:
+            op.add_column(table_name, sa.Column(name + '_new', column_type, nullable=True))
+        _backfill(table_name, columns, convert)
+
+    inspector = sa.inspect(op.get_bind())
+    foreign_keys = _drop_foreign_keys(inspector)
+    for table_name, columns in ID_COLUMNS.items():
+        _swap(inspector, table_name, columns, column_type)
+    _create_foreign_keys(foreign_keys)
+
+
+def upgrade():
+    # UUID_TO_BIN(x) == UNHEX(REPLACE(x, '-', '')) (바이트 순서 유지, 문자열 순서와 같은 정렬)
+    _convert(BINARY, sa.func.uuid_to_bin)
+
+
+def downgrade():
+    _convert(STRING, sa.func.bin_to_uuid)
@@ -0,0 +1,128 @@
+"""convert string timestamps to DATETIME(6)
+
+Revision ID: convert_timestamps_to_datetime
+Revises: add_matching_request_list_indexes
+Create Date: 2026-10-19
+
+created_at/updated_at를 String(19)에서 DATETIME(6)으로 변환.
+테이블을 통째로 복사하는 MODIFY COLUMN 대신 새 컬럼 추가 -> 배치 백필(배치마다 커밋)
+-> 기존 컬럼 삭제/이름 변경 순서로 진행해 쓰기 잠금 시간을 줄임 (MySQL 8.0.29+에서 추가/삭제/이름 변경은 INSTANT).
+새 컬럼 기본값이 NOW(6)이라 백필 중 이전 버전 앱이 추가한 행도 값이 채워지며,
+백필 이후 이전 버전 앱이 수정한 행의 updated_at은 마이그레이션 시각 근처로 남을 수 있음
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'convert_timestamps_to_datetime'
+down_revision = 'add_matching_request_list_indexes'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+DATETIME = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+STRING = sa.String(19)
+
+# 테이블 -> 변환할 컬럼
+COLUMNS = {
+    'stories': ('created_at', 'updated_at'),
+    'story_likes': ('created_at',),
+    'story_comments': ('created_at', 'updated_at'),
+    'story_bookmarks': ('created_at',),
+    'guides': ('created_at', 'updated_at'),
+    'regions': ('created_at',),
+    'matching_requests': ('created_at', 'updated_at'),
+    'chat_messages': ('created_at',),
+}
+NOT_NULL = {('story_bookmarks', 'created_at')}
+
+# created_at을 포함하는 인덱스 (컬럼 삭제 전에 지우고 이름 변경 후 다시 생성)
+INDEXES = {
+    'matching_requests': (
+        ('ix_matching_requests_user_created', ['user_id', 'created_at']),
+        ('ix_matching_requests_guide_created', ['guide_id', 'created_at']),
+    ),
+}
+
+
+def _backfill(table_name, columns, values):
+    """id 순서로 BATCH_SIZE씩 새 컬럼을 채움 (배치마다 커밋해 행 잠금을 짧게 유지)"""
+    table = sa.table(table_name, sa.column('id'), *(sa.column(name) for name in columns))
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        last_id = ''
+        while True:
+            ids = conn.execute(
+                sa.select(table.c.id).where(table.c.id > last_id).order_by(table.c.id).limit(BATCH_SIZE)
+            ).scalars().all()
+            if not ids:
+                break
+            conn.execute(table.update().where(table.c.id.in_(ids)).values(values(table)))
+            last_id = ids[-1]
+
+
+def _server_default(table_name, name, now):
+    # 북마크는 앱에서 값을 넣으므로 서버 기본값 없음
+    return None if (table_name, name) in NOT_NULL else now
+
+
+def _add_new_columns(table_name, columns, column_type, now):
+    for name in columns:
+        op.add_column(table_name, sa.Column(
+            name + '_new', column_type, nullable=True, server_default=_server_default(table_name, name, now)
+        ))
+
+
+def _swap(table_name, columns, column_type, now):
+    """기존 컬럼을 지우고 *_new 컬럼을 원래 이름으로 변경"""
+    for index_name, _ in INDEXES.get(table_name, ()):
+        op.drop_index(index_name, table_name=table_name)
+    for name in columns:
+        server_default = _server_default(table_name, name, now)
+        op.drop_column(table_name, name)
+        op.alter_column(
+            table_name, name + '_new',
+            new_column_name=name,
+            existing_type=column_type,
+            existing_nullable=True,
+            existing_server_default=server_default
+        )
+        if (table_name, name) in NOT_NULL:
+            op.alter_column(table_name, name, existing_type=column_type, nullable=False,
+                            existing_server_default=server_default)
+    for index_name, index_columns in INDEXES.get(table_name, ()):
+        op.create_index(index_name, table_name, index_columns)
+
+
+def upgrade():
+    now = sa.text('CURRENT_TIMESTAMP(6)')
+    for table_name, columns in COLUMNS.items():
+        _add_new_columns(table_name, columns, DATETIME, now)
+
+        def values(table, columns=columns, table_name=table_name):
+            converted = {}
+            for name in columns:
+                value = sa.cast(table.c[name], DATETIME)
+                if (table_name, name) in NOT_NULL:
+                    value = sa.func.coalesce(value, sa.func.now(6))
+                converted[name + '_new'] = value
+            return converted
+
+        _backfill(table_name, [*columns, *(name + '_new' for name in columns)], values)
+        _swap(table_name, columns, DATETIME, now)
+
+
+def downgrade():
+    # 문자열 컬럼에는 식 기본값만 가능 (MySQL 8.0.13+)
+    now = sa.text('(CURRENT_TIMESTAMP)')
+    for table_name, columns in COLUMNS.items():
+        _add_new_columns(table_name, columns, STRING, now)
+
+        def values(table, columns=columns):
+            # DATETIME(6) 문자열의 앞 19자리 = 'YYYY-MM-DD HH:MM:SS'
+            return {name + '_new': sa.cast(table.c[name], STRING) for name in columns}
+
+        _backfill(table_name, [*columns, *(name + '_new' for name in columns)], values)
+        _swap(table_name, columns, STRING, now)
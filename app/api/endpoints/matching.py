@@ -4,7 +4,7 @@ from sqlalchemy import and_, or_, desc
 from typing import Optional, List
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.guide import Guide
@@ -12,12 +12,16 @@ from app.models.matching import MatchingRequest, ChatMessage
 from app.models.chat import ChatRoom
 from app.models.story import Story
 from app.schemas.matching import (
-    GuideCreate, GuideUpdate, GuideResponse,
+    GuideCreate, GuideUpdate, GuideResponse, GuideSearchItem, GuideSearchResponse,
+    NearbyGuideItem, NearbyGuideResponse,
     MatchingRequestCreate, MatchingRequestUpdate, MatchingRequestResponse, MatchingListResponse,
     ChatMessageCreate, ChatMessageResponse, ChatListResponse, MatchingStatus,
     ChatRoomResponse, ChatRoomListResponse
 )
 from app.services.matching_service import MatchingService
+from app.services.guide_directory import guide_directory
+from app.services.guide_index import guide_index
+from app.services.region_geo import region_geo_index
 
 router = APIRouter()
 
@@ -30,8 +34,7 @@ async def apply_for_guide(
 ):
     """가이드 신청"""
     # 이미 가이드인지 확인
-    existing_guide = db.query(Guide).filter(Guide.user_id == current_user.id).first()
-    if existing_guide:
+    if guide_directory.get_by_user_id(db, current_user.id):
         raise HTTPException(status_code=400, detail="Already registered as guide")
     
     # 가이드 생성
@@ -56,28 +59,93 @@ async def apply_for_guide(
         profile_image=current_user.profile_image
     )
 
+def _guide_search_fields(entry) -> dict:
+    """가이드 검색 인덱스 항목 -> 응답 필드"""
+    return dict(
+        id=entry.id,
+        user_id=entry.user_id,
+        bio=entry.bio,
+        rating=entry.rating,
+        total_reviews=entry.total_reviews,
+        is_approved=entry.is_approved,
+        created_at=entry.created_at,
+        nickname=entry.nickname,
+        profile_image=entry.profile_image,
+        regions=list(entry.regions),
+        story_count=entry.story_count,
+        acceptance_rate=entry.acceptance_rate,
+        median_response_minutes=(
+            round(entry.median_response_seconds / 60, 1)
+            if entry.median_response_seconds is not None else None
+        )
+    )
+
+@router.get("/guides/search", response_model=GuideSearchResponse)
+async def search_guides(
+    region: Optional[str] = Query(None, description="활동 지역 (스토리의 region_id1 또는 region_id2)"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    sort: str = Query("recommended", pattern="^(recommended|rating|acceptance|response)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000)
+):
+    """가이드 검색 (지역/평점 필터, 추천순/평점순/수락률순/응답 속도순)"""
+    await guide_index.ensure_built()
+    entries, total = guide_index.search(region, min_rating, sort, limit, offset)
+    
+    return GuideSearchResponse(
+        guides=[GuideSearchItem(**_guide_search_fields(entry)) for entry in entries],
+        total=total,
+        limit=limit,
+        offset=offset
+    )
+
+@router.get("/guides/nearby", response_model=NearbyGuideResponse)
+async def get_nearby_guides(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(20, gt=0, le=200, description="반경 (km)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """주변 가이드 조회 (활동 지역까지의 거리와 추천 점수순)"""
+    region_distances = {
+        (record.city, record.district): distance
+        for record, distance in region_geo_index.nearby(db, lat, lng, radius)
+    }
+    await guide_index.ensure_built()
+    matched, total = guide_index.nearby(region_distances, limit, offset)
+
+    return NearbyGuideResponse(
+        guides=[
+            NearbyGuideItem(**_guide_search_fields(entry), distance_km=round(distance, 2))
+            for entry, distance in matched
+        ],
+        total=total,
+        limit=limit,
+        offset=offset
+    )
+
 @router.get("/guides/{guide_id}", response_model=GuideResponse)
 async def get_guide(
     guide_id: str,
     db: Session = Depends(get_db)
 ):
     """가이드 정보 조회"""
-    guide = db.query(Guide).filter(Guide.id == guide_id).first()
+    guide = guide_directory.get_by_id(db, guide_id)
     if not guide:
         raise HTTPException(status_code=404, detail="Guide not found")
     
-    user = db.query(User).filter(User.id == guide.user_id).first()
-    
     return GuideResponse(
         id=guide.id,
         user_id=guide.user_id,
         bio=guide.bio,
-        rating=float(guide.rating),
+        rating=guide.rating,
         total_reviews=guide.total_reviews,
         is_approved=guide.is_approved,
         created_at=guide.created_at,
-        nickname=user.nickname if user else "Unknown",
-        profile_image=user.profile_image if user else None
+        nickname=guide.nickname,
+        profile_image=guide.profile_image
     )
 
 # Matching 관련 엔드포인트
@@ -95,8 +163,7 @@ async def create_matching_request(
     )
     
     # 가이드 사용자 정보
-    guide = db.query(Guide).filter(Guide.id == matching_request.guide_id).first()
-    guide_user = db.query(User).filter(User.id == guide.user_id).first()
+    guide = guide_directory.get_by_id(db, matching_request.guide_id)
     
     # 스토리 정보
     story = None
@@ -120,8 +187,8 @@ async def create_matching_request(
             "updated_at": matching_request.updated_at,
             "user_nickname": current_user.nickname,
             "user_profile_image": current_user.profile_image,
-            "guide_nickname": guide_user.nickname if guide_user else "Unknown",
-            "guide_profile_image": guide_user.profile_image if guide_user else None,
+            "guide_nickname": guide.nickname if guide else "Unknown",
+            "guide_profile_image": guide.profile_image if guide else None,
             "story_title": story.title if story else None
         },
         "chat_room_id": None
@@ -137,46 +204,20 @@ async def get_matching_requests(
     db: Session = Depends(get_db)
 ):
     """매칭 요청 목록 조회"""
+    offset = (page - 1) * limit
     if as_guide:
         # 가이드로서 받은 요청
-        guide = db.query(Guide).filter(Guide.user_id == current_user.id).first()
+        guide = guide_directory.get_by_user_id(db, current_user.id)
         if not guide:
             raise HTTPException(status_code=403, detail="Not a guide")
-        requests = MatchingService.get_guide_matching_requests(db, guide.id, status)
+        rows, total = MatchingService.get_guide_matching_requests(db, guide.id, status, limit, offset)
     else:
         # 사용자로서 보낸 요청
-        requests = MatchingService.get_user_matching_requests(db, current_user.id, status)
-    
-    # 페이지네이션
-    total = len(requests)
-    offset = (page - 1) * limit
-    requests = requests[offset:offset + limit]
+        rows, total = MatchingService.get_user_matching_requests(db, current_user.id, status, limit, offset)
     
     # 응답 데이터 구성
     response_requests = []
-    for req in requests:
-        user = db.query(User).filter(User.id == req.user_id).first()
-        guide = db.query(Guide).filter(Guide.id == req.guide_id).first()
-        guide_user = db.query(User).filter(User.id == guide.user_id).first() if guide else None
-        story = db.query(Story).filter(Story.id == req.story_id).first() if req.story_id else None
-        
-        # 채팅방 ID 찾기 (수락된 경우)
-        chat_room_id = None
-        if req.status == MatchingStatus.accepted:
-            # 먼저 matching_request_id로 찾기
-            chat_room = db.query(ChatRoom).filter(
-                ChatRoom.matching_request_id == req.id
-            ).first()
-            
-            # 못 찾으면 user_id와 guide_id로 찾기
-            if not chat_room and guide:
-                chat_room = db.query(ChatRoom).filter(
-                    ChatRoom.user_id == req.user_id,
-                    ChatRoom.guide_id == guide.user_id
-                ).first()
-            
-            chat_room_id = chat_room.id if chat_room else None
-        
+    for req, user_nickname, user_profile_image, guide_nickname, guide_profile_image, story_title, chat_room_id in rows:
         response_requests.append(MatchingRequestResponse(
             id=req.id,
             user_id=req.user_id,
@@ -189,11 +230,11 @@ async def get_matching_requests(
             message=req.message,
             created_at=req.created_at,
             updated_at=req.updated_at,
-            user_nickname=user.nickname if user else "Unknown",
-            user_profile_image=user.profile_image if user else None,
-            guide_nickname=guide_user.nickname if guide_user else "Unknown",
-            guide_profile_image=guide_user.profile_image if guide_user else None,
-            story_title=story.title if story else None,
+            user_nickname=user_nickname or "Unknown",
+            user_profile_image=user_profile_image,
+            guide_nickname=guide_nickname or "Unknown",
+            guide_profile_image=guide_profile_image,
+            story_title=story_title,
             chat_room_id=chat_room_id
         ))
     
@@ -216,7 +257,7 @@ async def update_matching_request(
     logger = logging.getLogger(__name__)
     
     # 가이드 확인
-    guide = db.query(Guide).filter(Guide.user_id == current_user.id).first()
+    guide = guide_directory.get_by_user_id(db, current_user.id)
     if not guide:
         raise HTTPException(status_code=403, detail="Not a guide")
     
@@ -315,46 +356,50 @@ async def delete_matching_request(
         )
 
 # ChatRoom 관련 엔드포인트
+def _chat_room_response(row) -> ChatRoomResponse:
+    room, user_nickname, user_profile_image, guide_nickname, guide_profile_image, unread_count, _ = row
+    return ChatRoomResponse(
+        id=room.id,
+        user_id=room.user_id,
+        guide_id=room.guide_id,
+        matching_request_id=room.matching_request_id,
+        last_message=room.last_message,
+        last_message_at=room.last_message_at,
+        is_active=room.is_active,
+        created_at=room.created_at,
+        user_nickname=user_nickname or "Unknown",
+        user_profile_image=user_profile_image,
+        guide_nickname=guide_nickname or "Unknown",
+        guide_profile_image=guide_profile_image,
+        unread_count=unread_count
+    )
+
 @router.get("/chat-rooms", response_model=ChatRoomListResponse)
 async def get_chat_rooms(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """채팅방 목록 조회"""
-    rooms = MatchingService.get_user_chat_rooms(db, current_user.id)
-    
-    response_rooms = []
-    for room in rooms:
-        # 사용자 정보
-        user = db.query(User).filter(User.id == room.user_id).first()
-        guide = db.query(User).filter(User.id == room.guide_id).first()
-        
-        # 읽지 않은 메시지 개수
-        unread_count = db.query(ChatMessage).filter(
-            ChatMessage.chat_room_id == room.id,
-            ChatMessage.receiver_id == current_user.id,
-            ChatMessage.is_read == False
-        ).count()
-        
-        response_rooms.append(ChatRoomResponse(
-            id=room.id,
-            user_id=room.user_id,
-            guide_id=room.guide_id,
-            matching_request_id=room.matching_request_id,
-            last_message=room.last_message,
-            last_message_at=room.last_message_at,
-            is_active=room.is_active,
-            created_at=room.created_at,
-            user_nickname=user.nickname if user else "Unknown",
-            user_profile_image=user.profile_image if user else None,
-            guide_nickname=guide.nickname if guide else "Unknown",
-            guide_profile_image=guide.profile_image if guide else None,
-            unread_count=unread_count
-        ))
+    """채팅방 목록 조회 (최근 메시지순, keyset 페이지네이션)"""
+    decoded_cursor = MatchingService.decode_room_cursor(cursor) if cursor else None
+    
+    # 참여자 프로필과 읽지 않은 메시지 수(카운터)를 한 번의 쿼리로 조회
+    # 다음 페이지 존재 여부 확인을 위해 한 개 더 조회
+    rows = MatchingService.get_chat_room_rows(db, current_user.id, limit=limit + 1, cursor=decoded_cursor)
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_room, sort_at = rows[-1][0], rows[-1][-1]
+        next_cursor = MatchingService.encode_room_cursor(sort_at, last_room.id)
+    
+    response_rooms = [_chat_room_response(row) for row in rows]
     
     return ChatRoomListResponse(
         rooms=response_rooms,
-        total=len(response_rooms)
+        total=len(response_rooms),
+        next_cursor=next_cursor
     )
 
 @router.get("/chat-rooms/{room_id}", response_model=ChatRoomResponse)
@@ -364,51 +409,43 @@ async def get_chat_room(
     db: Session = Depends(get_db)
 ):
     """채팅방 정보 조회"""
-    room = MatchingService.get_chat_room(db, room_id, current_user.id)
-    
-    # 사용자 정보
-    user = db.query(User).filter(User.id == room.user_id).first()
-    guide = db.query(User).filter(User.id == room.guide_id).first()
-    
-    # 읽지 않은 메시지 개수
-    unread_count = db.query(ChatMessage).filter(
-        ChatMessage.chat_room_id == room.id,
-        ChatMessage.receiver_id == current_user.id,
-        ChatMessage.is_read == False
-    ).count()
+    rows = MatchingService.get_chat_room_rows(db, current_user.id, room_id=room_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Chat room not found")
     
-    return ChatRoomResponse(
-        id=room.id,
-        user_id=room.user_id,
-        guide_id=room.guide_id,
-        matching_request_id=room.matching_request_id,
-        last_message=room.last_message,
-        last_message_at=room.last_message_at,
-        is_active=room.is_active,
-        created_at=room.created_at,
-        user_nickname=user.nickname if user else "Unknown",
-        user_profile_image=user.profile_image if user else None,
-        guide_nickname=guide.nickname if guide else "Unknown",
-        guide_profile_image=guide.profile_image if guide else None,
-        unread_count=unread_count
-    )
+    return _chat_room_response(rows[0])
 
 @router.get("/chat-rooms/{room_id}/messages", response_model=ChatListResponse)
 async def get_chat_messages(
     room_id: str,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    before_id: Optional[str] = Query(None, description="이 메시지보다 이전 메시지 조회 (위로 스크롤)"),
+    after_id: Optional[str] = Query(None, description="이 메시지 이후 메시지 조회 (재연결 후 동기화)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """채팅 메시지 목록 조회"""
-    messages = MatchingService.get_chat_messages(db, room_id, current_user.id, limit, offset)
+    if before_id and after_id:
+        raise HTTPException(status_code=400, detail="Use either before_id or after_id")
+    
+    messages, has_more = MatchingService.get_chat_messages(
+        db, room_id, current_user.id, limit, offset, before_id=before_id, after_id=after_id
+    )
+    
+    # 발신자 프로필 일괄 조회
+    sender_ids = {msg.sender_id for msg in messages}
+    senders = {
+        sender.id: sender
+        for sender in db.query(User.id, User.nickname, User.profile_image).filter(User.id.in_(sender_ids)).all()
+    } if sender_ids else {}
     
     response_messages = []
     for msg in messages:
-        sender = db.query(User).filter(User.id == msg.sender_id).first()
+        sender = senders.get(msg.sender_id)
         response_messages.append(ChatMessageResponse(
             id=msg.id,
+            seq=msg.seq,
             chat_room_id=msg.chat_room_id,
             matching_request_id=msg.matching_request_id,
             sender_id=msg.sender_id,
@@ -422,7 +459,8 @@ async def get_chat_messages(
     
     return ChatListResponse(
         messages=response_messages,
-        total=len(response_messages)
+        total=len(response_messages),
+        has_more=has_more
     )
 
 @router.post("/chat-rooms/{room_id}/messages", response_model=ChatMessageResponse)
@@ -466,13 +504,14 @@ async def send_chat_message(
         "room_id": room_id,
         "data": {
             "id": message.id,
+            "seq": message.seq,
             "chat_room_id": message.chat_room_id,
             "matching_request_id": message.matching_request_id,
             "sender_id": message.sender_id,
             "receiver_id": message.receiver_id,
             "message": message.message,
             "is_read": message.is_read,
-            "created_at": message.created_at,
+            "created_at": message.created_at.isoformat(),
             "sender_nickname": current_user.nickname,
             "sender_profile_image": current_user.profile_image
         }
@@ -483,6 +522,7 @@ async def send_chat_message(
     
     return ChatMessageResponse(
         id=message.id,
+        seq=message.seq,
         chat_room_id=message.chat_room_id,
         matching_request_id=message.matching_request_id,
         sender_id=message.sender_id,
@@ -1,114 +1,128 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, or_, and_
-from typing import Optional, List
-from datetime import datetime
-from app.core.database import get_db
-from app.models.region import Region
-from app.models.story import Story
-from app.schemas.region import RegionResponse, RegionListResponse, RegionMapData
+from typing import Callable, Optional, List, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.core.region_data import region_catalogue
+from app.schemas.region import RegionResponse, RegionListResponse, RegionMapData, RegionSuggestion
+from app.services.region_directory import RegionRecord, region_directory
+from app.services.region_geo import region_geo_index
+from app.services.region_map import region_map_cache
 
 router = APIRouter()
 
+# 직렬화된 응답 캐시: 키 -> (데이터 버전, 본문, ETag)
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+_response_cache: "OrderedDict[str, Tuple[int, bytes, str]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _etag_response(request: Request, key: str, version: int, build: Callable[[], object]) -> Response:
+    """버전이 같으면 직렬화된 본문을 재사용하고, If-None-Match가 일치하면 304 반환"""
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            _response_cache.move_to_end(key)
+    if cached is None or cached[0] != version:
+        body = json.dumps(jsonable_encoder(build()), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        cached = (version, body, f'"{hashlib.sha1(body).hexdigest()}"')
+        with _response_cache_lock:
+            _response_cache[key] = cached
+            while len(_response_cache) > _RESPONSE_CACHE_MAX_ENTRIES:
+                _response_cache.popitem(last=False)
+
+    _, body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.REGION_COUNTS_TTL}"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _region_response(record: RegionRecord) -> RegionResponse:
+    return RegionResponse(
+        id=record.id,
+        region_name=record.region_name,
+        city=record.city,
+        district=record.district,
+        latitude=record.latitude,
+        longitude=record.longitude,
+        story_count=region_directory.story_count(record),
+        created_at=record.created_at
+    )
+
+
 @router.get("/", response_model=RegionListResponse)
 async def get_regions(
+    request: Request,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """지역 목록 조회"""
-    query = db.query(Region)
-    
-    # 검색
-    if search:
-        query = query.filter(
-            or_(
-                Region.city.contains(search),
-                Region.district.contains(search),
-                Region.region_name.contains(search)
-            )
+    """지역 목록 조회 (search: 부분 문자열 또는 도시명 초성)"""
+    region_directory.refresh(db)
+
+    def build():
+        regions = region_directory.search(db, search)
+        return RegionListResponse(
+            regions=[_region_response(record) for record in regions],
+            total=len(regions)
         )
-    
-    # 스토리 수가 많은 순으로 정렬
-    query = query.order_by(desc(Region.story_count), Region.city, Region.district)
-    
-    regions = query.all()
-    total = len(regions)
-    
-    return RegionListResponse(
-        regions=[
-            RegionResponse(
-                id=region.id,
-                region_name=region.region_name,
-                city=region.city,
-                district=region.district,
-                latitude=float(region.latitude) if region.latitude else None,
-                longitude=float(region.longitude) if region.longitude else None,
-                story_count=region.story_count,
-                created_at=datetime.fromisoformat(region.created_at) if isinstance(region.created_at, str) else region.created_at
-            ) for region in regions
-        ],
-        total=total
-    )
+
+    return _etag_response(request, f"list:{search or ''}", region_directory.version, build)
 
 @router.get("/map", response_model=List[RegionMapData])
-async def get_map_data(db: Session = Depends(get_db)):
-    """지도용 지역 데이터 조회"""
-    regions = db.query(Region).filter(
-        and_(Region.latitude != None, Region.longitude != None)
-    ).all()
-    
-    map_data = []
-    for region in regions:
-        # 해당 지역의 인기 카테고리 조회
-        popular_categories = db.query(
-            Story.category,
-            func.count(Story.id).label('count')
-        ).filter(
-            and_(Story.region_id == region.id, Story.category != None)
-        ).group_by(Story.category).order_by(desc('count')).limit(3).all()
-        
-        map_data.append(RegionMapData(
-            id=region.id,
-            city=region.city,
-            district=region.district,
-            latitude=float(region.latitude),
-            longitude=float(region.longitude),
-            story_count=region.story_count,
-            popular_categories=[cat[0] for cat in popular_categories]
-        ))
-    
-    return map_data
+async def get_map_data(
+    request: Request,
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lng: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lng: Optional[float] = Query(None, ge=-180, le=180),
+    db: Session = Depends(get_read_db)
+):
+    """지도용 지역 데이터 조회 (REGION_MAP_CACHE_TTL 동안 캐시, 네 좌표를 모두 주면 화면 영역 안의 지역만)"""
+    bbox = (min_lat, min_lng, max_lat, max_lng)
+    if any(value is not None for value in bbox) and any(value is None for value in bbox):
+        raise HTTPException(status_code=400, detail="min_lat, min_lng, max_lat and max_lng must be given together")
 
-@router.get("/{region_id}", response_model=RegionResponse)
-async def get_region(
-    region_id: str,
-    db: Session = Depends(get_db)
+    map_data = region_map_cache.get(db)
+    if bbox[0] is None:
+        return _etag_response(request, "map", region_map_cache.version, lambda: map_data)
+
+    def build():
+        region_ids = {record.id for record in region_geo_index.within_bbox(db, *bbox)}
+        return [item for item in map_data if item.id in region_ids]
+
+    return _etag_response(request, f"map:{bbox}", region_map_cache.version, build)
+
+@router.get("/suggest", response_model=List[RegionSuggestion])
+async def suggest_regions(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50)
 ):
-    """지역 상세 조회"""
-    region = db.query(Region).filter(Region.id == region_id).first()
-    if not region:
-        raise HTTPException(status_code=404, detail="Region not found")
-    
-    return RegionResponse(
-        id=region.id,
-        region_name=region.region_name,
-        city=region.city,
-        district=region.district,
-        latitude=float(region.latitude) if region.latitude else None,
-        longitude=float(region.longitude) if region.longitude else None,
-        story_count=region.story_count,
-        created_at=datetime.fromisoformat(region.created_at) if isinstance(region.created_at, str) else region.created_at
-    )
+    """도시명 자동완성 (접두어 또는 초성, DB 조회 없음)"""
+    def build():
+        return [
+            RegionSuggestion(category=entry.category, city=entry.city, name=entry.name)
+            for entry in region_catalogue.search(q, limit)
+        ]
+
+    # 카탈로그는 불변이므로 버전 고정
+    return _etag_response(request, f"suggest:{q}:{limit}", 0, build)
 
 @router.get("/search-by-name", response_model=List[RegionResponse])
 async def search_regions_by_name(
     city: str,
     district: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """시/구 이름으로 지역 검색"""
-    query = db.query(Region)
-    
+    region_directory.refresh(db)
+
     # 도 단위 매핑
     city_mapping = {
         "서울": "서울특별시",
@@ -121,36 +135,33 @@ async def search_regions_by_name(
         "울산": "울산광역시",
         "세종": "세종특별자치시"
     }
-    
+
     # 시 이름 변환
     mapped_city = city_mapping.get(city, city)
-    
+
     # 상세 지역 매핑을 위한 테이블 (TODO: 확장 필요)
     if mapped_city == city and not mapped_city.endswith("시") and not mapped_city.endswith("도"):
         # 시/군 단위 처리
-        query = query.filter(
-            or_(
-                Region.city.contains(city),
-                Region.district == city
-            )
-        )
+        regions = [
+            record for record in region_directory.records
+            if city in record.city or record.district == city
+        ]
     else:
-        query = query.filter(Region.city == mapped_city)
-    
+        regions = [record for record in region_directory.records if record.city == mapped_city]
+
     if district:
-        query = query.filter(Region.district == district)
-    
-    regions = query.all()
-    
-    return [
-        RegionResponse(
-            id=region.id,
-            region_name=region.region_name,
-            city=region.city,
-            district=region.district,
-            latitude=float(region.latitude) if region.latitude else None,
-            longitude=float(region.longitude) if region.longitude else None,
-            story_count=region.story_count,
-            created_at=datetime.fromisoformat(region.created_at) if isinstance(region.created_at, str) else region.created_at
-        ) for region in regions
-    ]
+        regions = [record for record in regions if record.district == district]
+
+    return [_region_response(record) for record in regions]
+
+@router.get("/{region_id}", response_model=RegionResponse)
+async def get_region(
+    region_id: str,
+    db: Session = Depends(get_read_db)
+):
+    """지역 상세 조회"""
+    record = region_directory.get(db, region_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Region not found")
+
+    return _region_response(record)
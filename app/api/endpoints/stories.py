@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, File, UploadFile, Form
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, func, case, tuple_
 from typing import Optional, List, Dict, Any
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.ids import new_id
 from app.core.security import get_current_user, get_current_user_optional
 from app.core import security as auth_service
 from app.core.region_data import REGION_DATA, get_cities_by_category
@@ -16,9 +17,12 @@ from app.models import guide as guide_models
 from app.schemas.story import (
     StoryCreate, StoryUpdate, StoryResponse, StoryListResponse,
     CommentCreate, CommentResponse, LikeToggleResponse, SortOrder,
-    StoryReportCreate
+    StoryReportCreate, NearbyStoryResponse, NearbyStoryListResponse, StorySearchResponse
 )
 from app.services.thumbnail_service import thumbnail_service
+from app.services.guide_directory import guide_directory
+from app.services.story_search import story_search_index
+from app.services.region_geo import region_geo_index
 import uuid
 import os
 from datetime import datetime
@@ -42,9 +46,7 @@ async def get_my_stories(
     현재 사용자가 업로드한 스토리 목록 조회
     """
     # 가이드 확인
-    guide = db.query(Guide).filter(
-        Guide.user_id == current_user.id
-    ).first()
+    guide = guide_directory.get_by_user_id(db, current_user.id)
     
     if not guide:
         raise HTTPException(
@@ -79,8 +81,8 @@ async def get_my_stories(
             "view_count": story.view_count,
             "like_count": story.like_count,
             "is_active": story.is_active,
-            "created_at": story.created_at.isoformat() if hasattr(story.created_at, 'isoformat') else str(story.created_at),
-            "updated_at": story.updated_at.isoformat() if hasattr(story.updated_at, 'isoformat') else str(story.updated_at),
+            "created_at": story.created_at,
+            "updated_at": story.updated_at,
             "user_id": story.user_id,
             "user_nickname": current_user.nickname,
             "user_profile_image": current_user.profile_image,
@@ -108,7 +110,7 @@ async def get_stories(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """스토리 목록 조회 (홈 화면)"""
     query = db.query(Story).filter(Story.is_active == True)
@@ -178,8 +180,8 @@ async def get_stories(
             view_count=story.view_count,
             like_count=story.like_count,
             is_active=story.is_active,
-            created_at=datetime.fromisoformat(story.created_at) if isinstance(story.created_at, str) else story.created_at,
-            updated_at=datetime.fromisoformat(story.updated_at) if isinstance(story.updated_at, str) else story.updated_at,
+            created_at=story.created_at,
+            updated_at=story.updated_at,
             author_nickname=author.nickname if author else "Unknown",
             author_profile_image=author.profile_image if author else None,
             region_name=region_name,
@@ -195,6 +197,149 @@ async def get_stories(
         limit=limit
     )
 
+def _story_response_fields(db: Session, stories_db: List[Story], current_user: Optional[User]) -> List[Dict[str, Any]]:
+    """스토리 목록 응답 필드 (작성자/댓글 수/좋아요/북마크 일괄 조회)"""
+    story_ids = [story.id for story in stories_db]
+    if not story_ids:
+        return []
+    authors = {
+        user.id: user
+        for user in db.query(User).filter(User.id.in_({story.user_id for story in stories_db})).all()
+    }
+    comment_counts = dict(
+        db.query(StoryComment.story_id, func.count(StoryComment.id))
+        .filter(StoryComment.story_id.in_(story_ids))
+        .group_by(StoryComment.story_id).all()
+    )
+    liked_ids = set()
+    bookmarked_ids = set()
+    if current_user:
+        liked_ids = {
+            story_id for (story_id,) in db.query(StoryLike.story_id).filter(
+                StoryLike.user_id == current_user.id, StoryLike.story_id.in_(story_ids)
+            ).all()
+        }
+        bookmarked_ids = {
+            story_id for (story_id,) in db.query(StoryBookmark.story_id).filter(
+                StoryBookmark.user_id == current_user.id, StoryBookmark.story_id.in_(story_ids)
+            ).all()
+        }
+
+    fields = []
+    for story in stories_db:
+        author = authors.get(story.user_id)
+        region_name = None
+        if story.region_id1 and story.region_id2:
+            region_name = f"{story.region_id1} {story.region_id2}"
+
+        fields.append(dict(
+            id=story.id,
+            user_id=story.user_id,
+            guide_id=story.guide_id,
+            title=story.title,
+            content=story.content,
+            media_type=story.media_type,
+            media_url=story.media_url,
+            thumbnail_url=story.thumbnail_url,
+            category=story.category,
+            region_id=story.region_id1,
+            view_count=story.view_count,
+            like_count=story.like_count,
+            is_active=story.is_active,
+            created_at=story.created_at,
+            updated_at=story.updated_at,
+            author_nickname=author.nickname if author else "Unknown",
+            author_profile_image=author.profile_image if author else None,
+            region_name=region_name,
+            is_liked=story.id in liked_ids,
+            is_bookmarked=story.id in bookmarked_ids,
+            comments_count=comment_counts.get(story.id, 0)
+        ))
+    return fields
+
+@router.get("/search", response_model=StorySearchResponse)
+async def search_stories(
+    q: str = Query(..., min_length=1, max_length=100),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_read_db)
+):
+    """스토리 제목/본문 검색 (BM25 관련도순)"""
+    offset = (page - 1) * limit
+    await story_search_index.ensure_built()
+    ranked, total = story_search_index.search(q, limit=limit, offset=offset)
+    story_ids = [story_id for story_id, _ in ranked]
+    if not story_ids:
+        return StorySearchResponse(stories=[], total=total, page=page, limit=limit)
+
+    # 색인 반영 전에 비활성화된 스토리는 제외
+    stories_by_id = {
+        story.id: story
+        for story in db.query(Story).filter(Story.id.in_(story_ids), Story.is_active == True).all()
+    }
+    stories_db = [stories_by_id[story_id] for story_id in story_ids if story_id in stories_by_id]
+    # 걸러낸 스토리는 전체 개수에서도 제외 (다른 페이지의 것은 색인 동기화 때 반영되므로 근사값)
+    total -= len(story_ids) - len(stories_db)
+
+    return StorySearchResponse(
+        stories=[StoryResponse(**fields) for fields in _story_response_fields(db, stories_db, current_user)],
+        total=total,
+        page=page,
+        limit=limit
+    )
+
+@router.get("/nearby", response_model=NearbyStoryListResponse)
+async def get_nearby_stories(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(10, gt=0, le=200, description="반경 (km)"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_read_db)
+):
+    """주변 스토리 조회 (스토리 지역까지의 거리와 인기도순)
+
+    스토리 좌표는 지역 중심 좌표를 사용하며, 반경 안의 지역만 격자 색인으로 찾아 조회함
+    """
+    regions = region_geo_index.nearby(db, lat, lng, radius)
+    if not regions:
+        return NearbyStoryListResponse(stories=[], total=0, page=page, limit=limit)
+
+    distances = {(record.city, record.district): distance for record, distance in regions}
+    distance = case(
+        *[
+            (and_(Story.region_id1 == city, Story.region_id2 == district), round(km, 3))
+            for (city, district), km in distances.items()
+        ]
+    )
+    # 인기도(좋아요 + 조회수/10)를 거리로 나눠 정렬: 10km 떨어진 스토리는 절반
+    popularity = 1 + func.coalesce(Story.like_count, 0) + func.coalesce(Story.view_count, 0) / 10.0
+    query = db.query(Story).filter(
+        Story.is_active == True,
+        tuple_(Story.region_id1, Story.region_id2).in_(list(distances))
+    )
+    total = query.count()
+
+    offset = (page - 1) * limit
+    stories_db = query.order_by(
+        desc(popularity / (1 + distance / 10.0)), desc(Story.created_at)
+    ).offset(offset).limit(limit).all()
+
+    return NearbyStoryListResponse(
+        stories=[
+            NearbyStoryResponse(
+                **fields,
+                distance_km=round(distances[(story.region_id1, story.region_id2)], 2)
+            )
+            for story, fields in zip(stories_db, _story_response_fields(db, stories_db, current_user))
+        ],
+        total=total,
+        page=page,
+        limit=limit
+    )
+
 @router.post("/", response_model=StoryResponse)
 async def create_story(
     story: StoryCreate,
@@ -206,13 +351,13 @@ async def create_story(
     print(f"Story data: {story.dict()}")
     
     # 가이드 권한 확인
-    guide = db.query(Guide).filter(Guide.user_id == current_user.id).first()
+    guide = guide_directory.get_by_user_id(db, current_user.id)
     if not guide or not guide.is_approved:
         raise HTTPException(status_code=403, detail="Only approved guides can create stories")
     
     # 스토리 생성
     db_story = Story(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         user_id=current_user.id,
         guide_id=guide.id,
         title=story.title,
@@ -250,8 +395,8 @@ async def create_story(
         view_count=db_story.view_count,
         like_count=db_story.like_count,
         is_active=db_story.is_active,
-        created_at=datetime.fromisoformat(db_story.created_at) if isinstance(db_story.created_at, str) else db_story.created_at,
-        updated_at=datetime.fromisoformat(db_story.updated_at) if isinstance(db_story.updated_at, str) else db_story.updated_at,
+        created_at=db_story.created_at,
+        updated_at=db_story.updated_at,
         author_nickname=current_user.nickname,
         author_profile_image=current_user.profile_image,
         region_name=region_name,
@@ -307,8 +452,8 @@ async def get_story(
         view_count=story.view_count,
         like_count=story.like_count,
         is_active=story.is_active,
-        created_at=datetime.fromisoformat(story.created_at) if isinstance(story.created_at, str) else story.created_at,
-        updated_at=datetime.fromisoformat(story.updated_at) if isinstance(story.updated_at, str) else story.updated_at,
+        created_at=story.created_at,
+        updated_at=story.updated_at,
         author_nickname=author.nickname if author else "Unknown",
         author_profile_image=author.profile_image if author else None,
         region_name=region_name,
@@ -340,7 +485,7 @@ async def toggle_like(
     else:
         # 좋아요 추가
         new_like = StoryLike(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=current_user.id,
             story_id=story_id
         )
@@ -358,7 +503,7 @@ async def toggle_like(
 @router.get("/{story_id}/comments", response_model=List[CommentResponse])
 async def get_comments(
     story_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """댓글 목록 조회"""
     # 부모 댓글만 먼저 조회
@@ -387,8 +532,8 @@ async def get_comments(
                 user_profile_image=reply_user.profile_image if reply_user else None,
                 content=reply.content,
                 parent_id=reply.parent_id,
-                created_at=datetime.fromisoformat(reply.created_at) if isinstance(reply.created_at, str) else reply.created_at,
-                updated_at=datetime.fromisoformat(reply.updated_at) if isinstance(reply.updated_at, str) else reply.updated_at,
+                created_at=reply.created_at,
+                updated_at=reply.updated_at,
                 replies=[]
             ))
         
@@ -400,8 +545,8 @@ async def get_comments(
             user_profile_image=user.profile_image if user else None,
             content=comment.content,
             parent_id=comment.parent_id,
-            created_at=datetime.fromisoformat(comment.created_at) if isinstance(comment.created_at, str) else comment.created_at,
-            updated_at=datetime.fromisoformat(comment.updated_at) if isinstance(comment.updated_at, str) else comment.updated_at,
+            created_at=comment.created_at,
+            updated_at=comment.updated_at,
             replies=replies
         ))
     
@@ -446,10 +591,7 @@ async def delete_story(
         # 좋아요 삭제
         db.query(StoryLike).filter(StoryLike.story_id == story_id).delete()
         
-        # 지역 스토리 수 감소 (구 버전 호환성)
-        # 새 버전에서는 region 테이블을 사용하지 않음
-        
-        # 스토리 삭제
+        # 스토리 삭제 (지역 스토리 수는 플러시 시 region_counters가 감소)
         db.delete(story)
         db.commit()
         
@@ -494,7 +636,7 @@ async def create_comment(
     
     # 댓글 생성
     db_comment = StoryComment(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         story_id=story_id,
         user_id=current_user.id,
         **comment.dict()
@@ -511,8 +653,8 @@ async def create_comment(
         user_profile_image=current_user.profile_image,
         content=db_comment.content,
         parent_id=db_comment.parent_id,
-        created_at=datetime.fromisoformat(db_comment.created_at) if isinstance(db_comment.created_at, str) else db_comment.created_at,
-        updated_at=datetime.fromisoformat(db_comment.updated_at) if isinstance(db_comment.updated_at, str) else db_comment.updated_at,
+        created_at=db_comment.created_at,
+        updated_at=db_comment.updated_at,
         replies=[]
     )
 
@@ -539,10 +681,10 @@ async def toggle_bookmark(
     else:
         # 북마크 추가
         new_bookmark = StoryBookmark(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=current_user.id,
             story_id=story_id,
-            created_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            created_at=datetime.now()
         )
         db.add(new_bookmark)
         is_bookmarked = True
@@ -618,8 +760,8 @@ async def get_my_bookmarks(
             view_count=story.view_count,
             like_count=story.like_count,
             is_active=story.is_active,
-            created_at=datetime.fromisoformat(story.created_at) if isinstance(story.created_at, str) else story.created_at,
-            updated_at=datetime.fromisoformat(story.updated_at) if isinstance(story.updated_at, str) else story.updated_at,
+            created_at=story.created_at,
+            updated_at=story.updated_at,
             author_nickname=author.nickname if author else "Unknown",
             author_profile_image=author.profile_image if author else None,
             region_name=region_name,
@@ -713,7 +855,7 @@ async def upload_media(
 ):
     """미디어 파일 업로드 (가이드만 가능)"""
     # 가이드 권한 확인
-    guide = db.query(Guide).filter(Guide.user_id == current_user.id).first()
+    guide = guide_directory.get_by_user_id(db, current_user.id)
     if not guide or not guide.is_approved:
         raise HTTPException(status_code=403, detail="Only approved guides can upload media")
     
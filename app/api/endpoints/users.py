@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
-from app.schemas.user import User, UserUpdate
+from app.schemas.user import User, UserUpdate, UserPresence, PresenceListResponse
 from app.schemas.story import StoryResponse, StoryListResponse
 from app.models.user import User as UserModel
 from app.models.guide import Guide
@@ -9,6 +9,7 @@ from app.models.story import Story, StoryLike
 from app.models.matching import MatchingRequest
 from app.core.security import get_current_user
 from app.core.database import get_db
+from app.services.guide_directory import guide_directory
 
 router = APIRouter()
 
@@ -54,8 +55,7 @@ async def apply_for_guide(
 ):
     """가이드 신청"""
     # 이미 가이드인지 확인
-    existing_guide = db.query(Guide).filter(Guide.user_id == current_user.id).first()
-    if existing_guide:
+    if guide_directory.get_by_user_id(db, current_user.id):
         raise HTTPException(status_code=400, detail="Already applied as guide")
     
     # 새 가이드 생성
@@ -87,7 +87,7 @@ async def get_guide_status(
     db: Session = Depends(get_db)
 ):
     """가이드 상태 확인"""
-    guide = db.query(Guide).filter(Guide.user_id == current_user.id).first()
+    guide = guide_directory.get_by_user_id(db, current_user.id)
     
     if not guide:
         return {"is_guide": False, "is_approved": False}
@@ -99,13 +99,28 @@ async def get_guide_status(
             "id": guide.id,
             "user_id": guide.user_id,
             "bio": guide.bio,
-            "rating": float(guide.rating) if guide.rating else 0.0,
-            "total_reviews": guide.total_reviews if guide.total_reviews else 0,
+            "rating": guide.rating,
+            "total_reviews": guide.total_reviews,
             "is_approved": guide.is_approved,
             "created_at": guide.created_at
         }
     }
 
+@router.get("/presence", response_model=PresenceListResponse)
+async def get_presence(
+    user_ids: str = Query(..., description="쉼표로 구분한 사용자 ID 목록 (최대 100개)"),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """여러 사용자의 접속 상태 일괄 조회 (전체 워커 기준)"""
+    from app.websocket.presence import presence
+    
+    ids = list(dict.fromkeys(user_id.strip() for user_id in user_ids.split(",") if user_id.strip()))
+    if len(ids) > 100:
+        raise HTTPException(status_code=400, detail="Too many user_ids (max 100)")
+    
+    statuses = await presence.get_many(ids)
+    return PresenceListResponse(users=[UserPresence(**statuses[user_id]) for user_id in ids])
+
 @router.get("/{user_id}/guide")
 async def get_user_guide(
     user_id: str,
@@ -115,14 +130,12 @@ async def get_user_guide(
     """특정 사용자의 가이드 정보 조회"""
     from app.schemas.matching import GuideResponse
     
-    # 사용자 확인
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # 가이드 정보 조회
-    guide = db.query(Guide).filter(Guide.user_id == user_id).first()
+    # 가이드 정보 조회 (가이드 프로필이 있으면 사용자도 존재)
+    guide = guide_directory.get_by_user_id(db, user_id)
     if not guide:
+        # 사용자 확인
+        if not db.query(UserModel.id).filter(UserModel.id == user_id).first():
+            raise HTTPException(status_code=404, detail="User not found")
         # 404 대신 null 반환하여 클라이언트가 처리할 수 있도록 함
         return None
     
@@ -130,12 +143,12 @@ async def get_user_guide(
         id=guide.id,
         user_id=guide.user_id,
         bio=guide.bio,
-        rating=float(guide.rating),
+        rating=guide.rating,
         total_reviews=guide.total_reviews,
         is_approved=guide.is_approved,
         created_at=guide.created_at,
-        nickname=user.nickname,
-        profile_image=user.profile_image
+        nickname=guide.nickname,
+        profile_image=guide.profile_image
     )
 
 @router.get("/liked-stories", response_model=StoryListResponse)
@@ -146,7 +159,6 @@ async def get_liked_stories(
     db: Session = Depends(get_db)
 ):
     """좋아요한 스토리 목록"""
-    from datetime import datetime
     from app.models.region import Region
     from app.models.story import StoryComment
     
@@ -189,8 +201,8 @@ async def get_liked_stories(
             view_count=story.view_count,
             like_count=story.like_count,
             is_active=story.is_active,
-            created_at=datetime.fromisoformat(story.created_at) if isinstance(story.created_at, str) else story.created_at,
-            updated_at=datetime.fromisoformat(story.updated_at) if isinstance(story.updated_at, str) else story.updated_at,
+            created_at=story.created_at,
+            updated_at=story.updated_at,
             author_nickname=author.nickname if author else "Unknown",
             author_profile_image=author.profile_image if author else None,
             region_name=f"{region.city} {region.district or ''}".strip() if region else None,
@@ -213,12 +225,11 @@ async def get_my_stories(
     db: Session = Depends(get_db)
 ):
     """내가 작성한 스토리 목록 (가이드만)"""
-    from datetime import datetime
     from app.models.region import Region
     from app.models.story import StoryComment
     
     # 가이드 확인
-    guide = db.query(Guide).filter(Guide.user_id == current_user.id).first()
+    guide = guide_directory.get_by_user_id(db, current_user.id)
     if not guide:
         return StoryListResponse(stories=[], total=0, page=page, limit=limit)
     
@@ -260,8 +271,8 @@ async def get_my_stories(
             view_count=story.view_count,
             like_count=story.like_count,
             is_active=story.is_active,
-            created_at=datetime.fromisoformat(story.created_at) if isinstance(story.created_at, str) else story.created_at,
-            updated_at=datetime.fromisoformat(story.updated_at) if isinstance(story.updated_at, str) else story.updated_at,
+            created_at=story.created_at,
+            updated_at=story.updated_at,
             author_nickname=current_user.nickname,
             author_profile_image=current_user.profile_image,
             region_name=f"{region.city} {region.district or ''}".strip() if region else None,
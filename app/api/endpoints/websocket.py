@@ -1,27 +1,42 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import or_
+import asyncio
 import json
 import logging
 from typing import Optional
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.snowflake import next_message_seq
 from app.core.security import get_current_user_ws
 from app.models.user import User
 from app.models.chat import ChatRoom
-from app.models.matching import ChatMessage
-from app.websocket.chat_websocket import manager
+from app.services.matching_service import MatchingService
+from app.websocket.chat_websocket import manager, websocket_connections_rejected_total, SLOW_CONSUMER_CLOSE_CODE
+from app.services.chat_writer import chat_writer, chat_message_id
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# WebSocket 액션의 동시 DB 사용 수 제한 (유휴 연결은 커넥션을 점유하지 않음)
+_db_slots = asyncio.Semaphore(settings.WS_DB_CONCURRENCY)
+
+
+async def run_db_action(func, *args, user_id: Optional[str] = None, read_only: bool = False):
+    """액션 단위 세션으로 동기 DB 작업을 스레드에서 실행"""
+    def call():
+        with session_scope(user_id=user_id, read_only=read_only) as db:
+            return func(db, *args)
+
+    async with _db_slots:
+        return await asyncio.to_thread(call)
+
 
 @router.websocket("/ws/chat")
-async def websocket_endpoint(
-    websocket: WebSocket,
-    db: Session = Depends(get_db)
-):
+async def websocket_endpoint(websocket: WebSocket):
     """버WebSocket 채팅 엔드포인트"""
     user = None
     
@@ -30,6 +45,13 @@ async def websocket_endpoint(
         await websocket.accept()
         logger.info("[WebSocket] Connection accepted")
         
+        # 워커당 연결 수 제한
+        if not manager.has_capacity():
+            websocket_connections_rejected_total.inc(reason="capacity")
+            logger.warning(f"[WebSocket] Connection limit reached ({settings.WS_MAX_CONNECTIONS}), rejecting")
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Server busy")
+            return
+        
         # URL에서 토큰 추출
         query_params = websocket.url.query
         logger.info(f"[WebSocket] Query params: {query_params}")
@@ -46,8 +68,9 @@ async def websocket_endpoint(
             await websocket.close(code=4001, reason="No token provided")
             return
         
-        # 토큰으로 사용자 인증
-        user = await get_current_user_ws(token, db)
+        # 토큰으로 사용자 인증 (인증용 세션은 바로 반환)
+        with session_scope() as db:
+            user = await get_current_user_ws(token, db)
         if not user:
             logger.error(f"Invalid token or user not found")
             await websocket.close(code=4001, reason="Unauthorized")
@@ -60,7 +83,7 @@ async def websocket_endpoint(
         logger.info(f"[WebSocket] User connected to manager: {user.id}")
         
         # 연결 성공 메시지 전송
-        await websocket.send_json({
+        manager.reply(websocket, {
             "type": "connection",
             "status": "connected",
             "user_id": user.id,
@@ -72,6 +95,7 @@ async def websocket_endpoint(
             try:
                 # 클라이언트로부터 메시지 수신
                 data = await websocket.receive_json()
+                manager.touch(websocket)
                 logger.info(f"[WebSocket] Received message from {user.id}: {data}")
                 
                 action = data.get("action")
@@ -80,8 +104,18 @@ async def websocket_endpoint(
                 if action == "join_room":
                     room_id = data.get("room_id")
                     if room_id:
+                        # 참여 권한은 입장 시 한 번만 확인하고 이후 이벤트는 방 인덱스로 전달
+                        room = await run_db_action(load_member_room, room_id, user.id, user_id=user.id, read_only=True)
+                        if not room:
+                            manager.reply(websocket, {
+                                "type": "error",
+                                "room_id": room_id,
+                                "message": "Not authorized to join this room"
+                            })
+                            continue
                         logger.info(f"[WebSocket] User {user.id} joining room {room_id}")
-                        await websocket.send_json({
+                        await manager.join_room(websocket, room_id, room)
+                        manager.reply(websocket, {
                             "type": "room_joined",
                             "room_id": room_id,
                             "message": f"Joined room {room_id}"
@@ -90,24 +124,36 @@ async def websocket_endpoint(
                     room_id = data.get("room_id")
                     if room_id:
                         logger.info(f"[WebSocket] User {user.id} leaving room {room_id}")
-                        await websocket.send_json({
+                        await manager.leave_room(websocket, room_id)
+                        manager.reply(websocket, {
                             "type": "room_left",
                             "room_id": room_id,
                             "message": f"Left room {room_id}"
                         })
+                elif action == "typing":
+                    await handle_typing(data, user, websocket)
+                elif action == "watch_presence":
+                    # 구독 목록 교체 후 현재 상태를 한 번에 전달, 이후에는 변경분만 전달
+                    user_ids = data.get("user_ids")
+                    if isinstance(user_ids, list):
+                        statuses = await manager.watch_presence(websocket, [str(user_id) for user_id in user_ids])
+                        manager.reply(websocket, {"type": "presence", "users": statuses})
                 elif action == "send_message":
-                    await handle_chat_message(data, user, db)
+                    await handle_chat_message(data, user, websocket)
                 elif action == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    manager.reply(websocket, {"type": "pong"})
+                elif action == "pong":
+                    # 서버 하트비트 응답 (수신 시각은 위에서 갱신됨)
+                    pass
                 elif action == "read_receipt":
-                    await handle_read_receipt(data, user, db)
+                    await handle_read_receipt(data, user, websocket)
                 else:
                     # 이전 버전 호환성을 위한 처리
                     message_type = data.get("type")
                     if message_type == "message":
-                        await handle_chat_message(data, user, db)
+                        await handle_chat_message(data, user, websocket)
                     elif message_type == "read_receipt":
-                        await handle_read_receipt(data, user, db)
+                        await handle_read_receipt(data, user, websocket)
                     else:
                         logger.warning(f"[WebSocket] Unknown action/type: {action}/{message_type}")
                 
@@ -116,13 +162,13 @@ async def websocket_endpoint(
                 break
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON received from user: {user.id}")
-                await websocket.send_json({
+                manager.reply(websocket, {
                     "type": "error",
                     "message": "Invalid message format"
                 })
             except Exception as e:
                 logger.error(f"Error handling message from user {user.id}: {e}")
-                await websocket.send_json({
+                manager.reply(websocket, {
                     "type": "error",
                     "message": str(e)
                 })
@@ -133,18 +179,146 @@ async def websocket_endpoint(
             await websocket.close(code=4000, reason=str(e))
     finally:
         if user:
-            manager.disconnect(websocket)
+            await manager.disconnect(websocket)
             logger.info(f"Cleaned up connection for user: {user.id}")
 
 
-async def handle_chat_message(data: dict, sender: User, db: Session):
-    """채팅 메시지 처리 - 이미 저장된 메시지를 WebSocket으로 브로드캐스트"""
-    logger.info(f"[handle_chat_message] This function should not be called from Flutter app")
-    # Flutter 앱에서는 이 함수를 호출하지 않음 - API를 통해 메시지 전송
-    pass
+async def handle_chat_message(data: dict, sender: User, websocket: WebSocket):
+    """채팅 메시지 처리 - 즉시 ack 후 그룹 커밋 저장기에 저장 요청
+
+    client_msg_id로 메시지 ID를 결정하므로 재전송된 메시지는 한 번만 저장/전달됨
+    """
+    room_id = data.get("room_id")
+    client_msg_id = data.get("client_msg_id")
+    text = data.get("message")
+
+    if not room_id or not client_msg_id or not isinstance(text, str) or not text.strip():
+        manager.reply(websocket, {
+            "type": "error",
+            "client_msg_id": client_msg_id,
+            "message": "room_id, client_msg_id and message are required"
+        })
+        return
+
+    # 참여 권한과 채팅방 정보는 join_room에서 한 번만 조회
+    room = manager.room_info.get(room_id) if manager.is_in_room(websocket, room_id) else None
+    if room is None or not room["is_active"]:
+        manager.reply(websocket, {
+            "type": "error",
+            "room_id": room_id,
+            "client_msg_id": client_msg_id,
+            "message": "Join an active room before sending messages"
+        })
+        return
+
+    message_id = chat_message_id(sender.id, str(client_msg_id))
+    receiver_id = room["guide_id"] if sender.id == room["user_id"] else room["user_id"]
+    created_at = datetime.now()
+    seq = next_message_seq()
+
+    # 재전송된 메시지는 다른 워커에서 처음 받았더라도 처음 발급한 seq/시각으로 ack
+    claimed = await chat_writer.claim(message_id, seq, created_at)
+    duplicate = claimed is not None
+    if duplicate:
+        seq, created_at = claimed
+    else:
+        future = chat_writer.submit({
+            "id": message_id,
+            "seq": seq,
+            "chat_room_id": room_id,
+            "matching_request_id": room["matching_request_id"],
+            "sender_id": sender.id,
+            "receiver_id": receiver_id,
+            "message": text,
+            "is_read": False,
+            "created_at": created_at
+        })
+        asyncio.create_task(_notify_if_persist_failed(future, sender.id, room_id, client_msg_id, message_id))
+
+    # 저장 완료를 기다리지 않고 즉시 ack
+    manager.reply(websocket, {
+        "type": "message_ack",
+        "room_id": room_id,
+        "client_msg_id": client_msg_id,
+        "message_id": message_id,
+        "seq": seq,
+        "created_at": created_at.isoformat(),
+        "duplicate": duplicate
+    })
+
+    if duplicate:
+        return
 
+    await manager.send_personal_message({
+        "type": "message",
+        "room_id": room_id,
+        "data": {
+            "id": message_id,
+            "seq": seq,
+            "chat_room_id": room_id,
+            "matching_request_id": room["matching_request_id"],
+            "sender_id": sender.id,
+            "receiver_id": receiver_id,
+            "message": text,
+            "is_read": False,
+            "created_at": created_at.isoformat(),
+            "sender_nickname": sender.nickname,
+            "sender_profile_image": sender.profile_image
+        }
+    }, receiver_id)
 
-async def handle_read_receipt(data: dict, user: User, db: Session):
+
+async def _notify_if_persist_failed(future, sender_id: str, room_id: str, client_msg_id, message_id: str):
+    try:
+        if await future:
+            return
+        # 입장 후 채팅방이 비활성화됨: 이후 메시지는 저장 요청 전에 거절
+        logger.warning(f"[WebSocket] Message {message_id} rejected: room {room_id} is not active")
+        room = manager.room_info.get(room_id)
+        if room is not None:
+            room["is_active"] = False
+    except Exception as e:
+        logger.error(f"[WebSocket] Message {message_id} was not persisted: {e}")
+    await manager.send_personal_message({
+        "type": "message_failed",
+        "room_id": room_id,
+        "client_msg_id": client_msg_id,
+        "message_id": message_id
+    }, sender_id)
+
+
+async def handle_typing(data: dict, user: User, websocket: WebSocket):
+    """입력 중 표시 - 채팅방을 열어 둔 상대방에게만 전달"""
+    room_id = data.get("room_id")
+    if not room_id or not manager.is_in_room(websocket, room_id):
+        return
+
+    await manager.broadcast_to_room(room_id, {
+        "type": "typing",
+        "room_id": room_id,
+        "user_id": user.id,
+        "is_typing": bool(data.get("is_typing", True))
+    }, exclude_user_id=user.id)
+
+
+def load_member_room(db: Session, room_id: str, user_id: str) -> Optional[dict]:
+    """참여자인 경우 채팅방 정보 반환"""
+    room = db.query(
+        ChatRoom.user_id, ChatRoom.guide_id, ChatRoom.matching_request_id, ChatRoom.is_active
+    ).filter(
+        ChatRoom.id == room_id,
+        or_(ChatRoom.user_id == user_id, ChatRoom.guide_id == user_id)
+    ).first()
+    return room._asdict() if room else None
+
+
+def mark_messages_read(db: Session, room_id: str, message_ids: list, user_id: str):
+    # 읽음 처리와 읽지 않은 메시지 카운터 감소를 한 트랜잭션으로
+    MatchingService.mark_messages_read(db, room_id, user_id, message_ids)
+    db.commit()
+
+
+async def handle_read_receipt(data: dict, user: User, websocket: WebSocket):
     """읽음 처리"""
     try:
         room_id = data.get("room_id")
@@ -153,27 +327,25 @@ async def handle_read_receipt(data: dict, user: User, db: Session):
         if not room_id or not message_ids:
             return
         
-        # 메시지 읽음 처리
-        db.query(ChatMessage).filter(
-            ChatMessage.id.in_(message_ids),
-            ChatMessage.receiver_id == user.id,
-            ChatMessage.is_read == False
-        ).update({"is_read": True}, synchronize_session=False)
+        # join_room에서 참여 권한을 확인한 채팅방만 처리
+        if not manager.is_in_room(websocket, room_id):
+            manager.reply(websocket, {
+                "type": "error",
+                "room_id": room_id,
+                "message": "Join the room before sending read receipts"
+            })
+            return
         
-        db.commit()
+        # 메시지 읽음 처리 (액션 동안만 세션 사용)
+        await run_db_action(mark_messages_read, room_id, message_ids, user.id, user_id=user.id)
         
-        # 읽음 확인 전송
-        # 채팅방의 다른 사용자 찾기
-        chat_room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
-        if chat_room:
-            other_user_id = chat_room.guide_id if user.id == chat_room.user_id else chat_room.user_id
-            
-            await manager.send_personal_message({
-                "type": "read_receipt",
-                "room_id": room_id,
-                "message_ids": message_ids,
-                "reader_id": user.id
-            }, other_user_id)
+        # 채팅방을 열어 둔 다른 참여자에게 읽음 확인 전송
+        await manager.broadcast_to_room(room_id, {
+            "type": "read_receipt",
+            "room_id": room_id,
+            "message_ids": message_ids,
+            "reader_id": user.id
+        }, exclude_user_id=user.id)
         
     except Exception as e:
         logger.error(f"Error handling read receipt: {e}")
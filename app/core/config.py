@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 import secrets
 
 class Settings(BaseSettings):
@@ -8,6 +9,72 @@ class Settings(BaseSettings):
     MYSQL_USER: str = "root"
     MYSQL_PASSWORD: str = ""
     MYSQL_DATABASE: str = "storybook"
+    # 지정 시 MYSQL_* 대신 사용 (벤치마크/로컬 테스트용 SQLite 등)
+    SQLALCHEMY_DATABASE_URL: str = ""
+    
+    # Database connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # 커넥션 대기 최대 시간 (초)
+    DB_POOL_RECYCLE: int = 1800  # MySQL wait_timeout보다 짧게 유지 (초)
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_SATURATION_WARN: float = 0.8  # 풀 사용률 경고 기준 (0~1)
+    
+    # Read replicas (비어 있으면 모든 읽기를 프라이머리에서 처리)
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_STICKY_SECONDS: int = 5  # 쓰기 이후 해당 사용자의 읽기를 프라이머리로 고정하는 시간
+    
+    # SQL query instrumentation
+    SQL_QUERY_STATS_ENABLED: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10  # 요청 내 같은 형태의 쿼리가 이 횟수 이상이면 N+1로 판단
+    SQL_N_PLUS_ONE_RAISE: bool = False  # 테스트용: N+1 감지 시 예외 발생
+    
+    # Metrics (/metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: str = ""  # uvicorn 워커 간 집계용 스냅샷 디렉토리 (컨테이너 간 공유하지 않음)
+    METRICS_FLUSH_INTERVAL: int = 10  # 워커 스냅샷 기록 주기 (초)
+    
+    # Chat pub/sub (멀티 워커 WebSocket 전달: "memory"는 단일 프로세스 전용)
+    CHAT_PUBSUB_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # WebSocket send path (연결별 송신 큐)
+    WS_SEND_QUEUE_SIZE: int = 100  # 연결별 대기 메시지 최대 수 (이벤트 큐, 응답 큐 각각)
+    WS_SEND_TIMEOUT: float = 10.0  # 메시지 하나 전송 제한 시간 (초), 초과 시 연결 종료
+    WS_SLOW_CONSUMER_POLICY: str = "drop_oldest"  # 큐가 가득 찼을 때: "drop_oldest" 또는 "close"
+    
+    # WebSocket 연결/DB 사용 제한 (커넥션 풀 크기와 독립적으로 연결 수를 제한)
+    WS_MAX_CONNECTIONS: int = 5000  # 워커당 최대 WebSocket 연결 수 (초과 시 1013으로 종료)
+    WS_DB_CONCURRENCY: int = 5  # 워커당 동시에 DB를 사용하는 WebSocket 액션 수 (DB_POOL_SIZE보다 작게)
+    WS_MAX_CONNECTIONS_PER_USER: int = 5  # 초과 시 가장 오래된 연결 종료
+    WS_HEARTBEAT_INTERVAL: int = 25  # 서버 하트비트(ping) 및 유휴 연결 정리 주기 (초)
+    WS_IDLE_TIMEOUT: int = 75  # 이 시간 동안 클라이언트 프레임이 없으면 연결 종료 (초)
+    PRESENCE_DEBOUNCE_MS: int = 1000  # 접속 상태 변경을 모아서 전달하는 주기 (ms)
+    PRESENCE_MAX_WATCH: int = 200  # 연결당 접속 상태를 구독할 수 있는 최대 사용자 수
+    
+    # Guide directory cache (가이드 권한 확인/프로필 표시용, 변경 시 즉시 무효화)
+    GUIDE_CACHE_TTL: int = 300  # 초
+    GUIDE_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Guide discovery index (/matching/guides/search)
+    GUIDE_INDEX_REFRESH_INTERVAL: int = 30  # 변경된 가이드 재계산 주기 (초)
+    GUIDE_INDEX_FULL_REBUILD_INTERVAL: int = 3600  # 전체 재구성 주기 (초, 삭제 반영용)
+    
+    # Region map (/regions/map) 캐시 유지 시간 (초)
+    REGION_MAP_CACHE_TTL: int = 60
+    # Region catalogue (/regions) 스토리 수 스냅샷 갱신 주기 및 응답 Cache-Control max-age (초)
+    REGION_COUNTS_TTL: int = 60
+
+    # Story full-text search (/stories/search, 워커별 BM25 역색인)
+    STORY_SEARCH_INDEX_PATH: str = "data/story_search_index.json.gz"  # 디스크 스냅샷 (비우면 저장 안 함)
+    STORY_SEARCH_REFRESH_INTERVAL: int = 30  # 다른 워커 변경분 반영 주기 (초)
+    STORY_SEARCH_FULL_SYNC_INTERVAL: int = 3600  # 활성 스토리 ID 대조 주기 (초, 하드 삭제 반영용)
+    
+    # Chat message group commit (WebSocket send_message 저장)
+    CHAT_WRITER_FLUSH_INTERVAL_MS: int = 5  # 첫 메시지 이후 배치를 모으는 시간
+    CHAT_WRITER_MAX_BATCH: int = 200
+    # 채팅 메시지 seq 생성용 워커 ID (0~1023, 프로세스마다 달라야 함. 미지정 시 호스트 이름 + PID 해시)
+    SNOWFLAKE_WORKER_ID: Optional[int] = None
     
     # JWT
     SECRET_KEY: str = secrets.token_urlsafe(32)
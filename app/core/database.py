@@ -1,22 +1,217 @@
-from sqlalchemy import create_engine
+from typing import Optional, Iterator
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, DateTime, Insert, Update, Delete
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from starlette.requests import HTTPConnection
+from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.pool_monitor import InstrumentedQueuePool, instrument_engine
 from urllib.parse import quote_plus
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 # 비밀번호를 URL 인코딩
 encoded_password = quote_plus(settings.MYSQL_PASSWORD)
 
-SQLALCHEMY_DATABASE_URL = f"mysql+mysqlconnector://{settings.MYSQL_USER}:{encoded_password}@{settings.MYSQL_HOST}:{settings.MYSQL_PORT}/{settings.MYSQL_DATABASE}"
+SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL or f"mysql+mysqlconnector://{settings.MYSQL_USER}:{encoded_password}@{settings.MYSQL_HOST}:{settings.MYSQL_PORT}/{settings.MYSQL_DATABASE}"
+
+
+def _create_pooled_engine(url: str, name: str) -> Engine:
+    """설정값으로 커넥션 풀을 구성하고 풀 지표를 등록한 엔진 생성"""
+    # 워커 프로세스당 최대 커넥션 수 = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    # (워커 수 x 최대 커넥션 수)가 MySQL max_connections를 넘지 않도록 설정
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    pooled_engine = create_engine(
+        url,
+        connect_args=connect_args,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    instrument_engine(
+        pooled_engine,
+        name,
+        capacity=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        saturation_warn=settings.DB_POOL_SATURATION_WARN,
+    )
+    return pooled_engine
+
+
+engine = _create_pooled_engine(SQLALCHEMY_DATABASE_URL, "primary")
+replica_engines = [
+    _create_pooled_engine(url, f"replica-{index}")
+    for index, url in enumerate(settings.DB_REPLICA_URLS)
+]
+_replica_cycle = itertools.cycle(range(len(replica_engines))) if replica_engines else None
+
+
+class ReadYourWrites:
+    """사용자별 최근 쓰기 시각을 기록해 레플리카 지연 동안 읽기를 프라이머리로 고정
+
+    redis_url이 있으면 고정 정보를 Redis 키(TTL = window)로도 저장해 다른 워커/인스턴스에서도 적용됨.
+    없으면 워커별 메모리에만 기록하므로 다른 워커로 간 읽기에는 적용되지 않음 (best-effort)
+    """
+
+    KEY_PREFIX = "ryw:"
+
+    def __init__(self, window_seconds: float, redis_url: Optional[str] = None):
+        self.window_seconds = window_seconds
+        # user_id -> 프라이머리 고정 만료 시각 (monotonic)
+        self._pinned_until: dict = {}
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url:
+            import redis
+            # 요청 경로에서 호출되므로 Redis 장애 시 오래 기다리지 않도록 짧은 타임아웃
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.2, socket_connect_timeout=0.2)
+
+    def mark(self, user_id: str):
+        with self._lock:
+            self._pinned_until[user_id] = time.monotonic() + self.window_seconds
+            # 만료된 항목 정리 (크기가 커졌을 때만)
+            if len(self._pinned_until) > 10000:
+                now = time.monotonic()
+                self._pinned_until = {k: v for k, v in self._pinned_until.items() if v > now}
+        if self._redis is not None:
+            try:
+                self._redis.set(self.KEY_PREFIX + user_id, 1, px=int(self.window_seconds * 1000))
+            except Exception as e:
+                logger.warning(f"[ReadYourWrites] Failed to store pin for user {user_id}: {e}")
+
+    def is_pinned(self, user_id: Optional[str]) -> bool:
+        if not user_id:
+            return False
+        expires_at = self._pinned_until.get(user_id)
+        if expires_at is not None and expires_at > time.monotonic():
+            return True
+        if self._redis is None:
+            return False
+        try:
+            return bool(self._redis.exists(self.KEY_PREFIX + user_id))
+        except Exception as e:
+            # 고정 여부를 알 수 없으면 최신 데이터를 보장하는 프라이머리로 보냄
+            logger.warning(f"[ReadYourWrites] Failed to read pin for user {user_id}: {e}")
+            return True
+
+
+read_your_writes = ReadYourWrites(
+    settings.DB_REPLICA_STICKY_SECONDS,
+    redis_url=settings.REDIS_URL if replica_engines and settings.CHAT_PUBSUB_BACKEND == "redis" else None
+)
+
+
+class RoutingSession(Session):
+    """읽기는 레플리카로, 쓰기와 쓰기 이후의 읽기는 프라이머리로 보내는 세션"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            not replica_engines
+            or self.info.get("use_primary")
+            or self._flushing
+            or isinstance(clause, (Insert, Update, Delete))
+        ):
+            return engine
+        # 한 세션(요청) 안에서는 같은 레플리카를 사용해 읽기 일관성 유지
+        if "replica_index" not in self.info:
+            self.info["replica_index"] = next(_replica_cycle)
+        return replica_engines[self.info["replica_index"]]
+
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=RoutingSession)
 
 Base = declarative_base()
 
-def get_db():
+# 생성/수정 시각 컬럼 타입: MySQL은 마이크로초 단위 DATETIME(6), 그 외(SQLite 등)는 DateTime
+Timestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+
+def request_user_id(connection: HTTPConnection) -> Optional[str]:
+    """요청의 액세스 토큰에서 사용자 ID 추출 (라우팅 용도로만 사용, 인증은 security에서 검증)"""
+    token = None
+    authorization = connection.headers.get("authorization")
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    else:
+        token = connection.query_params.get("token")
+    if not token:
+        return None
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+
+def _mark_session_writes(session, flush_context=None):
+    session.info["has_writes"] = True
+    # 쓰기 이후의 읽기는 같은 세션에서 프라이머리로 보냄
+    session.info["use_primary"] = True
+
+
+def _mark_bulk_writes(bulk_context):
+    _mark_session_writes(bulk_context.session)
+
+
+def _pin_writer_to_primary(session):
+    if session.info.pop("has_writes", False):
+        user_id = session.info.get("request_user_id")
+        if user_id:
+            read_your_writes.mark(user_id)
+
+
+for _factory in (SessionLocal, ReadSessionLocal):
+    event.listen(_factory, "after_flush", _mark_session_writes)
+    event.listen(_factory, "after_bulk_update", _mark_bulk_writes)
+    event.listen(_factory, "after_bulk_delete", _mark_bulk_writes)
+    event.listen(_factory, "after_commit", _pin_writer_to_primary)
+
+
+def get_db(connection: HTTPConnection):
     db = SessionLocal()
+    if replica_engines:
+        db.info["request_user_id"] = request_user_id(connection)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(connection: HTTPConnection):
+    """읽기 전용 엔드포인트용 세션 (레플리카 우선, 최근 쓰기한 사용자는 프라이머리)"""
+    db = ReadSessionLocal()
+    if replica_engines:
+        user_id = request_user_id(connection)
+        db.info["request_user_id"] = user_id
+        if read_your_writes.is_pinned(user_id):
+            db.info["use_primary"] = True
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def session_scope(user_id: Optional[str] = None, read_only: bool = False) -> Iterator[Session]:
+    """요청 의존성 밖(WebSocket 액션 등)에서 작업 단위로만 커넥션을 점유하는 세션"""
+    db = ReadSessionLocal() if read_only else SessionLocal()
+    if replica_engines and user_id:
+        db.info["request_user_id"] = user_id
+        if read_only and read_your_writes.is_pinned(user_id):
+            db.info["use_primary"] = True
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
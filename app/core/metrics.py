@@ -0,0 +1,372 @@
+from typing import Dict, Tuple, List, Optional, Callable, Iterable, Any
+from bisect import bisect_left
+import glob
+import json
+import logging
+import fcntl
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 요청 지연 시간용 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# 종료된 워커의 카운터/히스토그램을 합쳐 두는 스냅샷 파일 (metrics_*.json 패턴이라 수집에 포함됨)
+ARCHIVE_FILE = "metrics_archive.json"
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # 라벨 값 튜플 -> 값
+        self._series: Dict[Tuple[str, ...], Any] = {}
+        # 스레드풀(동기 엔드포인트, asyncio.to_thread)에서도 갱신되므로 갱신/복사는 락 안에서
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def series(self) -> Dict[Tuple[str, ...], Any]:
+        with self._lock:
+            return {key: list(value) if isinstance(value, list) else value for key, value in self._series.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "series": [[list(key), value] for key, value in self.series().items()],
+        }
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """현재 값 지표. callback이 있으면 수집 시점에 값을 계산"""
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 callback: Optional[Callable[[], Any]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def series(self) -> Dict[Tuple[str, ...], Any]:
+        if self.callback is None:
+            return super().series()
+        try:
+            value = self.callback()
+        except Exception as e:
+            logger.error(f"Gauge callback failed for {self.name}: {e}")
+            return {}
+        # callback은 단일 값 또는 {라벨 dict 튜플: 값} 형태의 dict 반환
+        if isinstance(value, dict):
+            return {self._key(dict(labels)): v for labels, v in value.items()}
+        return {(): value}
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램. 워커별로 갱신하고 수집 시 합산"""
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [버킷별 개수..., +Inf 버킷 개수, 합계]
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot["buckets"] = list(self.buckets)
+        return snapshot
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # 다른 사용자의 프로세스
+        return True
+    return True
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: List[str], values: List[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """프로세스 내 지표 저장소. 멀티 워커 환경에서는 워커별 스냅샷 파일을 합산"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self.multiproc_dir: Optional[str] = None
+        # 이 프로세스가 스냅샷 파일을 기록했는지 (PID 재사용 시 이전 프로세스 파일 구분용)
+        self._written = False
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+              callback: Optional[Callable[[], Any]] = None) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self, include_gauges: bool = True) -> Dict[str, Any]:
+        return {
+            name: metric.snapshot()
+            for name, metric in self._metrics.items()
+            if include_gauges or metric.type != "gauge"
+        }
+
+    # --- 멀티 워커 집계 ---
+
+    def _snapshot_path(self, pid: Optional[int] = None) -> str:
+        return os.path.join(self.multiproc_dir, f"metrics_{pid or os.getpid()}.json")
+
+    def write_snapshot(self, final: bool = False):
+        """워커의 현재 지표를 파일로 기록 (원자적 교체). 종료 시에는 게이지 제외"""
+        if not self.multiproc_dir:
+            return
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        self.archive_dead_workers()
+        self._written = True
+        path = self._snapshot_path()
+        data = {
+            "pid": os.getpid(),
+            "written_at": time.time(),
+            "final": final,
+            "metrics": self.snapshot(include_gauges=not final),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def archive_dead_workers(self):
+        """종료된 워커의 스냅샷 파일을 archive 파일에 합치고 삭제 (카운터 합계는 유지, 파일 수는 워커 수로 제한)
+
+        이전 프로세스와 PID가 같아 이 워커가 덮어쓸 파일도 처음 기록 전에 합침
+        """
+        dead_paths = []
+        for path in glob.glob(os.path.join(self.multiproc_dir, "metrics_*.json")):
+            pid = os.path.basename(path)[len("metrics_"):-len(".json")]
+            if not pid.isdigit():
+                continue
+            if int(pid) == os.getpid():
+                if not self._written:
+                    dead_paths.append(path)
+            elif not _pid_alive(int(pid)):
+                dead_paths.append(path)
+        if not dead_paths:
+            return
+
+        # 여러 워커가 동시에 정리하지 않도록 디렉토리 단위 파일 락
+        with open(os.path.join(self.multiproc_dir, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            archive_path = os.path.join(self.multiproc_dir, ARCHIVE_FILE)
+            snapshots = []
+            for path in [archive_path, *dead_paths]:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        metrics = json.load(f).get("metrics", {})
+                except FileNotFoundError:
+                    # 다른 워커가 이미 정리함
+                    continue
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+                    metrics = {}
+                snapshots.append({name: m for name, m in metrics.items() if m["type"] != "gauge"})
+
+            merged = self.merge(snapshots)
+            data = {
+                "pid": None,
+                "written_at": time.time(),
+                "final": True,
+                "metrics": {
+                    name: {**metric, "series": [[list(key), value] for key, value in metric["series"].items()]}
+                    for name, metric in merged.items()
+                },
+            }
+            tmp_path = f"{archive_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, archive_path)
+            for path in dead_paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        logger.info(f"Archived {len(dead_paths)} metrics snapshots from exited workers")
+
+    def collect_snapshots(self, gauge_max_age: float) -> List[Dict[str, Any]]:
+        """모든 워커의 스냅샷 수집. 오래된 파일의 게이지는 죽은 워커로 보고 제외"""
+        if not self.multiproc_dir:
+            return [self.snapshot()]
+
+        snapshots = [self.snapshot()]
+        now = time.time()
+        own_path = self._snapshot_path()
+        for path in glob.glob(os.path.join(self.multiproc_dir, "metrics_*.json")):
+            if path == own_path:
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+                continue
+            metrics = data.get("metrics", {})
+            if data.get("final") or now - data.get("written_at", 0) > gauge_max_age:
+                metrics = {name: m for name, m in metrics.items() if m["type"] != "gauge"}
+            snapshots.append(metrics)
+        return snapshots
+
+    @staticmethod
+    def merge(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        merged: Dict[str, Any] = {}
+        for snapshot in snapshots:
+            for name, metric in snapshot.items():
+                target = merged.get(name)
+                if target is None:
+                    target = merged[name] = {**metric, "series": {}}
+                for labels, value in metric["series"]:
+                    key = tuple(labels)
+                    current = target["series"].get(key)
+                    if current is None:
+                        target["series"][key] = list(value) if isinstance(value, list) else value
+                    elif isinstance(value, list):
+                        target["series"][key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        target["series"][key] = current + value
+        return merged
+
+    def render(self, gauge_max_age: float = 60.0) -> str:
+        """Prometheus 텍스트 포맷으로 출력"""
+        merged = self.merge(self.collect_snapshots(gauge_max_age))
+        lines = []
+        for name, metric in sorted(merged.items()):
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric["labelnames"]
+            for labels, value in sorted(metric["series"].items()):
+                if metric["type"] == "histogram":
+                    cumulative = 0
+                    for bound, count in zip(metric["buckets"] + [float("inf")], value[:-1]):
+                        cumulative += count
+                        le = _format_value(float(bound))
+                        lines.append(f"{name}_bucket{_format_labels(labelnames, list(labels), ('le', le))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labelnames, list(labels))} {_format_value(value[-1])}")
+                    lines.append(f"{name}_count{_format_labels(labelnames, list(labels))} {cumulative}")
+                else:
+                    lines.append(f"{name}{_format_labels(labelnames, list(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# 전역 지표 저장소
+registry = MetricsRegistry()
+
+# HTTP 요청 지표
+http_requests_total = registry.counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being processed"
+)
+http_response_size_bytes = registry.histogram(
+    "http_response_size_bytes", "HTTP response body size", ("route",), buckets=SIZE_BUCKETS
+)
+http_request_db_seconds = registry.histogram(
+    "http_request_db_seconds", "Time spent in SQL queries per request", ("route",)
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries", "SQL queries executed per request", ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+
+# 백그라운드 작업 지표
+thumbnail_job_duration_seconds = registry.histogram(
+    "thumbnail_job_duration_seconds", "Thumbnail generation duration", ("kind", "result"),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+def route_template(app, scope) -> str:
+    """요청 경로를 라우트 템플릿(/stories/{story_id})으로 변환 (라벨 카디널리티 제한)"""
+    from starlette.routing import Match
+
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope.get("path", ""))
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.PARTIAL:
+            return getattr(route, "path", scope.get("path", ""))
+    return "<unmatched>"
@@ -0,0 +1,178 @@
+from typing import Dict, Any, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from app.core.metrics import registry
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+db_pool_wait_seconds = registry.histogram(
+    "db_pool_wait_seconds", "Time spent acquiring a pooled connection", ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+
+
+class PoolMetrics:
+    """커넥션 풀 사용 지표 (체크아웃 수, 대기 시간, 오버플로우, pre-ping 실패)"""
+
+    def __init__(self, name: str, engine: Engine, capacity: int, saturation_warn: float):
+        self.name = name
+        self.engine = engine
+        self.capacity = capacity
+        self.saturation_warn = saturation_warn
+
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.checkout_timeouts = 0
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.saturated = False
+
+        # 풀 이벤트는 스레드풀에서도 발생하므로 카운터 갱신은 락으로 보호
+        self._lock = threading.Lock()
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            saturation = self._saturation()
+            alarm = saturation >= self.saturation_warn and not self.saturated
+            if alarm:
+                self.saturated = True
+
+        if alarm:
+            logger.warning(
+                f"[DB Pool:{self.name}] Saturation {saturation:.0%} "
+                f"({self.checked_out}/{self.capacity} connections checked out)"
+            )
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+            recovered = self.saturated and self._saturation() < self.saturation_warn
+            if recovered:
+                self.saturated = False
+
+        if recovered:
+            logger.info(f"[DB Pool:{self.name}] Saturation recovered ({self.checked_out}/{self.capacity})")
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+            # pre-ping 실패 시 DisconnectionError로 커넥션이 무효화됨
+            if isinstance(exception, exc.DisconnectionError):
+                self.pre_ping_failures += 1
+
+        if isinstance(exception, exc.DisconnectionError):
+            logger.warning(f"[DB Pool:{self.name}] Pre-ping failed, connection invalidated")
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+        db_pool_wait_seconds.observe(seconds, pool=self.name)
+
+    def record_timeout(self):
+        with self._lock:
+            self.checkout_timeouts += 1
+        logger.error(f"[DB Pool:{self.name}] Checkout timed out ({self.checked_out}/{self.capacity} in use)")
+
+    def _saturation(self) -> float:
+        if self.capacity <= 0:
+            return 0.0
+        return self.checked_out / self.capacity
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 풀 상태를 dict로 반환 (/health 응답용)"""
+        pool = self.engine.pool
+        with self._lock:
+            return {
+                "pool_class": type(pool).__name__,
+                "capacity": self.capacity,
+                "pool_size": pool.size() if isinstance(pool, QueuePool) else None,
+                "overflow": max(0, pool.overflow()) if isinstance(pool, QueuePool) else None,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "saturation": round(self._saturation(), 3),
+                "saturated": self.saturated,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "checkout_timeouts": self.checkout_timeouts,
+                "wait_avg_ms": round(self.wait_time_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                "wait_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """커넥션 획득 대기 시간을 측정하는 QueuePool"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.record_timeout()
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() 등으로 풀이 재생성되어도 지표 연결 유지
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+# 엔진 이름 -> 풀 지표
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def instrument_engine(engine: Engine, name: str, capacity: int, saturation_warn: float) -> PoolMetrics:
+    """엔진의 커넥션 풀에 이벤트 리스너를 등록하고 지표 객체를 반환"""
+    metrics = PoolMetrics(name, engine, capacity, saturation_warn)
+
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def get_pool_status() -> Dict[str, Dict[str, Any]]:
+    """등록된 모든 풀의 상태 반환"""
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+registry.gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ("pool",),
+    callback=lambda: {(("pool", name),): metrics.checked_out for name, metrics in pool_metrics.items()}
+)
+registry.gauge(
+    "db_pool_capacity", "Maximum connections per worker (pool_size + max_overflow)", ("pool",),
+    callback=lambda: {(("pool", name),): metrics.capacity for name, metrics in pool_metrics.items()}
+)
@@ -0,0 +1,121 @@
+from typing import Optional, List, Tuple, Dict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import json
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# IN (...) 파라미터 목록, 문자열/숫자 리터럴을 하나의 자리표시자로 정규화
+_PARAM = r"(?:%\([^)]*\)s|%s|\?|:\w+)"
+_IN_LIST_RE = re.compile(r"\(\s*" + _PARAM + r"(?:\s*,\s*" + _PARAM + r")*\s*\)")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class NPlusOneDetected(AssertionError):
+    """같은 형태의 쿼리가 임계값 이상 반복됨 (SQL_N_PLUS_ONE_RAISE 설정 시)"""
+
+
+def statement_shape(statement: str) -> str:
+    """파라미터 값과 무관하게 같은 쿼리를 식별하기 위한 정규화된 SQL"""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _STRING_RE.sub("?", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    return _IN_LIST_RE.sub("(?)", shape)
+
+
+class QueryStats:
+    """요청 하나에서 실행된 SQL 쿼리 수, DB 시간, 반복된 쿼리 형태"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """threshold번 이상 실행된 쿼리 형태 (N+1 의심)"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_time * 1000:.1f};desc="{self.count} queries"'
+
+    def summary(self) -> Dict:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.total_time * 1000, 2),
+            "distinct_statements": len(self.shapes),
+        }
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def query_stats_scope():
+    """이 블록(요청)에서 실행되는 쿼리를 집계"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    stats.record(statement, time.perf_counter() - start_times.pop())
+
+
+def install_query_listeners():
+    """모든 엔진의 커서 실행 이벤트에 쿼리 집계 리스너 등록"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def report_query_stats(method: str, path: str, response, stats: QueryStats, threshold: int, strict: bool):
+    """Server-Timing 헤더 추가, 구조화 로그 기록, N+1 패턴 경고"""
+    response.headers["Server-Timing"] = stats.server_timing()
+    response.headers["X-DB-Query-Count"] = str(stats.count)
+
+    if stats.count == 0:
+        return
+
+    repeated = stats.repeated(threshold)
+    summary = {"method": method, "path": path, **stats.summary()}
+    if repeated:
+        summary["n_plus_one"] = [{"count": count, "statement": shape[:200]} for shape, count in repeated]
+        logger.warning(f"[QueryStats] {json.dumps(summary, ensure_ascii=False)}")
+        if strict:
+            raise NPlusOneDetected(
+                f"{method} {path}: {len(repeated)} statement(s) repeated >= {threshold} times "
+                f"(top: {repeated[0][1]}x {repeated[0][0][:120]})"
+            )
+    else:
+        logger.info(f"[QueryStats] {json.dumps(summary, ensure_ascii=False)}")
@@ -1,3 +1,8 @@
+from typing import Dict, List, Mapping, Optional, Tuple
+from bisect import bisect_left
+from dataclasses import dataclass
+from types import MappingProxyType
+
 # 지역 데이터 정의
 REGION_DATA = {
     '수도권': [
@@ -30,17 +35,93 @@ REGION_DATA = {
     ]
 }
 
-def get_region_category(city: str) -> str:
-    """도시명으로부터 지역 카테고리(수도권, 강원 등)를 반환"""
-    for category, cities in REGION_DATA.items():
-        if city in cities:
-            return category
-    return None
+# 초성 (한글 음절 = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 변환 (그 외 문자는 그대로)"""
+    return "".join(
+        CHOSEONG[(ord(ch) - 0xAC00) // 588] if "가" <= ch <= "힣" else ch
+        for ch in text
+    )
+
+
+def is_choseong_query(text: str) -> bool:
+    return bool(text) and all(ch in CHOSEONG for ch in text)
+
+
+@dataclass(frozen=True)
+class RegionEntry:
+    category: str  # 큰 지역 (스토리 region_id1, regions.city)
+    city: str  # 세부 도시 (스토리 region_id2, regions.district)
+
+    @property
+    def name(self) -> str:
+        return f"{self.category} - {self.city}"
+
+
+class RegionCatalogue:
+    """REGION_DATA로 import 시 한 번 만드는 불변 지역 목록
+
+    도시 -> 카테고리 역색인(같은 이름이 여러 카테고리에 있을 수 있음)과
+    도시명/초성 정렬 목록을 두어 조회는 O(1), 접두어 검색은 이진 탐색으로 처리
+    """
+
+    def __init__(self, data: Dict[str, List[str]]):
+        self.entries: Tuple[RegionEntry, ...] = tuple(
+            RegionEntry(category, city) for category, cities in data.items() for city in cities
+        )
+        self.categories: Tuple[str, ...] = tuple(data)
+        self.cities_by_category: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {category: tuple(cities) for category, cities in data.items()}
+        )
+        categories_by_city: Dict[str, Tuple[str, ...]] = {}
+        for entry in self.entries:
+            categories_by_city[entry.city] = categories_by_city.get(entry.city, ()) + (entry.category,)
+        self.categories_by_city: Mapping[str, Tuple[str, ...]] = MappingProxyType(categories_by_city)
+        self._keys = frozenset((entry.category, entry.city) for entry in self.entries)
+
+        # (검색 키, 순번) 정렬 목록: 도시명과 초성 각각
+        self._by_name = sorted((entry.city, i) for i, entry in enumerate(self.entries))
+        self._by_choseong = sorted((to_choseong(entry.city), i) for i, entry in enumerate(self.entries))
+
+    def contains(self, category: str, city: str) -> bool:
+        return (category, city) in self._keys
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[RegionEntry]:
+        """도시명 접두어 또는 초성 접두어(예: "ㄱㄹ" -> 강릉, 구리) 검색, 일치 항목은 REGION_DATA 순서"""
+        query = query.strip()
+        if not query:
+            return []
+        index = self._by_choseong if is_choseong_query(query) else self._by_name
+        start = bisect_left(index, (query,))
+        matched = []
+        for key, i in index[start:]:
+            if not key.startswith(query):
+                break
+            matched.append(i)
+        matched.sort()
+        entries = [self.entries[i] for i in matched]
+        return entries[:limit] if limit else entries
+
+
+region_catalogue = RegionCatalogue(REGION_DATA)
+
+
+def get_region_categories(city: str) -> Tuple[str, ...]:
+    """도시명이 속한 모든 지역 카테고리 ('광주', '고성'처럼 여러 곳에 있는 이름 포함)"""
+    return region_catalogue.categories_by_city.get(city, ())
+
+def get_region_category(city: str) -> Optional[str]:
+    """도시명으로부터 지역 카테고리(수도권, 강원 등)를 반환 (여러 카테고리에 있는 이름이면 None)"""
+    categories = get_region_categories(city)
+    return categories[0] if len(categories) == 1 else None
 
 def get_cities_by_category(category: str) -> list:
     """지역 카테고리에 속한 도시 목록 반환"""
-    return REGION_DATA.get(category, [])
+    return list(region_catalogue.cities_by_category.get(category, ()))
 
 def get_all_categories() -> list:
     """모든 지역 카테고리 반환"""
-    return list(REGION_DATA.keys())
+    return list(region_catalogue.categories)
@@ -0,0 +1,63 @@
+from app.core.config import settings
+import hashlib
+import os
+import socket
+import threading
+import time
+
+# 2020-01-01T00:00:00Z (ms). 41비트 시간 값으로 약 69년 사용 가능
+EPOCH_MS = 1577836800000
+
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class SnowflakeGenerator:
+    """시간순으로 증가하는 64비트 정수 ID 생성기 (시간 41비트 | 워커 10비트 | 순번 12비트)
+
+    같은 프로세스 안에서는 단조 증가, 워커 간에는 ms 단위 시간순으로 정렬됨
+    """
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id & MAX_WORKER_ID
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            now_ms = int(time.time() * 1000)
+            # 시계가 뒤로 가도 이전 값보다 작은 ID를 만들지 않음
+            if now_ms <= self._last_ms:
+                now_ms = self._last_ms
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # 같은 ms 안에서 순번을 모두 사용하면 다음 ms 값을 사용
+                    now_ms += 1
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+            return ((now_ms - EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+
+def seq_from_timestamp(timestamp_ms: int, offset: int = 0) -> int:
+    """기존 데이터 백필용: 시각과 같은 시각 내 순번으로 seq 계산"""
+    return ((timestamp_ms - EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)) | (offset & ((1 << (WORKER_BITS + SEQUENCE_BITS)) - 1))
+
+
+def _default_worker_id() -> int:
+    if settings.SNOWFLAKE_WORKER_ID is not None:
+        return settings.SNOWFLAKE_WORKER_ID
+    # 컨테이너마다 PID가 1로 같을 수 있으므로 호스트 이름(파드 이름)과 PID를 함께 사용
+    # 10비트로 줄이면 충돌할 수 있지만, 조회는 (seq, id) 순서라 seq가 같아도 메시지가 빠지지 않음
+    digest = hashlib.blake2b(f"{socket.gethostname()}:{os.getpid()}".encode(), digest_size=2).digest()
+    return int.from_bytes(digest, "big")
+
+
+message_seq = SnowflakeGenerator(_default_worker_id())
+
+
+def next_message_seq() -> int:
+    return message_seq.next_id()
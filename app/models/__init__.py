@@ -5,7 +5,7 @@ from app.models.story import Story
 from app.models.bookmark import StoryBookmark
 from app.models.guide import Guide
 from app.models.matching import MatchingRequest, ChatMessage
-from app.models.chat import ChatRoom
+from app.models.chat import ChatRoom, ChatUnreadCounter
 from app.models.report import StoryReport
 
 __all__ = [
@@ -18,5 +18,6 @@ __all__ = [
     "MatchingRequest",
     "ChatMessage",
     "ChatRoom",
+    "ChatUnreadCounter",
     "StoryReport"
 ]
@@ -1,14 +1,14 @@
-from sqlalchemy import Column, String, ForeignKey, UniqueConstraint
-from app.core.database import Base
-import uuid
+from sqlalchemy import Column, ForeignKey, UniqueConstraint
+from app.core.database import Base, Timestamp
+from app.core.ids import BinaryUUID, new_id
 
 class StoryBookmark(Base):
     __tablename__ = "story_bookmarks"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    story_id = Column(String(36), ForeignKey("stories.id", ondelete="CASCADE"), nullable=False)
-    created_at = Column(String(19), nullable=False)
+    id = Column(BinaryUUID, primary_key=True, default=new_id)
+    user_id = Column(BinaryUUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    story_id = Column(BinaryUUID, ForeignKey("stories.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(Timestamp, nullable=False)
     
     # 사용자당 스토리 중복 북마크 방지
     __table_args__ = (
@@ -1,17 +1,17 @@
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Text, Boolean, ForeignKey, DateTime, Integer
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
-import uuid
+from app.core.ids import BinaryUUID, new_id
 
 
 class ChatRoom(Base):
     __tablename__ = "chat_rooms"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
-    guide_id = Column(String(36), ForeignKey("users.id"), nullable=False)
-    matching_request_id = Column(String(36), ForeignKey("matching_requests.id"), nullable=True)
+    id = Column(BinaryUUID, primary_key=True, default=new_id)
+    user_id = Column(BinaryUUID, ForeignKey("users.id"), nullable=False)
+    guide_id = Column(BinaryUUID, ForeignKey("users.id"), nullable=False)
+    matching_request_id = Column(BinaryUUID, ForeignKey("matching_requests.id"), nullable=True)
     last_message = Column(Text, nullable=True)
     last_message_at = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
@@ -23,3 +23,13 @@ class ChatRoom(Base):
     guide = relationship("User", foreign_keys=[guide_id], back_populates="chat_rooms_as_guide")
     matching_request = relationship("MatchingRequest", backref="chat_room", uselist=False)
     messages = relationship("ChatMessage", back_populates="chat_room", cascade="all, delete-orphan")
+    unread_counters = relationship("ChatUnreadCounter", cascade="all, delete-orphan")
+
+
+class ChatUnreadCounter(Base):
+    """채팅방별 사용자의 읽지 않은 메시지 수 (메시지 전송 시 증가, 읽음 처리 시 감소)"""
+    __tablename__ = "chat_unread_counters"
+    
+    chat_room_id = Column(BinaryUUID, ForeignKey("chat_rooms.id"), primary_key=True)
+    user_id = Column(BinaryUUID, ForeignKey("users.id"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
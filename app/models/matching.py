@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Text, Boolean, Enum, ForeignKey, Date, Time
+from sqlalchemy import Column, Text, Boolean, Enum, ForeignKey, Date, Time, BigInteger, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.core.database import Base
-import uuid
+from app.core.database import Base, Timestamp
+from app.core.ids import BinaryUUID, new_id
+from app.core.snowflake import next_message_seq
 import enum
 
 class MatchingType(str, enum.Enum):
@@ -19,30 +20,41 @@ class MatchingStatus(str, enum.Enum):
 
 class MatchingRequest(Base):
     __tablename__ = "matching_requests"
+    __table_args__ = (
+        # 사용자/가이드별 최신순 목록 페이지네이션용
+        Index("ix_matching_requests_user_created", "user_id", "created_at"),
+        Index("ix_matching_requests_guide_created", "guide_id", "created_at"),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
-    guide_id = Column(String(36), ForeignKey("guides.id"), nullable=False)
-    story_id = Column(String(36), ForeignKey("stories.id"), nullable=True)
+    id = Column(BinaryUUID, primary_key=True, default=new_id)
+    user_id = Column(BinaryUUID, ForeignKey("users.id"), nullable=False)
+    guide_id = Column(BinaryUUID, ForeignKey("guides.id"), nullable=False)
+    story_id = Column(BinaryUUID, ForeignKey("stories.id"), nullable=True)
     matching_type = Column(Enum(MatchingType), nullable=False)
     status = Column(Enum(MatchingStatus), default=MatchingStatus.pending)
     requested_date = Column(Date, nullable=False)
     requested_time = Column(Time, nullable=True)
     message = Column(Text, nullable=True)
-    created_at = Column(String(19), server_default=func.now())
-    updated_at = Column(String(19), server_default=func.now(), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now(6))
+    updated_at = Column(Timestamp, server_default=func.now(6), onupdate=func.now(6))
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # 채팅방별 seq 커서 페이지네이션용
+        Index("ix_chat_messages_room_seq_id", "chat_room_id", "seq", "id"),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    chat_room_id = Column(String(36), ForeignKey("chat_rooms.id"), nullable=True)
-    matching_request_id = Column(String(36), ForeignKey("matching_requests.id"), nullable=False)
-    sender_id = Column(String(36), ForeignKey("users.id"), nullable=False)
-    receiver_id = Column(String(36), ForeignKey("users.id"), nullable=False)
+    id = Column(BinaryUUID, primary_key=True, default=new_id)
+    # 시간순 단조 증가 순번 (같은 시각에 저장된 메시지도 순서가 정해지도록 created_at 대신 정렬 기준으로 사용)
+    seq = Column(BigInteger, nullable=False, default=next_message_seq)
+    chat_room_id = Column(BinaryUUID, ForeignKey("chat_rooms.id"), nullable=True)
+    matching_request_id = Column(BinaryUUID, ForeignKey("matching_requests.id"), nullable=False)
+    sender_id = Column(BinaryUUID, ForeignKey("users.id"), nullable=False)
+    receiver_id = Column(BinaryUUID, ForeignKey("users.id"), nullable=False)
     message = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False)
-    created_at = Column(String(19), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now(6))
     
     # Relationships
     chat_room = relationship("ChatRoom", back_populates="messages")
@@ -29,11 +29,32 @@ class GuideResponse(BaseModel):
     rating: float
     total_reviews: int
     is_approved: bool
-    created_at: str  # 데이터베이스에서 문자열로 저장됨
+    created_at: datetime
     # User 정보
     nickname: str
     profile_image: Optional[str] = None
 
+class GuideSearchItem(GuideResponse):
+    regions: List[str] = []  # 활성 스토리의 지역
+    story_count: int = 0
+    acceptance_rate: Optional[float] = None  # 수락 / (수락 + 거절)
+    median_response_minutes: Optional[float] = None  # 요청 후 수락/거절까지 걸린 시간 중앙값
+
+class GuideSearchResponse(BaseModel):
+    guides: List[GuideSearchItem]
+    total: int
+    limit: int
+    offset: int
+
+class NearbyGuideItem(GuideSearchItem):
+    distance_km: float  # 가장 가까운 활동 지역까지의 거리
+
+class NearbyGuideResponse(BaseModel):
+    guides: List[NearbyGuideItem]
+    total: int
+    limit: int
+    offset: int
+
 # Matching 관련 스키마
 class MatchingRequestCreate(BaseModel):
     guide_id: str
@@ -56,8 +77,8 @@ class MatchingRequestResponse(BaseModel):
     requested_date: date
     requested_time: Optional[time] = None
     message: Optional[str] = None
-    created_at: str  # 데이터베이스에서 문자열로 저장됨
-    updated_at: str  # 데이터베이스에서 문자열로 저장됨
+    created_at: datetime
+    updated_at: datetime
     # 추가 정보
     user_nickname: str
     user_profile_image: Optional[str] = None
@@ -78,13 +99,14 @@ class ChatMessageCreate(BaseModel):
 
 class ChatMessageResponse(BaseModel):
     id: str
+    seq: Optional[int] = None  # 메시지 순서 (정렬/커서 기준)
     chat_room_id: Optional[str] = None
     matching_request_id: str
     sender_id: str
     receiver_id: str
     message: str
     is_read: bool
-    created_at: str  # 데이터베이스에서 문자열로 저장됨
+    created_at: datetime
     # 추가 정보
     sender_nickname: str
     sender_profile_image: Optional[str] = None
@@ -92,6 +114,7 @@ class ChatMessageResponse(BaseModel):
 class ChatListResponse(BaseModel):
     messages: List[ChatMessageResponse]
     total: int
+    has_more: bool = False  # 조회 방향(before_id/after_id)으로 메시지가 더 있는지 여부
 
 # ChatRoom 관련 스키마
 class ChatRoomResponse(BaseModel):
@@ -112,4 +135,5 @@ class ChatRoomResponse(BaseModel):
 
 class ChatRoomListResponse(BaseModel):
     rooms: List[ChatRoomResponse]
-    total: int
+    total: int  # 이번 페이지의 채팅방 수
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 cursor로 전달 (없으면 마지막 페이지)
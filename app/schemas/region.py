@@ -29,3 +29,8 @@ class RegionMapData(BaseModel):
     longitude: float
     story_count: int
     popular_categories: List[str] = []
+
+class RegionSuggestion(BaseModel):
+    category: str
+    city: str
+    name: str
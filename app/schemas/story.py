@@ -56,6 +56,23 @@ class StoryListResponse(BaseModel):
     page: int
     limit: int
 
+class StorySearchResponse(BaseModel):
+    stories: List[StoryResponse]
+    # 검색 색인 기준 일치 수 (현재 페이지에서 걸러진 비활성/삭제 스토리만 뺌).
+    # 다른 페이지의 비활성/삭제 스토리는 다음 색인 동기화 전까지 포함될 수 있는 근사값
+    total: int
+    page: int
+    limit: int
+
+class NearbyStoryResponse(StoryResponse):
+    distance_km: float  # 스토리 지역 중심까지의 거리
+
+class NearbyStoryListResponse(BaseModel):
+    stories: List[NearbyStoryResponse]
+    total: int
+    page: int
+    limit: int
+
 # Comment 관련 스키마
 class CommentCreate(BaseModel):
     content: str
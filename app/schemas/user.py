@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -36,3 +36,11 @@ class TokenRefresh(BaseModel):
 
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
+
+class UserPresence(BaseModel):
+    user_id: str
+    online: bool
+    last_seen: Optional[int] = None  # 마지막 연결 종료 시각 (epoch 초)
+
+class PresenceListResponse(BaseModel):
+    users: List[UserPresence]
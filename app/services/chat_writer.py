@@ -0,0 +1,256 @@
+from typing import Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import logging
+import time
+import uuid
+
+from sqlalchemy import insert, update, bindparam, or_
+
+from app.core.config import settings
+from app.core.database import SessionLocal, read_your_writes
+from app.core.metrics import registry
+from app.models.matching import ChatMessage
+from app.models.chat import ChatRoom
+from app.services.matching_service import MatchingService
+
+logger = logging.getLogger(__name__)
+
+# client_msg_id -> 메시지 ID 변환용 네임스페이스 (재전송 시 같은 ID가 되도록 고정)
+CHAT_MESSAGE_NAMESPACE = uuid.UUID("6f1c3e2a-9b7d-4c55-8e0a-2d4f1b9c7a31")
+
+# 워커 간 메시지 ID 선점 키 (다른 워커로 재연결한 뒤 재전송해도 처음 발급한 seq 유지)
+CLAIM_KEY_PREFIX = "chat:msg:"
+CLAIM_TTL_SECONDS = 86400
+
+chat_writer_batch_size = registry.histogram(
+    "chat_writer_batch_size", "Chat messages persisted per group commit",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+chat_writer_flush_seconds = registry.histogram(
+    "chat_writer_flush_seconds", "Chat message group commit duration", ("result",)
+)
+
+
+def chat_message_id(sender_id: str, client_msg_id: str) -> str:
+    """발신자와 클라이언트 메시지 ID로 결정되는 메시지 ID (중복 전송 시 같은 ID)"""
+    return str(uuid.uuid5(CHAT_MESSAGE_NAMESPACE, f"{sender_id}:{client_msg_id}"))
+
+
+_message_table = ChatMessage.__table__
+_room_table = ChatRoom.__table__
+
+# 이미 저장된 ID는 무시 (MySQL: INSERT IGNORE, SQLite: INSERT OR IGNORE)
+_insert_messages = (
+    insert(_message_table)
+    .prefix_with("IGNORE", dialect="mysql")
+    .prefix_with("OR IGNORE", dialect="sqlite")
+)
+
+# 더 최근 메시지로 갱신된 채팅방은 덮어쓰지 않음
+_update_last_message = (
+    update(_room_table)
+    .where(_room_table.c.id == bindparam("room_id"))
+    .where(or_(
+        _room_table.c.last_message_at.is_(None),
+        _room_table.c.last_message_at <= bindparam("message_at")
+    ))
+    .values(last_message=bindparam("last_message"), last_message_at=bindparam("message_at"))
+)
+
+
+class ChatMessageWriter:
+    """채팅 메시지 그룹 커밋 저장기
+
+    WebSocket으로 받은 메시지를 큐에 모았다가 짧은 주기마다 한 트랜잭션으로
+    INSERT, 채팅방 last_message 갱신, 읽지 않은 메시지 카운터 증가를 묶어서 처리
+    """
+
+    def __init__(self, flush_interval: float, max_batch: int, dedupe_size: int = 10000):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        # 최근 처리한 메시지 ID -> 처음 발급한 (seq, 시각) (재전송 시 중복 브로드캐스트 방지)
+        self._recent: "OrderedDict[str, Tuple[int, datetime]]" = OrderedDict()
+        self._dedupe_size = dedupe_size
+        # 워커 간 선점 기록 (CHAT_PUBSUB_BACKEND=redis일 때만, 단일 프로세스는 _recent로 충분)
+        self._redis = None
+
+    def start(self):
+        if self._task is None:
+            if settings.CHAT_PUBSUB_BACKEND == "redis":
+                import redis.asyncio as redis
+                self._redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """남은 메시지를 모두 저장한 뒤 종료"""
+        if self._task is None:
+            return
+        # 취소하면 _run이 큐에서 꺼낸 배치를 잃으므로 종료 표시(None)를 넣고 끝날 때까지 대기
+        task, self._task = self._task, None
+        self.queue.put_nowait(None)
+        await task
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def claim(self, message_id: str, seq: int, created_at: datetime) -> Optional[Tuple[int, datetime]]:
+        """메시지 ID 선점. 처음 제출된 메시지면 None, 이미 제출된 메시지면 처음 발급된 (seq, 시각)"""
+        claimed = self._recent.get(message_id)
+        if claimed is not None:
+            self._recent.move_to_end(message_id)
+            return claimed
+
+        if self._redis is not None:
+            key = CLAIM_KEY_PREFIX + message_id
+            try:
+                if not await self._redis.set(key, f"{seq}|{created_at.isoformat()}", nx=True, ex=CLAIM_TTL_SECONDS):
+                    stored = await self._redis.get(key)
+                    if stored:
+                        stored_seq, stored_at = stored.split("|", 1)
+                        claimed = (int(stored_seq), datetime.fromisoformat(stored_at))
+            except Exception as e:
+                # 선점 기록을 확인할 수 없으면 로컬 기록만 사용 (저장은 INSERT IGNORE로 한 번만 됨)
+                logger.warning(f"[ChatWriter] Failed to claim message {message_id}: {e}")
+
+        self._remember(message_id, claimed or (seq, created_at))
+        return claimed
+
+    def _remember(self, message_id: str, value: Tuple[int, datetime]):
+        self._recent[message_id] = value
+        if len(self._recent) > self._dedupe_size:
+            self._recent.popitem(last=False)
+
+    async def _release(self, message_ids: List[str]):
+        """저장되지 않은 메시지의 선점 기록 제거 (재전송 시 다시 처리되도록)"""
+        for message_id in message_ids:
+            self._recent.pop(message_id, None)
+        if self._redis is not None and message_ids:
+            try:
+                await self._redis.delete(*(CLAIM_KEY_PREFIX + message_id for message_id in message_ids))
+            except Exception as e:
+                logger.warning(f"[ChatWriter] Failed to release {len(message_ids)} message claims: {e}")
+
+    def submit(self, row: Dict) -> asyncio.Future:
+        """저장할 메시지 추가. 반환된 future는 커밋 후 완료됨 (비활성 채팅방이라 저장하지 않으면 결과 False)"""
+        if self._task is None:
+            raise RuntimeError("Chat message writer is not running")
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((row, future))
+        return future
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+        # 종료 표시 이후에 남은 메시지 저장
+        batch = []
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is not None:
+                batch.append(item)
+        if batch:
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        start = time.perf_counter()
+        try:
+            rejected = await asyncio.to_thread(self._write, [row for row, _ in batch])
+        except Exception as e:
+            chat_writer_flush_seconds.observe(time.perf_counter() - start, result="error")
+            logger.error(f"[ChatWriter] Failed to persist {len(batch)} messages: {e}")
+            # 실패한 메시지는 재전송 시 다시 처리될 수 있도록 중복 기록에서 제거
+            await self._release([row["id"] for row, _ in batch])
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        chat_writer_flush_seconds.observe(time.perf_counter() - start, result="success")
+        chat_writer_batch_size.observe(len(batch))
+        if rejected:
+            await self._release(list(rejected))
+        for row, future in batch:
+            if not future.done():
+                future.set_result(row["id"] not in rejected)
+
+    @staticmethod
+    def _write(rows: List[Dict]) -> Set[str]:
+        """메시지 저장. 반환: 비활성 채팅방이라 저장하지 않은 메시지 ID"""
+        db = SessionLocal()
+        try:
+            # 입장 후 채팅방이 비활성화되었을 수 있으므로 저장 시점에 다시 확인
+            active_rooms = {
+                room_id for (room_id,) in
+                db.query(ChatRoom.id).filter(
+                    ChatRoom.id.in_({row["chat_room_id"] for row in rows}),
+                    ChatRoom.is_active == True
+                ).all()
+            }
+            # 재전송으로 이미 저장된 메시지는 제외 (동시 저장 경합은 INSERT IGNORE가 처리)
+            existing = {
+                message_id for (message_id,) in
+                db.query(ChatMessage.id).filter(ChatMessage.id.in_([row["id"] for row in rows])).all()
+            }
+            rejected = {
+                row["id"] for row in rows
+                if row["chat_room_id"] not in active_rooms and row["id"] not in existing
+            }
+            rows = [row for row in rows if row["id"] not in existing and row["id"] not in rejected]
+            if not rows:
+                return rejected
+
+            # 채팅방별 가장 최근 메시지만 last_message로 반영하고 수신자별 읽지 않은 수 집계
+            latest: Dict[str, Dict] = {}
+            unread: Dict[Tuple[str, str], int] = {}
+            for row in rows:
+                latest[row["chat_room_id"]] = row
+                key = (row["chat_room_id"], row["receiver_id"])
+                unread[key] = unread.get(key, 0) + 1
+
+            db.execute(_insert_messages, rows)
+            db.execute(_update_last_message, [
+                {
+                    "room_id": room_id,
+                    "last_message": row["message"],
+                    "message_at": row["created_at"]
+                }
+                for room_id, row in latest.items()
+            ])
+            MatchingService.increment_unread(db, unread)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        for sender_id in {row["sender_id"] for row in rows}:
+            read_your_writes.mark(sender_id)
+        return rejected
+
+chat_writer = ChatMessageWriter(
+    flush_interval=settings.CHAT_WRITER_FLUSH_INTERVAL_MS / 1000,
+    max_batch=settings.CHAT_WRITER_MAX_BATCH
+)
@@ -0,0 +1,192 @@
+from typing import Dict, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.models.guide import Guide
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# 가이드 정보 변경 알림 (다른 워커의 캐시 무효화)
+GUIDE_INVALIDATION_CHANNEL = "guide:invalidate"
+
+guide_directory_lookups_total = registry.counter(
+    "guide_directory_lookups_total", "Guide directory cache lookups", ("result",)
+)
+
+
+@dataclass(frozen=True)
+class GuideProfile:
+    """캐시되는 가이드 정보 (가이드 + 사용자 프로필)"""
+    id: str
+    user_id: str
+    bio: Optional[str]
+    rating: float
+    total_reviews: int
+    is_approved: bool
+    created_at: Optional[datetime]
+    nickname: str
+    profile_image: Optional[str]
+
+
+class GuideDirectory:
+    """user_id/guide_id -> 가이드 정보 프로세스 내 캐시
+
+    가이드가 아닌 사용자도 None으로 캐시해 권한 확인 시 DB 조회를 생략하며,
+    TTL 만료 또는 Guide/User 변경 커밋 시 무효화됨 (승인 대기 중인 가이드는 캐시하지 않음)
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # user_id -> (만료 시각, 가이드 정보 또는 None)
+        self._by_user: "OrderedDict[str, Tuple[float, Optional[GuideProfile]]]" = OrderedDict()
+        # guide_id -> user_id
+        self._user_by_guide: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.pubsub = None
+
+    async def start(self, pubsub):
+        """다른 워커의 무효화 알림 구독 (앱 startup 시 호출)"""
+        self._loop = asyncio.get_running_loop()
+        self.pubsub = pubsub
+        await pubsub.listen(GUIDE_INVALIDATION_CHANNEL, self._on_invalidation)
+
+    def stop(self):
+        self.pubsub = None
+        self._loop = None
+
+    def get_by_user_id(self, db: Session, user_id: str) -> Optional[GuideProfile]:
+        """사용자의 가이드 정보 (가이드가 아니면 None)"""
+        with self._lock:
+            entry = self._by_user.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._by_user.move_to_end(user_id)
+                guide_directory_lookups_total.inc(result="hit")
+                return entry[1]
+        guide_directory_lookups_total.inc(result="miss")
+        return self._load(db, Guide.user_id == user_id, user_id=user_id)
+
+    def get_by_id(self, db: Session, guide_id: str) -> Optional[GuideProfile]:
+        with self._lock:
+            user_id = self._user_by_guide.get(guide_id)
+        if user_id is not None:
+            profile = self.get_by_user_id(db, user_id)
+            if profile is not None and profile.id == guide_id:
+                return profile
+        guide_directory_lookups_total.inc(result="miss")
+        return self._load(db, Guide.id == guide_id)
+
+    def _load(self, db: Session, condition, user_id: Optional[str] = None) -> Optional[GuideProfile]:
+        row = db.query(Guide, User.nickname, User.profile_image).outerjoin(
+            User, User.id == Guide.user_id
+        ).filter(condition).first()
+
+        profile = None
+        if row is not None:
+            guide, nickname, profile_image = row
+            profile = GuideProfile(
+                id=guide.id,
+                user_id=guide.user_id,
+                bio=guide.bio,
+                rating=float(guide.rating) if guide.rating else 0.0,
+                total_reviews=guide.total_reviews or 0,
+                is_approved=bool(guide.is_approved),
+                created_at=guide.created_at,
+                nickname=nickname or "Unknown",
+                profile_image=profile_image
+            )
+            user_id = guide.user_id
+        # 승인은 앱 밖에서(DB 직접 수정 등) 일어날 수 있어 무효화를 보장할 수 없으므로 미승인 가이드는 캐시하지 않음
+        if user_id is not None and (profile is None or profile.is_approved):
+            self._store(user_id, profile)
+        return profile
+
+    def _store(self, user_id: str, profile: Optional[GuideProfile]):
+        with self._lock:
+            self._by_user[user_id] = (time.monotonic() + self.ttl, profile)
+            self._by_user.move_to_end(user_id)
+            if profile is not None:
+                self._user_by_guide[profile.id] = user_id
+            while len(self._by_user) > self.max_entries:
+                _, (_, evicted) = self._by_user.popitem(last=False)
+                if evicted is not None:
+                    self._user_by_guide.pop(evicted.id, None)
+
+    def invalidate(self, user_ids: Set[str], publish: bool = True):
+        """로컬 캐시에서 제거하고 다른 워커에도 알림"""
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._by_user.pop(user_id, None)
+                if entry is not None and entry[1] is not None:
+                    self._user_by_guide.pop(entry[1].id, None)
+
+        if publish and self.pubsub is not None and self._loop is not None:
+            message = {"user_ids": list(user_ids)}
+            # 커밋은 이벤트 루프 또는 워커 스레드에서 일어날 수 있음
+            self._loop.call_soon_threadsafe(
+                lambda: asyncio.ensure_future(self._publish(message))
+            )
+
+    async def _publish(self, message: dict):
+        if self.pubsub is None:
+            return
+        try:
+            await self.pubsub.publish(GUIDE_INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            logger.error(f"[GuideDirectory] Failed to publish invalidation: {e}")
+
+    async def _on_invalidation(self, channel: str, message: dict):
+        self.invalidate(set(message.get("user_ids", [])), publish=False)
+
+
+guide_directory = GuideDirectory(
+    ttl=settings.GUIDE_CACHE_TTL,
+    max_entries=settings.GUIDE_CACHE_MAX_ENTRIES
+)
+
+_PENDING_KEY = "guide_directory_invalidate"
+
+
+def _profile_changed(user: User) -> bool:
+    attrs = inspect(user).attrs
+    return attrs.nickname.history.has_changes() or attrs.profile_image.history.has_changes()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_guide_changes(session, flush_context):
+    """Guide 생성/수정/삭제와 가이드의 닉네임/프로필 변경을 커밋 시 무효화하도록 기록"""
+    user_ids = None
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Guide) and obj.user_id:
+            user_id = obj.user_id
+        elif isinstance(obj, User) and obj.id and (obj in session.deleted or _profile_changed(obj)):
+            user_id = obj.id
+        else:
+            continue
+        if user_ids is None:
+            user_ids = session.info.setdefault(_PENDING_KEY, set())
+        user_ids.add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_guides(session):
+    user_ids = session.info.pop(_PENDING_KEY, None)
+    if user_ids:
+        guide_directory.invalidate(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_guide_changes(session):
+    session.info.pop(_PENDING_KEY, None)
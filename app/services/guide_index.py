@@ -0,0 +1,364 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+import asyncio
+import heapq
+import logging
+import math
+import statistics
+import threading
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import registry
+from app.models.guide import Guide
+from app.models.matching import MatchingRequest, MatchingStatus
+from app.models.story import Story
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+guide_index_refresh_seconds = registry.histogram(
+    "guide_index_refresh_seconds", "Guide discovery index refresh duration", ("kind",)
+)
+registry.gauge(
+    "guide_index_entries", "Guides held in the discovery index of this worker",
+    callback=lambda: len(guide_index._entries)
+)
+
+# 수락으로 집계하는 상태 (수락 후 완료 포함)
+_ACCEPTED = (MatchingStatus.accepted, MatchingStatus.completed)
+# 응답 시간 집계 대상 (pending에서 바로 바뀐 상태만 updated_at이 응답 시각)
+_RESPONDED = (MatchingStatus.accepted, MatchingStatus.rejected)
+
+# 증분 갱신 워터마크 대상 (가이드 지표에 영향을 주는 테이블)
+_WATERMARK_COLUMNS = {
+    "guides": Guide.updated_at,
+    "stories": Story.updated_at,
+    "matching_requests": MatchingRequest.updated_at,
+    "users": User.updated_at,
+}
+
+# 평점 보정용 사전값 (리뷰 수가 적은 가이드가 상위를 독점하지 않도록)
+_PRIOR_RATING = 3.5
+_PRIOR_REVIEWS = 5
+
+
+@dataclass(frozen=True)
+class GuideIndexEntry:
+    id: str
+    user_id: str
+    bio: Optional[str]
+    rating: float
+    total_reviews: int
+    is_approved: bool
+    created_at: Optional[datetime]
+    nickname: str
+    profile_image: Optional[str]
+    regions: Tuple[str, ...]  # 활성 스토리의 region_id1/region_id2
+    region_pairs: Tuple[Tuple[str, str], ...]  # 활성 스토리의 (region_id1, region_id2)
+    story_count: int
+    acceptance_rate: Optional[float]  # 수락 / (수락 + 거절), 응답 이력이 없으면 None
+    median_response_seconds: Optional[float]  # 요청 후 수락/거절까지 걸린 시간의 중앙값
+    score: float  # 추천순 점수
+
+
+def _score(rating: float, total_reviews: int, acceptance_rate: Optional[float], median_response: Optional[float]) -> float:
+    """추천순 점수: 보정 평점 60% + 수락률 25% + 응답 속도 15%"""
+    adjusted = (rating * total_reviews + _PRIOR_RATING * _PRIOR_REVIEWS) / (total_reviews + _PRIOR_REVIEWS)
+    acceptance = acceptance_rate if acceptance_rate is not None else 0.5
+    # 1시간 안에 응답하면 0.5 이상
+    responsiveness = 1 / (1 + median_response / 3600) if median_response is not None else 0.25
+    return adjusted / 5 * 0.6 + acceptance * 0.25 + responsiveness * 0.15
+
+
+def _seconds_between(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    seconds = (end - start).total_seconds()
+    return seconds if seconds >= 0 else None
+
+
+def _discard(index: Dict, keys: Iterable, guide_id: str):
+    for key in keys:
+        members = index.get(key)
+        if members is not None:
+            members.discard(guide_id)
+            if not members:
+                del index[key]
+
+
+SORT_KEYS = {
+    "recommended": lambda e: (-e.score, e.id),
+    "rating": lambda e: (-e.rating, -e.total_reviews, e.id),
+    "acceptance": lambda e: (-(e.acceptance_rate or 0.0), e.id),
+    "response": lambda e: (e.median_response_seconds is None, e.median_response_seconds or 0.0, e.id),
+}
+
+
+class GuideIndex:
+    """가이드 검색용 프로세스 내 인덱스
+
+    가이드별 활동 지역, 평점, 수락률, 응답 시간 중앙값을 미리 계산해 두고
+    지역 역색인으로 후보를 좁힌 뒤 top-k만 정렬함.
+    updated_at 워터마크 이후 변경된 가이드만 주기적으로 다시 계산하고,
+    하드 삭제 등 워터마크로 잡히지 않는 변경은 주기적인 전체 재구성으로 반영
+    """
+
+    def __init__(self, refresh_interval: float, full_rebuild_interval: float):
+        self.refresh_interval = refresh_interval
+        self.full_rebuild_interval = full_rebuild_interval
+        self._entries: Dict[str, GuideIndexEntry] = {}
+        # 지역 -> guide_id
+        self._by_region: Dict[str, Set[str]] = {}
+        # (region_id1, region_id2) -> guide_id (주변 가이드 검색용)
+        self._by_region_pair: Dict[Tuple[str, str], Set[str]] = {}
+        # 테이블별 마지막으로 반영한 updated_at
+        self._watermarks: Dict[str, object] = {}
+        self._built_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _refresh_periodically(self):
+        while True:
+            try:
+                await asyncio.to_thread(self._refresh_with_own_session)
+            except Exception as e:
+                logger.error(f"[GuideIndex] Refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def ensure_built(self):
+        """첫 구성 전이면 스레드에서 구성될 때까지 대기 (전체 스캔이 이벤트 루프를 막지 않도록)"""
+        if self._built_at is None:
+            await asyncio.to_thread(self._refresh_with_own_session)
+
+    def _refresh_with_own_session(self):
+        db = SessionLocal()
+        try:
+            self.refresh(db)
+        finally:
+            db.close()
+
+    def refresh(self, db: Session):
+        """전체 재구성 주기가 지났으면 재구성, 아니면 변경된 가이드만 다시 계산"""
+        with self._refresh_lock:
+            if self._built_at is None or time.monotonic() - self._built_at > self.full_rebuild_interval:
+                self._rebuild(db)
+            else:
+                self._refresh_changed(db)
+
+    def _rebuild(self, db: Session):
+        start = time.perf_counter()
+        watermarks = self._current_watermarks(db)
+        entries = self._compute(db, None)
+        by_region: Dict[str, Set[str]] = {}
+        by_region_pair: Dict[Tuple[str, str], Set[str]] = {}
+        for entry in entries.values():
+            for region in entry.regions:
+                by_region.setdefault(region, set()).add(entry.id)
+            for pair in entry.region_pairs:
+                by_region_pair.setdefault(pair, set()).add(entry.id)
+
+        with self._lock:
+            self._entries = entries
+            self._by_region = by_region
+            self._by_region_pair = by_region_pair
+            self._watermarks = watermarks
+            self._built_at = time.monotonic()
+        guide_index_refresh_seconds.observe(time.perf_counter() - start, kind="full")
+        logger.info(f"[GuideIndex] Rebuilt with {len(entries)} guides in {time.perf_counter() - start:.2f}s")
+
+    def _current_watermarks(self, db: Session) -> Dict[str, object]:
+        return {
+            name: db.query(func.max(column)).scalar()
+            for name, column in _WATERMARK_COLUMNS.items()
+        }
+
+    def _refresh_changed(self, db: Session):
+        start = time.perf_counter()
+        watermarks = dict(self._watermarks)
+        changed: Set[str] = set()
+
+        # 같은 초에 변경된 행을 놓치지 않도록 워터마크와 같은 값도 다시 확인
+        for name, query in (
+            ("guides", db.query(Guide.id, Guide.updated_at)),
+            ("stories", db.query(Story.guide_id, Story.updated_at)),
+            ("matching_requests", db.query(MatchingRequest.guide_id, MatchingRequest.updated_at)),
+            ("users", db.query(Guide.id, User.updated_at).join(User, User.id == Guide.user_id)),
+        ):
+            column = _WATERMARK_COLUMNS[name]
+            if watermarks.get(name) is not None:
+                query = query.filter(column >= watermarks[name])
+            for guide_id, updated_at in query.all():
+                if guide_id:
+                    changed.add(guide_id)
+                if updated_at is not None and (watermarks.get(name) is None or updated_at > watermarks[name]):
+                    watermarks[name] = updated_at
+
+        if not changed:
+            return
+        entries = self._compute(db, changed)
+
+        with self._lock:
+            for guide_id in changed:
+                old = self._entries.pop(guide_id, None)
+                if old is not None:
+                    _discard(self._by_region, old.regions, guide_id)
+                    _discard(self._by_region_pair, old.region_pairs, guide_id)
+                new = entries.get(guide_id)
+                if new is not None:
+                    self._entries[guide_id] = new
+                    for region in new.regions:
+                        self._by_region.setdefault(region, set()).add(guide_id)
+                    for pair in new.region_pairs:
+                        self._by_region_pair.setdefault(pair, set()).add(guide_id)
+            self._watermarks = watermarks
+        guide_index_refresh_seconds.observe(time.perf_counter() - start, kind="incremental")
+
+    @staticmethod
+    def _compute(db: Session, guide_ids: Optional[Iterable[str]]) -> Dict[str, GuideIndexEntry]:
+        """가이드별 지표 계산 (guide_ids가 None이면 전체)"""
+        ids = list(guide_ids) if guide_ids is not None else None
+
+        def scoped(query, column):
+            return query.filter(column.in_(ids)) if ids is not None else query
+
+        guides = scoped(
+            db.query(Guide, User.nickname, User.profile_image).outerjoin(User, User.id == Guide.user_id),
+            Guide.id
+        ).all()
+
+        regions: Dict[str, Set[str]] = {}
+        region_pairs: Dict[str, Set[Tuple[str, str]]] = {}
+        story_counts: Dict[str, int] = {}
+        story_rows = scoped(
+            db.query(Story.guide_id, Story.region_id1, Story.region_id2, func.count(Story.id))
+            .filter(Story.is_active == True, Story.guide_id.isnot(None))
+            .group_by(Story.guide_id, Story.region_id1, Story.region_id2),
+            Story.guide_id
+        ).all()
+        for guide_id, region1, region2, count in story_rows:
+            story_counts[guide_id] = story_counts.get(guide_id, 0) + count
+            guide_regions = regions.setdefault(guide_id, set())
+            for region in (region1, region2):
+                if region:
+                    guide_regions.add(region)
+            if region1 and region2:
+                region_pairs.setdefault(guide_id, set()).add((region1, region2))
+
+        accepted: Dict[str, int] = {}
+        rejected: Dict[str, int] = {}
+        response_times: Dict[str, List[float]] = {}
+        request_rows = scoped(
+            db.query(MatchingRequest.guide_id, MatchingRequest.status, MatchingRequest.created_at, MatchingRequest.updated_at)
+            .filter(MatchingRequest.status.in_(_ACCEPTED + (MatchingStatus.rejected,))),
+            MatchingRequest.guide_id
+        ).all()
+        for guide_id, status, created_at, updated_at in request_rows:
+            if status in _ACCEPTED:
+                accepted[guide_id] = accepted.get(guide_id, 0) + 1
+            else:
+                rejected[guide_id] = rejected.get(guide_id, 0) + 1
+            if status in _RESPONDED:
+                seconds = _seconds_between(created_at, updated_at)
+                if seconds is not None:
+                    response_times.setdefault(guide_id, []).append(seconds)
+
+        entries = {}
+        for guide, nickname, profile_image in guides:
+            responded = accepted.get(guide.id, 0) + rejected.get(guide.id, 0)
+            acceptance_rate = accepted.get(guide.id, 0) / responded if responded else None
+            times = response_times.get(guide.id)
+            median_response = statistics.median(times) if times else None
+            rating = float(guide.rating) if guide.rating else 0.0
+            total_reviews = guide.total_reviews or 0
+            entries[guide.id] = GuideIndexEntry(
+                id=guide.id,
+                user_id=guide.user_id,
+                bio=guide.bio,
+                rating=rating,
+                total_reviews=total_reviews,
+                is_approved=bool(guide.is_approved),
+                created_at=guide.created_at,
+                nickname=nickname or "Unknown",
+                profile_image=profile_image,
+                regions=tuple(sorted(regions.get(guide.id, ()))),
+                region_pairs=tuple(sorted(region_pairs.get(guide.id, ()))),
+                story_count=story_counts.get(guide.id, 0),
+                acceptance_rate=acceptance_rate,
+                median_response_seconds=median_response,
+                score=_score(rating, total_reviews, acceptance_rate, median_response)
+            )
+        return entries
+
+    def search(
+        self,
+        region: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        sort: str = "recommended",
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[GuideIndexEntry], int]:
+        """승인된 가이드 중 조건에 맞는 상위 limit개와 전체 개수 (ensure_built 이후 호출)"""
+        with self._lock:
+            if region:
+                candidates = [self._entries[guide_id] for guide_id in self._by_region.get(region, ())]
+            else:
+                candidates = list(self._entries.values())
+
+        matched = [
+            entry for entry in candidates
+            if entry.is_approved and (min_rating is None or entry.rating >= min_rating)
+        ]
+        top = heapq.nsmallest(offset + limit, matched, key=SORT_KEYS[sort])
+        return top[offset:], len(matched)
+
+    def nearby(
+        self,
+        region_distances: Dict[Tuple[str, str], float],
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[Tuple[GuideIndexEntry, float]], int]:
+        """활동 지역까지의 거리(km)로 승인된 가이드를 찾아 거리와 추천 점수로 정렬
+
+        region_distances: (region_id1, region_id2) -> 거리. 가이드의 거리는 가장 가까운 활동 지역 기준
+        """
+
+        distances: Dict[str, float] = {}
+        with self._lock:
+            for pair, distance in region_distances.items():
+                for guide_id in self._by_region_pair.get(pair, ()):
+                    if distance < distances.get(guide_id, math.inf):
+                        distances[guide_id] = distance
+            matched = [
+                (self._entries[guide_id], distance)
+                for guide_id, distance in distances.items()
+                if self._entries[guide_id].is_approved
+            ]
+
+        # 거리 반영: 10km 떨어진 가이드는 점수의 절반
+        top = heapq.nsmallest(
+            offset + limit, matched,
+            key=lambda item: (-item[0].score / (1 + item[1] / 10), item[0].id)
+        )
+        return top[offset:], len(matched)
+
+
+guide_index = GuideIndex(
+    refresh_interval=settings.GUIDE_INDEX_REFRESH_INTERVAL,
+    full_rebuild_interval=settings.GUIDE_INDEX_FULL_REBUILD_INTERVAL
+)
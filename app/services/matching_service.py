@@ -1,14 +1,18 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, case, func, update, insert, tuple_
 from fastapi import HTTPException, status
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
+import base64
 import uuid
 
 from app.models.matching import MatchingRequest, MatchingStatus, ChatMessage
-from app.models.chat import ChatRoom
+from app.models.chat import ChatRoom, ChatUnreadCounter
 from app.models.user import User
 from app.models.guide import Guide
+from app.models.story import Story
 from app.schemas.matching import MatchingRequestCreate, MatchingRequestUpdate
+from app.services.guide_directory import guide_directory
 
 
 class MatchingService:
@@ -20,7 +24,7 @@ class MatchingService:
     ) -> MatchingRequest:
         """매칭 요청 생성"""
         # 가이드 존재 확인
-        guide = db.query(Guide).filter(Guide.id == request_data.guide_id).first()
+        guide = guide_directory.get_by_id(db, request_data.guide_id)
         if not guide:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -62,29 +66,97 @@ class MatchingService:
     def get_user_matching_requests(
         db: Session,
         user_id: str,
-        status: Optional[MatchingStatus] = None
-    ) -> List[MatchingRequest]:
-        """사용자의 매칭 요청 목록 조회"""
-        query = db.query(MatchingRequest).filter(MatchingRequest.user_id == user_id)
-        
-        if status:
-            query = query.filter(MatchingRequest.status == status)
-        
-        return query.order_by(MatchingRequest.created_at.desc()).all()
+        status: Optional[MatchingStatus] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[Tuple], int]:
+        """사용자가 보낸 매칭 요청 목록 조회 (페이지 단위)"""
+        return MatchingService._get_matching_request_page(
+            db, MatchingRequest.user_id == user_id, status, limit, offset
+        )
     
     @staticmethod
     def get_guide_matching_requests(
         db: Session,
         guide_id: str,
-        status: Optional[MatchingStatus] = None
-    ) -> List[MatchingRequest]:
-        """가이드의 매칭 요청 목록 조회"""
-        query = db.query(MatchingRequest).filter(MatchingRequest.guide_id == guide_id)
-        
+        status: Optional[MatchingStatus] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[Tuple], int]:
+        """가이드가 받은 매칭 요청 목록 조회 (페이지 단위)"""
+        return MatchingService._get_matching_request_page(
+            db, MatchingRequest.guide_id == guide_id, status, limit, offset
+        )
+    
+    @staticmethod
+    def _get_matching_request_page(
+        db: Session,
+        condition,
+        status: Optional[MatchingStatus],
+        limit: int,
+        offset: int
+    ) -> Tuple[List[Tuple], int]:
+        """전체 개수와 한 페이지의 매칭 요청을 프로필/스토리/채팅방과 함께 조회 (요청 수와 무관하게 쿼리 3회)
+
+        반환: ([(MatchingRequest, 요청자 닉네임, 요청자 프로필, 가이드 닉네임, 가이드 프로필, 스토리 제목, 채팅방 ID)], 전체 개수)
+        """
+        filters = [condition]
         if status:
-            query = query.filter(MatchingRequest.status == status)
-        
-        return query.order_by(MatchingRequest.created_at.desc()).all()
+            filters.append(MatchingRequest.status == status)
+        
+        total = db.query(func.count(MatchingRequest.id)).filter(*filters).scalar()
+        if offset >= total:
+            return [], total
+        
+        requester = aliased(User)
+        guide_user = aliased(User)
+        rows = db.query(
+            MatchingRequest,
+            requester.nickname,
+            requester.profile_image,
+            guide_user.nickname,
+            guide_user.profile_image,
+            Story.title,
+            Guide.user_id
+        ).outerjoin(
+            requester, requester.id == MatchingRequest.user_id
+        ).outerjoin(
+            Guide, Guide.id == MatchingRequest.guide_id
+        ).outerjoin(
+            guide_user, guide_user.id == Guide.user_id
+        ).outerjoin(
+            Story, Story.id == MatchingRequest.story_id
+        ).filter(
+            *filters
+        ).order_by(
+            MatchingRequest.created_at.desc(), MatchingRequest.id.desc()
+        ).limit(limit).offset(offset).all()
+        
+        # 수락된 요청의 채팅방 ID (matching_request_id로 찾고, 없으면 여행자/가이드 쌍으로 찾음)
+        accepted = [(row[0], row[6]) for row in rows if row[0].status == MatchingStatus.accepted]
+        by_request: Dict[str, str] = {}
+        by_pair: Dict[Tuple[str, str], str] = {}
+        if accepted:
+            conditions = [ChatRoom.matching_request_id.in_([req.id for req, _ in accepted])]
+            pairs = list({(req.user_id, guide_user_id) for req, guide_user_id in accepted if guide_user_id})
+            if pairs:
+                conditions.append(tuple_(ChatRoom.user_id, ChatRoom.guide_id).in_(pairs))
+            for room_id, request_id, room_user_id, room_guide_id in db.query(
+                ChatRoom.id, ChatRoom.matching_request_id, ChatRoom.user_id, ChatRoom.guide_id
+            ).filter(or_(*conditions)).all():
+                if request_id:
+                    by_request.setdefault(request_id, room_id)
+                by_pair.setdefault((room_user_id, room_guide_id), room_id)
+        
+        page = []
+        for req, user_nickname, user_profile_image, guide_nickname, guide_profile_image, story_title, guide_user_id in rows:
+            chat_room_id = None
+            if req.status == MatchingStatus.accepted:
+                chat_room_id = by_request.get(req.id) or by_pair.get((req.user_id, guide_user_id))
+            page.append((
+                req, user_nickname, user_profile_image, guide_nickname, guide_profile_image, story_title, chat_room_id
+            ))
+        return page, total
     
     @staticmethod
     def update_matching_status(
@@ -117,7 +189,7 @@ class MatchingService:
         # 수락된 경우 채팅방 생성
         if new_status == MatchingStatus.accepted:
             # Guide 테이블에서 가이드의 user_id를 가져옴
-            guide = db.query(Guide).filter(Guide.id == guide_id).first()
+            guide = guide_directory.get_by_id(db, guide_id)
             if guide:
                 chat_room = MatchingService.create_or_get_chat_room(
                     db,
@@ -223,8 +295,8 @@ class MatchingService:
         logger.info(f"Found matching request: user_id={matching_request.user_id}, guide_id={matching_request.guide_id}")
         
         # 권한 확인 - 요청자이거나 가이드인 경우만 삭제 가능
-        guide = db.query(Guide).filter(Guide.id == matching_request.guide_id).first()
-        if matching_request.user_id != user_id and guide.user_id != user_id:
+        guide = guide_directory.get_by_id(db, matching_request.guide_id)
+        if matching_request.user_id != user_id and (guide is None or guide.user_id != user_id):
             logger.error(f"Permission denied: user_id={user_id} is not the requester or guide")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -271,6 +343,148 @@ class MatchingService:
             ChatRoom.is_active == True
         ).order_by(ChatRoom.last_message_at.desc().nullslast()).all()
     
+    @staticmethod
+    def encode_room_cursor(sort_at: datetime, room_id: str) -> str:
+        """채팅방 목록 keyset 커서 (정렬 시각 + 채팅방 ID)"""
+        raw = f"{sort_at.isoformat()}|{room_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_room_cursor(cursor: str) -> Tuple[datetime, str]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            sort_at, room_id = raw.split("|", 1)
+            return datetime.fromisoformat(sort_at), room_id
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    @staticmethod
+    def get_chat_room_rows(
+        db: Session,
+        user_id: str,
+        room_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, str]] = None
+    ) -> List[Tuple]:
+        """채팅방, 참여자 프로필, 읽지 않은 메시지 수를 한 번의 조인 쿼리로 조회
+
+        목록은 최근 메시지 시각(없으면 생성 시각), ID 역순이며 cursor 이후의 채팅방부터 반환
+        반환: (ChatRoom, 여행자 닉네임, 여행자 프로필, 가이드 닉네임, 가이드 프로필, unread_count, 정렬 시각)
+        """
+        traveler = aliased(User)
+        guide_user = aliased(User)
+        sort_at = func.coalesce(ChatRoom.last_message_at, ChatRoom.created_at)
+        query = db.query(
+            ChatRoom,
+            traveler.nickname,
+            traveler.profile_image,
+            guide_user.nickname,
+            guide_user.profile_image,
+            func.coalesce(ChatUnreadCounter.count, 0),
+            sort_at
+        ).outerjoin(
+            traveler, traveler.id == ChatRoom.user_id
+        ).outerjoin(
+            guide_user, guide_user.id == ChatRoom.guide_id
+        ).outerjoin(
+            ChatUnreadCounter,
+            and_(ChatUnreadCounter.chat_room_id == ChatRoom.id, ChatUnreadCounter.user_id == user_id)
+        ).filter(
+            (ChatRoom.user_id == user_id) | (ChatRoom.guide_id == user_id),
+            ChatRoom.is_active == True
+        )
+        
+        if room_id:
+            return query.filter(ChatRoom.id == room_id).all()
+        
+        if cursor:
+            cursor_at, cursor_id = cursor
+            query = query.filter(or_(
+                sort_at < cursor_at,
+                and_(sort_at == cursor_at, ChatRoom.id < cursor_id)
+            ))
+        
+        query = query.order_by(sort_at.desc(), ChatRoom.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    
+    @staticmethod
+    def increment_unread(db: Session, increments: Dict[Tuple[str, str], int]):
+        """(채팅방 ID, 수신자 ID)별 읽지 않은 메시지 수 증가 (커밋은 호출 측에서)"""
+        if not increments:
+            return
+        
+        table = ChatUnreadCounter.__table__
+        rows = [
+            {"chat_room_id": room_id, "user_id": user_id, "count": amount}
+            for (room_id, user_id), amount in increments.items()
+        ]
+        dialect = db.get_bind().dialect.name
+        
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+            stmt = mysql_insert(table)
+            stmt = stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted["count"])
+        elif dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as upsert_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as upsert_insert
+            stmt = upsert_insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.chat_room_id, table.c.user_id],
+                set_={"count": table.c.count + stmt.excluded["count"]}
+            )
+        else:
+            # 업서트 미지원 DB: 갱신 후 없는 행만 추가
+            for row in rows:
+                result = db.execute(
+                    update(table).where(
+                        table.c.chat_room_id == row["chat_room_id"],
+                        table.c.user_id == row["user_id"]
+                    ).values(count=table.c.count + row["count"])
+                )
+                if result.rowcount == 0:
+                    db.execute(insert(table).values(**row))
+            return
+        
+        db.execute(stmt, rows)
+    
+    @staticmethod
+    def decrement_unread(db: Session, room_id: str, user_id: str, amount: int):
+        """읽음 처리된 메시지 수만큼 감소 (0 미만으로 내려가지 않음, 커밋은 호출 측에서)"""
+        if amount <= 0:
+            return
+        
+        table = ChatUnreadCounter.__table__
+        db.execute(
+            update(table).where(
+                table.c.chat_room_id == room_id,
+                table.c.user_id == user_id
+            ).values(count=case((table.c.count > amount, table.c.count - amount), else_=0))
+        )
+    
+    @staticmethod
+    def mark_messages_read(db: Session, room_id: str, user_id: str, message_ids: List[str]) -> int:
+        """수신자의 메시지를 읽음 처리하고 카운터 감소 (커밋은 호출 측에서). 변경된 메시지 수 반환"""
+        if not message_ids:
+            return 0
+        
+        result = db.execute(
+            update(ChatMessage.__table__).where(
+                ChatMessage.__table__.c.id.in_(message_ids),
+                ChatMessage.__table__.c.chat_room_id == room_id,
+                ChatMessage.__table__.c.receiver_id == user_id,
+                ChatMessage.__table__.c.is_read == False
+            ).values(is_read=True)
+        )
+        MatchingService.decrement_unread(db, room_id, user_id, result.rowcount)
+        return result.rowcount
+    
     @staticmethod
     def send_message(
         db: Session,
@@ -315,6 +529,9 @@ class MatchingService:
         chat_room.last_message = message
         chat_room.last_message_at = datetime.now()
         
+        # 수신자의 읽지 않은 메시지 수 증가
+        MatchingService.increment_unread(db, {(room_id, receiver_id): 1})
+        
         db.commit()
         db.refresh(chat_message)
         
@@ -326,26 +543,66 @@ class MatchingService:
         room_id: str,
         user_id: str,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[ChatMessage]:
-        """채팅 메시지 조회"""
+        offset: int = 0,
+        before_id: Optional[str] = None,
+        after_id: Optional[str] = None
+    ) -> Tuple[List[ChatMessage], bool]:
+        """채팅 메시지 조회 ((seq, id) 오름차순)
+
+        기본: 최신 메시지 limit개, before_id: 해당 메시지 이전, after_id: 해당 메시지 이후
+        반환: (메시지 목록, 같은 방향으로 더 있는지 여부)
+        """
         # 채팅방 권한 확인
-        chat_room = MatchingService.get_chat_room(db, room_id, user_id)
-        
-        # 메시지 조회
-        messages = db.query(ChatMessage).filter(
-            ChatMessage.chat_room_id == room_id
-        ).order_by(ChatMessage.created_at.desc())\
-        .limit(limit)\
-        .offset(offset)\
-        .all()
+        MatchingService.get_chat_room(db, room_id, user_id)
+        
+        query = db.query(ChatMessage).filter(ChatMessage.chat_room_id == room_id)
+        
+        cursor_id = after_id or before_id
+        if cursor_id:
+            cursor_seq = db.query(ChatMessage.seq).filter(
+                ChatMessage.id == cursor_id,
+                ChatMessage.chat_room_id == room_id
+            ).scalar()
+            if cursor_seq is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Cursor message not found"
+                )
         
-        # 읽음 처리
+        # 다음 페이지 존재 여부 확인을 위해 한 개 더 조회
+        # seq가 같은 메시지가 있어도 건너뛰지 않도록 (seq, id) 순서로 비교
+        if after_id:
+            messages = query.filter(or_(
+                ChatMessage.seq > cursor_seq,
+                and_(ChatMessage.seq == cursor_seq, ChatMessage.id > after_id)
+            )).order_by(ChatMessage.seq.asc(), ChatMessage.id.asc())\
+                .limit(limit + 1)\
+                .all()
+        else:
+            if before_id:
+                query = query.filter(or_(
+                    ChatMessage.seq < cursor_seq,
+                    and_(ChatMessage.seq == cursor_seq, ChatMessage.id < before_id)
+                ))
+            messages = query.order_by(ChatMessage.seq.desc(), ChatMessage.id.desc())\
+                .limit(limit + 1)\
+                .offset(offset)\
+                .all()
+        
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if not after_id:
+            messages.reverse()
+        
+        # 읽음 처리 (한 번의 UPDATE, 실제로 변경된 행 수만큼 카운터 감소)
         unread_messages = [msg for msg in messages if msg.receiver_id == user_id and not msg.is_read]
-        for msg in unread_messages:
-            msg.is_read = True
-        
         if unread_messages:
+            MatchingService.mark_messages_read(db, room_id, user_id, [msg.id for msg in unread_messages])
+            # 커밋 시 만료되어 메시지마다 다시 조회하지 않도록 세션에서 분리한 뒤 응답용 값만 반영
+            for msg in messages:
+                db.expunge(msg)
             db.commit()
+            for msg in unread_messages:
+                msg.is_read = True
         
-        return list(reversed(messages))
+        return messages, has_more
@@ -0,0 +1,86 @@
+from typing import Dict, Tuple
+
+from sqlalchemy import bindparam, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.core.region_data import region_catalogue
+from app.models.region import Region
+from app.models.story import Story
+
+_region_table = Region.__table__
+_story_table = Story.__table__
+
+_increment_story_count = (
+    update(_region_table)
+    .where(_region_table.c.city == bindparam("region_city"))
+    .where(_region_table.c.district == bindparam("region_district"))
+    .values(story_count=func.coalesce(_region_table.c.story_count, 0) + bindparam("delta"))
+)
+
+_TRACKED = ("is_active", "region_id1", "region_id2")
+
+
+def _previous(story: Story) -> Tuple[bool, str, str]:
+    """플러시 전 (활성 여부, region_id1, region_id2)"""
+    attrs = inspect(story).attrs
+    values = []
+    for name in _TRACKED:
+        history = attrs[name].history
+        values.append(history.deleted[0] if history.deleted else getattr(story, name))
+    return values[0] is not False, values[1], values[2]
+
+
+def _current(story: Story) -> Tuple[bool, str, str]:
+    # is_active는 INSERT 시 기본값 True
+    return story.is_active is not False, story.region_id1, story.region_id2
+
+
+def _ensure_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+# 만료된 스토리를 수정해도 이전 값이 history에 남도록 set 시 기존 값을 로드
+for _attribute in (Story.is_active, Story.region_id1, Story.region_id2):
+    event.listen(_attribute, "set", _ensure_old_value, active_history=True)
+
+
+@event.listens_for(Session, "before_flush")
+def _update_region_story_counts(session, flush_context, instances):
+    """스토리 생성/삭제/비활성화/지역 변경을 같은 트랜잭션에서 regions.story_count에 반영"""
+    deltas: Dict[Tuple[str, str], int] = {}
+
+    def add(state: Tuple[bool, str, str], amount: int):
+        active, region_id1, region_id2 = state
+        # 지역 테이블의 (city, district) = 스토리의 (region_id1, region_id2)
+        if active and region_catalogue.contains(region_id1, region_id2):
+            deltas[(region_id1, region_id2)] = deltas.get((region_id1, region_id2), 0) + amount
+
+    for obj in session.new:
+        if isinstance(obj, Story):
+            add(_current(obj), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Story):
+            add(_previous(obj), -1)
+    for obj in session.dirty:
+        if isinstance(obj, Story) and session.is_modified(obj):
+            previous, current = _previous(obj), _current(obj)
+            if previous != current:
+                add(previous, -1)
+                add(current, 1)
+
+    params = [
+        {"region_city": city, "region_district": district, "delta": delta}
+        for (city, district), delta in deltas.items() if delta
+    ]
+    if params:
+        session.execute(_increment_story_count, params)
+
+
+def recompute_region_counts(db: Session) -> int:
+    """모든 지역의 story_count를 활성 스토리 수로 다시 계산 (커밋은 호출 측에서)"""
+    active_count = select(func.count(_story_table.c.id)).where(
+        _story_table.c.region_id1 == _region_table.c.city,
+        _story_table.c.region_id2 == _region_table.c.district,
+        _story_table.c.is_active == True
+    ).scalar_subquery()
+    return db.execute(update(_region_table).values(story_count=active_count)).rowcount
@@ -0,0 +1,99 @@
+from typing import Dict, List, Mapping, Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.region_data import is_choseong_query, region_catalogue
+from app.models.region import Region
+
+
+@dataclass(frozen=True)
+class RegionRecord:
+    """regions 테이블 행의 불변 사본 (story_count 제외)"""
+    id: str
+    region_name: str
+    city: str
+    district: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    created_at: Optional[datetime]
+
+
+class RegionDirectory:
+    """regions 테이블 메모리 사본과 스토리 수 스냅샷
+
+    지역 행은 init_regions.py로만 바뀌는 정적 데이터라 한 번만 읽고,
+    자주 바뀌는 story_count만 REGION_COUNTS_TTL마다 한 번의 쿼리로 갱신함.
+    스냅샷의 지역 ID 목록이 달라지면 행을 다시 읽음
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.records: Tuple[RegionRecord, ...] = ()
+        self.by_id: Mapping[str, RegionRecord] = MappingProxyType({})
+        self.counts: Dict[str, int] = {}
+        # 스토리 수가 바뀔 때마다 증가 (응답 ETag 캐시 키)
+        self.version = 0
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session):
+        if time.monotonic() < self._expires_at:
+            return
+        with self._lock:
+            if time.monotonic() < self._expires_at:
+                return
+            counts = {region_id: count or 0 for region_id, count in db.query(Region.id, Region.story_count).all()}
+            if counts.keys() != self.by_id.keys():
+                self._load_records(db)
+                self.version += 1
+            elif counts != self.counts:
+                self.version += 1
+            self.counts = counts
+            self._expires_at = time.monotonic() + self.ttl
+
+    def _load_records(self, db: Session):
+        records = tuple(
+            RegionRecord(
+                id=region.id,
+                region_name=region.region_name,
+                city=region.city,
+                district=region.district,
+                latitude=float(region.latitude) if region.latitude else None,
+                longitude=float(region.longitude) if region.longitude else None,
+                created_at=region.created_at
+            )
+            for region in db.query(Region).all()
+        )
+        self.records = records
+        self.by_id = MappingProxyType({record.id: record for record in records})
+
+    def story_count(self, record: RegionRecord) -> int:
+        return self.counts.get(record.id, 0)
+
+    def search(self, db: Session, search: Optional[str] = None) -> List[RegionRecord]:
+        """지역 목록 (스토리 수 많은 순). search는 부분 문자열 또는 도시명 초성"""
+        self.refresh(db)
+        records = self.records
+        if search:
+            if is_choseong_query(search):
+                keys = {(entry.category, entry.city) for entry in region_catalogue.search(search)}
+                records = [record for record in records if (record.city, record.district) in keys]
+            else:
+                records = [
+                    record for record in records
+                    if search in record.city or search in (record.district or "") or search in record.region_name
+                ]
+        return sorted(records, key=lambda record: (-self.story_count(record), record.city, record.district or ""))
+
+    def get(self, db: Session, region_id: str) -> Optional[RegionRecord]:
+        self.refresh(db)
+        return self.by_id.get(region_id)
+
+
+region_directory = RegionDirectory(ttl=settings.REGION_COUNTS_TTL)
@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional, Tuple
+import math
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.services.region_directory import RegionRecord, region_directory
+
+# 격자 한 칸 크기 (도). 위도 0.25도 ~= 28km
+CELL_DEGREES = 0.25
+EARTH_RADIUS_KM = 6371.0088
+_KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell(value: float) -> int:
+    return math.floor(value / CELL_DEGREES)
+
+
+class RegionGeoIndex:
+    """좌표가 있는 지역의 격자 색인 (region_directory의 행이 바뀌면 다시 구성)
+
+    반경/영역 조회는 겹치는 칸의 지역만 거리 계산함
+    """
+
+    def __init__(self):
+        self._records: Optional[Tuple[RegionRecord, ...]] = None
+        self._grid: Dict[Tuple[int, int], List[RegionRecord]] = {}
+        # 지역이 있는 칸의 범위 (min_lat_cell, max_lat_cell, min_lng_cell, max_lng_cell)
+        self._bounds: Optional[Tuple[int, int, int, int]] = None
+        self._lock = threading.Lock()
+
+    def _ensure_built(self, db: Session):
+        region_directory.refresh(db)
+        records = region_directory.records
+        if records is self._records:
+            return
+        with self._lock:
+            if records is self._records:
+                return
+            grid: Dict[Tuple[int, int], List[RegionRecord]] = {}
+            for record in records:
+                if record.latitude is None or record.longitude is None:
+                    continue
+                grid.setdefault((_cell(record.latitude), _cell(record.longitude)), []).append(record)
+            self._grid = grid
+            self._bounds = (
+                min(lat_cell for lat_cell, _ in grid), max(lat_cell for lat_cell, _ in grid),
+                min(lng_cell for _, lng_cell in grid), max(lng_cell for _, lng_cell in grid)
+            ) if grid else None
+            self._records = records
+
+    def _cells(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[RegionRecord]:
+        grid, bounds = self._grid, self._bounds
+        if bounds is None:
+            return []
+        # 요청 영역을 지역이 있는 칸의 범위로 제한 (세계 지도 크기 영역도 칸 수가 지역 분포 범위를 넘지 않음)
+        min_lat_cell, max_lat_cell = max(_cell(min_lat), bounds[0]), min(_cell(max_lat), bounds[1])
+        min_lng_cell, max_lng_cell = max(_cell(min_lng), bounds[2]), min(_cell(max_lng), bounds[3])
+        if min_lat_cell > max_lat_cell or min_lng_cell > max_lng_cell:
+            return []
+        if (max_lat_cell - min_lat_cell + 1) * (max_lng_cell - min_lng_cell + 1) > len(grid):
+            # 훑을 칸이 지역이 있는 칸보다 많으면 채워진 칸만 확인
+            return [
+                record
+                for (lat_cell, lng_cell), records in grid.items()
+                if min_lat_cell <= lat_cell <= max_lat_cell and min_lng_cell <= lng_cell <= max_lng_cell
+                for record in records
+            ]
+        return [
+            record
+            for lat_cell in range(min_lat_cell, max_lat_cell + 1)
+            for lng_cell in range(min_lng_cell, max_lng_cell + 1)
+            for record in grid.get((lat_cell, lng_cell), ())
+        ]
+
+    def within_bbox(self, db: Session, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[RegionRecord]:
+        """지도 화면 영역 안의 지역"""
+        self._ensure_built(db)
+        return [
+            record for record in self._cells(min_lat, min_lng, max_lat, max_lng)
+            if min_lat <= record.latitude <= max_lat and min_lng <= record.longitude <= max_lng
+        ]
+
+    def nearby(self, db: Session, lat: float, lng: float, radius_km: float) -> List[Tuple[RegionRecord, float]]:
+        """반경 안의 (지역, 거리 km) 목록 (가까운 순)"""
+        self._ensure_built(db)
+        dlat = radius_km / _KM_PER_DEGREE_LAT
+        dlng = radius_km / (_KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+        matched = []
+        for record in self._cells(lat - dlat, lng - dlng, lat + dlat, lng + dlng):
+            distance = haversine_km(lat, lng, record.latitude, record.longitude)
+            if distance <= radius_km:
+                matched.append((record, distance))
+        matched.sort(key=lambda item: item[1])
+        return matched
+
+
+region_geo_index = RegionGeoIndex()
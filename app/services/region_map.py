@@ -0,0 +1,93 @@
+from typing import List, Optional
+import threading
+import time
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.region import Region
+from app.models.story import Story
+from app.schemas.region import RegionMapData
+
+# 지역별 인기 카테고리 수
+TOP_CATEGORIES = 3
+
+
+def build_map_data(db: Session) -> List[RegionMapData]:
+    """모든 지역의 인기 카테고리를 한 번의 집계 쿼리로 계산 (스토리 수는 regions.story_count 카운터 사용)
+
+    스토리는 region_id1(큰 지역) / region_id2(도시)에, 지역은 city / district에 같은 값을 저장함
+    """
+    story_count = func.count(Story.id)
+    partition = (Story.region_id1, Story.region_id2)
+    per_category = db.query(
+        Story.region_id1.label("region_id1"),
+        Story.region_id2.label("region_id2"),
+        Story.category.label("category"),
+        func.row_number().over(
+            partition_by=partition,
+            order_by=(story_count.desc(), Story.category)
+        ).label("rank")
+    ).filter(
+        Story.is_active == True,
+        Story.category.isnot(None)
+    ).group_by(
+        Story.region_id1, Story.region_id2, Story.category
+    ).subquery()
+
+    rows = db.query(
+        Region, per_category.c.category
+    ).outerjoin(
+        per_category,
+        and_(
+            per_category.c.region_id1 == Region.city,
+            per_category.c.region_id2 == Region.district,
+            per_category.c.rank <= TOP_CATEGORIES
+        )
+    ).filter(
+        Region.latitude.isnot(None), Region.longitude.isnot(None)
+    ).order_by(
+        Region.id, per_category.c.rank
+    ).all()
+
+    map_data: List[RegionMapData] = []
+    for region, category in rows:
+        if not map_data or map_data[-1].id != region.id:
+            map_data.append(RegionMapData(
+                id=region.id,
+                city=region.city,
+                district=region.district,
+                latitude=float(region.latitude),
+                longitude=float(region.longitude),
+                story_count=region.story_count or 0,
+                popular_categories=[]
+            ))
+        if category is not None:
+            map_data[-1].popular_categories.append(category)
+    return map_data
+
+
+class RegionMapCache:
+    """지도 데이터 캐시. 만료 후 첫 요청이 다시 계산하고 동시 요청은 기다렸다가 결과를 공유"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: Optional[List[RegionMapData]] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        # 다시 계산할 때마다 증가 (응답 ETag 캐시 키)
+        self.version = 0
+
+    def get(self, db: Session) -> List[RegionMapData]:
+        if self._data is not None and time.monotonic() < self._expires_at:
+            return self._data
+        with self._lock:
+            if self._data is None or time.monotonic() >= self._expires_at:
+                self._data = build_map_data(db)
+                self.version += 1
+                self._expires_at = time.monotonic() + self.ttl
+            return self._data
+
+
+region_map_cache = RegionMapCache(ttl=settings.REGION_MAP_CACHE_TTL)
@@ -0,0 +1,344 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+import asyncio
+import gzip
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import registry
+from app.models.story import Story
+
+logger = logging.getLogger(__name__)
+
+story_search_seconds = registry.histogram(
+    "story_search_seconds", "Story full-text search duration (index lookup and ranking only)"
+)
+registry.gauge(
+    "story_search_documents", "Stories held in the full-text index of this worker",
+    callback=lambda: len(story_search_index._docs)
+)
+
+# BM25 파라미터
+_K1 = 1.2
+_B = 0.75
+# 제목에 나온 토큰은 본문보다 가중치를 더 줌
+_TITLE_WEIGHT = 3
+
+_SNAPSHOT_VERSION = 1
+_WORD = re.compile(r"\w+")
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣" or "ㄱ" <= ch <= "ㆎ"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """한글은 음절 bigram(한 글자 단어는 unigram), 그 외 단어는 소문자 전체 단어로 분리
+
+    조사가 붙은 어절("부산에서")도 bigram이 겹치므로 형태소 분석 없이 부분 일치됨
+    """
+    if not text:
+        return []
+    tokens = []
+    for word in _WORD.findall(unicodedata.normalize("NFC", text).lower()):
+        # 한글/비한글이 섞인 어절("kbs뉴스")은 문자 종류별로 나눔
+        for run in re.findall(r"[가-힣ㄱ-ㆎ]+|[^가-힣ㄱ-ㆎ]+", word):
+            if not _is_hangul(run[0]):
+                tokens.append(run)
+            elif len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _term_frequencies(title: Optional[str], content: Optional[str]) -> Dict[str, int]:
+    tf: Dict[str, int] = {}
+    for token in tokenize(title):
+        tf[token] = tf.get(token, 0) + _TITLE_WEIGHT
+    for token in tokenize(content):
+        tf[token] = tf.get(token, 0) + 1
+    return tf
+
+
+class StorySearchIndex:
+    """스토리 제목/본문 BM25 역색인 (워커별 메모리, 디스크 스냅샷)
+
+    이 워커에서 커밋된 스토리 변경은 커밋 직후 반영하고, 다른 워커의 변경은
+    updated_at 워터마크로 주기적으로 가져옴. 워터마크로 잡히지 않는 하드 삭제는
+    주기적인 활성 스토리 ID 대조로 반영하며, 검색 결과는 DB에서 다시 확인함
+    """
+
+    def __init__(self, path: str, refresh_interval: float, full_sync_interval: float):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.full_sync_interval = full_sync_interval
+        # story_id -> 토큰별 빈도 (삭제 시 postings 정리용)
+        self._docs: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        # 토큰 -> story_id -> 빈도
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._watermark: Optional[datetime] = None
+        self._synced_at: Optional[float] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        # 스냅샷 쓰기 직렬화 (주기 갱신 스레드와 종료 시 저장이 같은 임시 파일을 씀)
+        self._save_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # 취소해도 이미 실행 중인 갱신 스레드는 끝까지 돌 수 있으므로 save는 _save_lock으로 직렬화
+            await asyncio.to_thread(self.save)
+
+    async def _refresh_periodically(self):
+        while True:
+            try:
+                await asyncio.to_thread(self._refresh_with_own_session)
+            except Exception as e:
+                logger.error(f"[StorySearch] Refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def ensure_built(self):
+        """첫 동기화 전이면 스레드에서 끝날 때까지 대기 (스냅샷 로드/전체 스캔이 이벤트 루프를 막지 않도록)"""
+        if self._synced_at is None:
+            await asyncio.to_thread(self._refresh_with_own_session)
+
+    def _refresh_with_own_session(self):
+        db = SessionLocal()
+        try:
+            self.refresh(db)
+        finally:
+            db.close()
+        self.save()
+
+    # ---- 색인 변경 ----
+
+    def _add(self, story_id: str, tf: Dict[str, int]):
+        self._remove(story_id)
+        if not tf:
+            return
+        self._docs[story_id] = tf
+        length = sum(tf.values())
+        self._lengths[story_id] = length
+        self._total_length += length
+        for token, count in tf.items():
+            self._postings.setdefault(token, {})[story_id] = count
+
+    def _remove(self, story_id: str):
+        tf = self._docs.pop(story_id, None)
+        if tf is None:
+            return
+        self._total_length -= self._lengths.pop(story_id, 0)
+        for token in tf:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(story_id, None)
+                if not posting:
+                    del self._postings[token]
+
+    def apply(self, upserts: Iterable[Tuple[str, Optional[str], Optional[str]]], deletes: Iterable[str]):
+        """(story_id, 제목, 본문) 추가/갱신과 삭제를 반영"""
+        with self._lock:
+            for story_id in deletes:
+                if story_id in self._docs:
+                    self._remove(story_id)
+                    self._dirty = True
+            for story_id, title, content in upserts:
+                tf = _term_frequencies(title, content)
+                # 워터마크와 같은 시각의 행은 매번 다시 읽히므로 바뀐 경우만 스냅샷 대상
+                if self._docs.get(story_id, {}) != tf:
+                    self._add(story_id, tf)
+                    self._dirty = True
+
+    # ---- DB 동기화 ----
+
+    def refresh(self, db: Session):
+        """전체 대조 주기가 지났으면 활성 ID 대조, 아니면 워터마크 이후 변경분만 반영"""
+        with self._refresh_lock:
+            if self._synced_at is None:
+                self.load()
+            if self._synced_at is None or time.monotonic() - self._synced_at > self.full_sync_interval:
+                self._full_sync(db)
+            else:
+                self._sync_changed(db)
+
+    def _full_sync(self, db: Session):
+        start = time.perf_counter()
+        watermark = db.query(Story.updated_at).order_by(Story.updated_at.desc()).limit(1).scalar()
+        active_ids = {story_id for (story_id,) in db.query(Story.id).filter(Story.is_active == True).all()}
+        with self._lock:
+            indexed = set(self._docs)
+        missing = active_ids - indexed
+        if self._watermark is not None:
+            # 스냅샷 이후 수정된 스토리도 다시 색인
+            missing |= {
+                story_id for (story_id,) in
+                db.query(Story.id).filter(Story.is_active == True, Story.updated_at >= self._watermark).all()
+            }
+        self._index_from_db(db, missing, deletes=indexed - active_ids)
+        self._watermark = watermark
+        self._synced_at = time.monotonic()
+        logger.info(
+            f"[StorySearch] Synced {len(active_ids)} stories "
+            f"({len(missing)} indexed, {len(indexed - active_ids)} removed) in {time.perf_counter() - start:.2f}s"
+        )
+
+    def _sync_changed(self, db: Session):
+        query = db.query(Story.id, Story.title, Story.content, Story.is_active, Story.updated_at)
+        # 같은 초에 변경된 행을 놓치지 않도록 워터마크와 같은 값도 다시 확인
+        if self._watermark is not None:
+            query = query.filter(Story.updated_at >= self._watermark)
+        rows = query.all()
+        if not rows:
+            return
+        self.apply(
+            [(story_id, title, content) for story_id, title, content, is_active, _ in rows if is_active],
+            [story_id for story_id, _, _, is_active, _ in rows if not is_active]
+        )
+        updated = [updated_at for *_, updated_at in rows if updated_at is not None]
+        if updated:
+            self._watermark = max(updated)
+
+    def _index_from_db(self, db: Session, story_ids: Set[str], deletes: Set[str]):
+        rows = []
+        ids = list(story_ids)
+        for i in range(0, len(ids), 1000):
+            rows.extend(
+                db.query(Story.id, Story.title, Story.content).filter(Story.id.in_(ids[i:i + 1000])).all()
+            )
+        self.apply(rows, deletes)
+
+    # ---- 디스크 스냅샷 ----
+
+    def save(self):
+        """변경이 있으면 스냅샷을 원자적으로 교체 (워커마다 임시 파일을 따로 씀)"""
+        if not self.path:
+            return
+        with self._save_lock:
+            if not self._dirty or self._synced_at is None:
+                return
+            with self._lock:
+                data = {
+                    "version": _SNAPSHOT_VERSION,
+                    "watermark": self._watermark.isoformat() if self._watermark else None,
+                    "docs": dict(self._docs),
+                }
+                self._dirty = False
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+
+    def load(self):
+        """스냅샷이 있으면 읽어서 색인 복원 (이후 refresh가 워터마크부터 따라잡음)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[StorySearch] Ignoring unreadable snapshot {self.path}: {e}")
+            return
+        if data.get("version") != _SNAPSHOT_VERSION:
+            return
+        with self._lock:
+            self._docs, self._lengths, self._postings, self._total_length = {}, {}, {}, 0
+            for story_id, tf in data["docs"].items():
+                self._add(story_id, tf)
+        self._watermark = datetime.fromisoformat(data["watermark"]) if data.get("watermark") else None
+        logger.info(f"[StorySearch] Loaded {len(self._docs)} stories from {self.path}")
+
+    # ---- 검색 ----
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Tuple[str, float]], int]:
+        """BM25 상위 (story_id, 점수) 목록과 일치 스토리 수 (ensure_built 이후 호출)"""
+
+        start = time.perf_counter()
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = {}
+        with self._lock:
+            count = len(self._docs)
+            if not terms or not count:
+                return [], 0
+            avg_length = self._total_length / count
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for story_id, tf in posting.items():
+                    norm = _K1 * (1 - _B + _B * self._lengths[story_id] / avg_length)
+                    scores[story_id] = scores.get(story_id, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        story_search_seconds.observe(time.perf_counter() - start)
+        return top[offset:], len(scores)
+
+
+story_search_index = StorySearchIndex(
+    path=settings.STORY_SEARCH_INDEX_PATH,
+    refresh_interval=settings.STORY_SEARCH_REFRESH_INTERVAL,
+    full_sync_interval=settings.STORY_SEARCH_FULL_SYNC_INTERVAL
+)
+
+_PENDING_KEY = "story_search_changes"
+_INDEXED = ("title", "content", "is_active")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_story_changes(session, flush_context):
+    """스토리 생성/삭제와 제목/본문/활성 여부 변경을 커밋 시 색인하도록 기록"""
+    pending = None
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, Story) or not obj.id:
+            continue
+        if obj in session.deleted:
+            entry = None
+        elif obj in session.new or any(inspect(obj).attrs[name].history.has_changes() for name in _INDEXED):
+            entry = (obj.title, obj.content) if obj.is_active is not False else None
+        else:
+            continue
+        if pending is None:
+            pending = session.info.setdefault(_PENDING_KEY, {})
+        pending[obj.id] = entry
+
+
+@event.listens_for(Session, "after_commit")
+def _index_committed_stories(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        story_search_index.apply(
+            [(story_id, *entry) for story_id, entry in pending.items() if entry is not None],
+            [story_id for story_id, entry in pending.items() if entry is None]
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_story_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -3,7 +3,27 @@ from PIL import Image
 import os
 from pathlib import Path
 import uuid
+import time
+import functools
 from typing import Optional
+from app.core.metrics import thumbnail_job_duration_seconds
+
+
+def _timed_job(kind: str):
+    """썸네일 생성 소요 시간을 지표로 기록"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = await func(*args, **kwargs)
+            thumbnail_job_duration_seconds.observe(
+                time.perf_counter() - start,
+                kind=kind,
+                result="success" if result else "failed"
+            )
+            return result
+        return wrapper
+    return decorator
 
 class ThumbnailService:
     """비디오 및 이미지 썸네일 생성 서비스"""
@@ -12,6 +32,7 @@ class ThumbnailService:
         self.thumbnails_dir = thumbnails_dir
         os.makedirs(thumbnails_dir, exist_ok=True)
     
+    @_timed_job("video")
     async def generate_video_thumbnail(
         self, 
         video_path: str, 
@@ -117,6 +138,7 @@ class ThumbnailService:
                 cap.release()
             return None
     
+    @_timed_job("image")
     async def generate_image_thumbnail(
         self, 
         image_path: str,
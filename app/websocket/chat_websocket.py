@@ -1,66 +1,431 @@
-from typing import Dict, Set
+from typing import Deque, Dict, List, Set, Optional
+from collections import deque
 from fastapi import WebSocket
+import asyncio
 import json
 import logging
+import time
+from app.core.config import settings
+from app.core.metrics import registry
+from app.websocket.pubsub import (
+    PubSubBackend, create_pubsub, user_channel, room_channel, USER_CHANNEL_PREFIX, ROOM_CHANNEL_PREFIX,
+    PRESENCE_CHANNEL
+)
+from app.websocket.presence import presence
 
 logger = logging.getLogger(__name__)
 
+websocket_send_failures_total = registry.counter(
+    "websocket_send_failures_total", "Outbound chat WebSocket messages not delivered", ("reason",)
+)
+websocket_connections_rejected_total = registry.counter(
+    "websocket_connections_rejected_total", "Chat WebSocket connections refused by this worker", ("reason",)
+)
+websocket_evictions_total = registry.counter(
+    "websocket_evictions_total", "Chat WebSocket connections closed by the server", ("reason",)
+)
+
+# 느린 소비자/연결 수 초과 시 close code (Try Again Later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# 하트비트 응답 없음 (half-open 연결 정리)
+IDLE_TIMEOUT_CLOSE_CODE = 4008
+# 사용자별 연결 수 초과로 가장 오래된 연결 종료
+USER_LIMIT_CLOSE_CODE = 4009
+
+
+class ClientConnection:
+    """WebSocket 연결별 송신 큐. writer 태스크가 큐를 비우며 느린 연결이 다른 연결을 막지 않음
+
+    모든 송신 프레임은 이 큐를 거쳐 writer 태스크 하나만 소켓에 씀.
+    요청에 대한 응답(ack, error 등)은 드롭하지 않는 별도 큐에 넣어 브로드캐스트보다 먼저 전송
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: str, manager: "ConnectionManager"):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.manager = manager
+        # 드롭 가능한 이벤트 (메시지 전달, presence, 하트비트 등), 최대 WS_SEND_QUEUE_SIZE개
+        self.queue: Deque[dict] = deque()
+        # 드롭하지 않는 응답
+        self.replies: Deque[dict] = deque()
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.dropped = 0
+        # 이 연결이 참여 중인 채팅방
+        self.rooms: Set[str] = set()
+        # 접속 상태를 구독 중인 사용자 -> 마지막으로 전달한 online 값 (같은 상태 중복 전달 방지)
+        self.watching: Dict[str, Optional[bool]] = {}
+        self.connected_at = time.monotonic()
+        # 마지막으로 클라이언트에서 프레임을 받은 시각
+        self.last_seen = self.connected_at
+        self.writer = asyncio.create_task(self._drain())
+
+    def depth(self) -> int:
+        return len(self.queue) + len(self.replies)
+
+    def enqueue(self, message: dict, droppable: bool = True) -> bool:
+        """메시지를 송신 큐에 추가 (대기하지 않음). 큐가 가득 차면 정책에 따라 드롭 또는 연결 종료
+
+        droppable=False인 응답은 드롭하지 않으며, 응답 큐까지 가득 차면(응답도 읽지 않는 클라이언트) 연결 종료
+        """
+        if self.closed:
+            return False
+        if not droppable:
+            if len(self.replies) >= settings.WS_SEND_QUEUE_SIZE:
+                websocket_send_failures_total.inc(reason="reply_queue_full_close")
+                logger.warning(f"Closing slow WebSocket consumer for user {self.user_id} (reply queue full)")
+                asyncio.create_task(self.evict("slow_consumer", SLOW_CONSUMER_CLOSE_CODE, "Slow consumer"))
+                return False
+            self.replies.append(message)
+            self._ready.set()
+            return True
+
+        if len(self.queue) < settings.WS_SEND_QUEUE_SIZE:
+            self.queue.append(message)
+            self._ready.set()
+            return True
+
+        if settings.WS_SLOW_CONSUMER_POLICY == "close":
+            websocket_send_failures_total.inc(reason="queue_full_close")
+            logger.warning(f"Closing slow WebSocket consumer for user {self.user_id} (queue full)")
+            asyncio.create_task(self.evict("slow_consumer", SLOW_CONSUMER_CLOSE_CODE, "Slow consumer"))
+            return False
+
+        # drop_oldest: 가장 오래된 메시지를 버리고 최신 메시지 유지
+        self.queue.popleft()
+        self.queue.append(message)
+        self.dropped += 1
+        websocket_send_failures_total.inc(reason="queue_full_drop")
+        if self.dropped == 1 or self.dropped % 100 == 0:
+            logger.warning(f"Dropped {self.dropped} queued messages for slow WebSocket consumer {self.user_id}")
+        return True
+
+    async def _drain(self):
+        while True:
+            if not self.replies and not self.queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            message = self.replies.popleft() if self.replies else self.queue.popleft()
+            try:
+                await asyncio.wait_for(self.websocket.send_json(message), timeout=settings.WS_SEND_TIMEOUT)
+            except asyncio.TimeoutError:
+                websocket_send_failures_total.inc(reason="timeout")
+                logger.warning(f"WebSocket send timed out for user {self.user_id}, closing connection")
+                await self.evict("send_timeout", SLOW_CONSUMER_CLOSE_CODE, "Send timeout")
+                return
+            except Exception as e:
+                websocket_send_failures_total.inc(reason="error")
+                logger.error(f"Error sending message to user {self.user_id}: {e}")
+                await self.evict("send_error", 1011, "Send failed")
+                return
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        """연결을 관리 대상에서 제거하고 소켓 종료"""
+        if self.closed:
+            return
+        self.closed = True
+        await self.manager.disconnect(self.websocket)
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code, reason=reason), timeout=settings.WS_SEND_TIMEOUT)
+        except Exception:
+            # 이미 끊어진 소켓
+            pass
+
+    async def evict(self, reason_label: str, code: int, reason: str):
+        """서버 측에서 연결 종료 (사유별 지표 기록)"""
+        if self.closed:
+            return
+        websocket_evictions_total.inc(reason=reason_label)
+        await self.close(code, reason)
+
+    def stop(self):
+        """writer 태스크 정리 (writer 자신이 close를 호출한 경우는 스스로 종료)"""
+        self.closed = True
+        if self.writer is not asyncio.current_task():
+            self.writer.cancel()
+
 
 class ConnectionManager:
     def __init__(self):
-        # user_id -> Set[WebSocket]
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-        # WebSocket -> user_id (역참조용)
-        self.connection_to_user: Dict[WebSocket, str] = {}
+        # user_id -> Set[ClientConnection]
+        self.active_connections: Dict[str, Set[ClientConnection]] = {}
+        # WebSocket -> ClientConnection (역참조용)
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        # room_id -> Set[ClientConnection] (채팅방을 열어 둔 연결)
+        self.room_members: Dict[str, Set[ClientConnection]] = {}
+        # room_id -> 입장 시 조회한 채팅방 정보 (참여자, 매칭 요청, 활성 여부)
+        self.room_info: Dict[str, dict] = {}
+        # user_id -> 해당 사용자의 접속 상태를 구독 중인 연결
+        self.presence_watchers: Dict[str, Set[ClientConnection]] = {}
+        # 워커 간 전달 백본 (startup 시 생성, 없으면 로컬 연결에만 전달)
+        self.pubsub: Optional[PubSubBackend] = None
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """pub/sub 백본 시작 (앱 startup 시 호출)"""
+        self.pubsub = create_pubsub(settings.CHAT_PUBSUB_BACKEND, settings.REDIS_URL)
+        await self.pubsub.start(self._on_pubsub_message)
+        await self.pubsub.subscribe(PRESENCE_CHANNEL)
+        await presence.start(self.pubsub)
+        await presence.refresh(list(self.active_connections))
+        # startup 이전에 연결된 사용자/채팅방 채널 구독
+        for user_id in list(self.active_connections):
+            await self.pubsub.subscribe(user_channel(user_id))
+        for room_id in list(self.room_members):
+            await self.pubsub.subscribe(room_channel(room_id))
+        self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def stop(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
+        await presence.stop()
+        if self.pubsub:
+            await self.pubsub.stop()
+            self.pubsub = None
+
+    def touch(self, websocket: WebSocket):
+        """클라이언트 프레임 수신 시각 갱신"""
+        client = self.clients.get(websocket)
+        if client:
+            client.last_seen = time.monotonic()
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(settings.WS_HEARTBEAT_INTERVAL)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"WebSocket sweeper failed: {e}")
+
+    async def sweep(self):
+        """응답 없는 연결을 정리하고 나머지 연결에 하트비트 전송"""
+        now = time.monotonic()
+        heartbeat = {"type": "ping", "ts": int(time.time())}
+        idle = []
+        for client in list(self.clients.values()):
+            if now - client.last_seen > settings.WS_IDLE_TIMEOUT:
+                idle.append(client)
+            else:
+                # 끊어진 연결은 전송 실패/시간 초과로 writer가 정리
+                client.enqueue(heartbeat)
+
+        try:
+            await presence.refresh(list(self.active_connections))
+        except Exception as e:
+            logger.error(f"Failed to refresh presence: {e}")
+
+        for client in idle:
+            logger.info(f"Evicting idle WebSocket for user {client.user_id} ({now - client.last_seen:.0f}s since last frame)")
+            await client.evict("idle", IDLE_TIMEOUT_CLOSE_CODE, "Idle timeout")
 
     async def connect(self, websocket: WebSocket, user_id: str):
         """WebSocket 연결 저장 (연결은 이미 수락됨)"""
         # websocket.accept()는 호출하지 않음 (이미 위에서 호출됨)
-        
+        client = ClientConnection(websocket, user_id, self)
+
+        # 사용자별 연결 수 제한: 가장 오래된 연결부터 종료
+        existing = self.active_connections.get(user_id, set())
+        overflow = len(existing) + 1 - settings.WS_MAX_CONNECTIONS_PER_USER
+        if overflow > 0:
+            for old in sorted(existing, key=lambda c: c.connected_at)[:overflow]:
+                logger.info(f"User {user_id} exceeded {settings.WS_MAX_CONNECTIONS_PER_USER} connections, closing oldest")
+                await old.evict("user_limit", USER_LIMIT_CLOSE_CODE, "Too many connections")
+
         # 사용자의 연결 목록에 추가
-        if user_id not in self.active_connections:
+        first_connection = user_id not in self.active_connections
+        if first_connection:
             self.active_connections[user_id] = set()
-        self.active_connections[user_id].add(websocket)
-        
+        self.active_connections[user_id].add(client)
+
         # 역참조 매핑 추가
-        self.connection_to_user[websocket] = user_id
-        
+        self.clients[websocket] = client
+
+        # 이 워커의 첫 연결이면 사용자 채널 구독 및 접속 상태 기록
+        if first_connection and self.pubsub:
+            await self.pubsub.subscribe(user_channel(user_id))
+        if first_connection:
+            await self._update_presence(user_id, online=True)
+
         logger.info(f"User {user_id} connected. Total connections for this user: {len(self.active_connections[user_id])}")
         logger.info(f"Total connected users: {len(self.active_connections)}")
 
-    def disconnect(self, websocket: WebSocket):
+    async def disconnect(self, websocket: WebSocket):
         """WebSocket 연결 해제"""
-        # 역참조로 user_id 찾기
-        user_id = self.connection_to_user.get(websocket)
-        if user_id:
+        # 역참조로 연결 찾기
+        client = self.clients.pop(websocket, None)
+        if client:
+            client.stop()
+            user_id = client.user_id
+
+            for room_id in list(client.rooms):
+                await self._remove_from_room(client, room_id)
+            self._unwatch_all(client)
+
             # 연결 목록에서 제거
             if user_id in self.active_connections:
-                self.active_connections[user_id].discard(websocket)
-                
+                self.active_connections[user_id].discard(client)
+
                 # 해당 사용자의 모든 연결이 끊어졌으면 목록에서 제거
                 if not self.active_connections[user_id]:
                     del self.active_connections[user_id]
-            
-            # 역참조 매핑 제거
-            del self.connection_to_user[websocket]
-            
+
             logger.info(f"User {user_id} disconnected")
 
+            if user_id not in self.active_connections:
+                await self._update_presence(user_id, online=False)
+
+            # 이 워커에 남은 연결이 없으면 구독 해제 (해제 중 재연결되었으면 다시 구독)
+            if user_id not in self.active_connections and self.pubsub:
+                channel = user_channel(user_id)
+                await self.pubsub.unsubscribe(channel)
+                if user_id in self.active_connections:
+                    await self.pubsub.subscribe(channel)
+
+    async def join_room(self, websocket: WebSocket, room_id: str, info: Optional[dict] = None) -> bool:
+        """연결을 채팅방에 등록 (참여 권한은 호출 측에서 확인)"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return False
+        if info is not None:
+            self.room_info[room_id] = info
+        if room_id in client.rooms:
+            return True
+
+        client.rooms.add(room_id)
+        members = self.room_members.get(room_id)
+        if members is None:
+            members = self.room_members[room_id] = set()
+        members.add(client)
+
+        # 이 워커에서 처음 열린 채팅방이면 채널 구독
+        if len(members) == 1 and self.pubsub:
+            await self.pubsub.subscribe(room_channel(room_id))
+        return True
+
+    async def leave_room(self, websocket: WebSocket, room_id: str):
+        client = self.clients.get(websocket)
+        if client:
+            await self._remove_from_room(client, room_id)
+
+    async def _remove_from_room(self, client: ClientConnection, room_id: str):
+        client.rooms.discard(room_id)
+        members = self.room_members.get(room_id)
+        if members is None:
+            return
+        members.discard(client)
+        if not members:
+            del self.room_members[room_id]
+            self.room_info.pop(room_id, None)
+            if self.pubsub:
+                channel = room_channel(room_id)
+                await self.pubsub.unsubscribe(channel)
+                if room_id in self.room_members:
+                    await self.pubsub.subscribe(channel)
+
+    async def _update_presence(self, user_id: str, online: bool):
+        # 접속 상태 저장소 장애가 연결/해제를 막지 않도록 로그만 남김
+        try:
+            if online:
+                await presence.user_connected(user_id)
+            else:
+                await presence.user_disconnected(user_id)
+        except Exception as e:
+            logger.error(f"Failed to update presence for user {user_id}: {e}")
+
+    async def watch_presence(self, websocket: WebSocket, user_ids: List[str]) -> List[dict]:
+        """연결이 구독할 사용자 목록을 교체하고 현재 상태를 반환"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return []
+        user_ids = list(dict.fromkeys(user_ids))[:settings.PRESENCE_MAX_WATCH]
+
+        self._unwatch_all(client)
+        statuses = await presence.get_many(user_ids)
+        for user_id in user_ids:
+            client.watching[user_id] = statuses[user_id]["online"]
+            self.presence_watchers.setdefault(user_id, set()).add(client)
+        return [statuses[user_id] for user_id in user_ids]
+
+    def _unwatch_all(self, client: ClientConnection):
+        for user_id in client.watching:
+            watchers = self.presence_watchers.get(user_id)
+            if watchers is not None:
+                watchers.discard(client)
+                if not watchers:
+                    del self.presence_watchers[user_id]
+        client.watching = {}
+
+    def _deliver_presence(self, statuses: List[dict]):
+        """구독 중인 연결별로 변경된 상태를 모아 한 메시지로 전달"""
+        updates: Dict[ClientConnection, List[dict]] = {}
+        for status in statuses:
+            for client in self.presence_watchers.get(status["user_id"], ()):
+                if client.watching.get(status["user_id"]) != status["online"]:
+                    client.watching[status["user_id"]] = status["online"]
+                    updates.setdefault(client, []).append(status)
+        for client, changes in updates.items():
+            client.enqueue({"type": "presence", "users": changes})
+
+    def reply(self, websocket: WebSocket, message: dict) -> bool:
+        """연결에 보내는 요청 응답 (연결 송신 큐로 전송, 드롭하지 않음)"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return False
+        return client.enqueue(message, droppable=False)
+
+    def is_in_room(self, websocket: WebSocket, room_id: str) -> bool:
+        client = self.clients.get(websocket)
+        return client is not None and room_id in client.rooms
+
+    async def broadcast_to_room(self, room_id: str, message: dict, exclude_user_id: Optional[str] = None):
+        """채팅방을 열어 둔 모든 연결에 전송 (다른 워커 포함, 발신자 제외 가능)"""
+        if self.pubsub is None:
+            self._deliver_room_local(room_id, message, exclude_user_id)
+            return
+        try:
+            await self.pubsub.publish(
+                room_channel(room_id), {"message": message, "exclude_user_id": exclude_user_id}
+            )
+        except Exception as e:
+            logger.error(f"Error publishing message to room {room_id}: {e}")
+            self._deliver_room_local(room_id, message, exclude_user_id)
+
     async def send_personal_message(self, message: dict, user_id: str):
-        """특정 사용자에게 메시지 전송"""
-        if user_id in self.active_connections:
-            # 해당 사용자의 모든 연결에 메시지 전송
-            disconnected_sockets = []
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error sending message to user {user_id}: {e}")
-                    disconnected_sockets.append(connection)
-            
-            # 연결이 끊어진 소켓 제거
-            for socket in disconnected_sockets:
-                self.disconnect(socket)
+        """특정 사용자에게 메시지 전송 (다른 워커에 연결된 경우 pub/sub으로 전달)
+
+        소켓 쓰기는 연결별 writer 태스크가 처리하므로 큐에 넣은 뒤 바로 반환
+        """
+        if self.pubsub is None:
+            self._deliver_local(message, user_id)
+            return
+        try:
+            await self.pubsub.publish(user_channel(user_id), message)
+        except Exception as e:
+            # 백본 장애 시 최소한 이 워커의 연결에는 전달
+            logger.error(f"Error publishing message to user {user_id}: {e}")
+            self._deliver_local(message, user_id)
+
+    async def _on_pubsub_message(self, channel: str, message: dict):
+        if channel == PRESENCE_CHANNEL:
+            self._deliver_presence(message["users"])
+        elif channel.startswith(USER_CHANNEL_PREFIX):
+            self._deliver_local(message, channel[len(USER_CHANNEL_PREFIX):])
+        elif channel.startswith(ROOM_CHANNEL_PREFIX):
+            self._deliver_room_local(
+                channel[len(ROOM_CHANNEL_PREFIX):], message["message"], message.get("exclude_user_id")
+            )
+
+    def _deliver_local(self, message: dict, user_id: str):
+        """이 워커에 연결된 사용자의 모든 소켓 송신 큐에 추가"""
+        for client in list(self.active_connections.get(user_id, ())):
+            client.enqueue(message)
+
+    def _deliver_room_local(self, room_id: str, message: dict, exclude_user_id: Optional[str] = None):
+        for client in list(self.room_members.get(room_id, ())):
+            if client.user_id != exclude_user_id:
+                client.enqueue(message)
 
     async def send_to_chat_room(self, message: dict, sender_id: str, receiver_id: str):
         """채팅방의 모든 참여자에게 메시지 전송"""
@@ -68,14 +433,31 @@ class ConnectionManager:
         for user_id in [sender_id, receiver_id]:
             await self.send_personal_message(message, user_id)
 
+    def has_capacity(self) -> bool:
+        """워커당 최대 연결 수 이내인지 확인"""
+        return len(self.clients) < settings.WS_MAX_CONNECTIONS
+
     def get_user_connection_count(self, user_id: str) -> int:
         """특정 사용자의 활성 연결 수 반환"""
         return len(self.active_connections.get(user_id, set()))
 
     def is_user_online(self, user_id: str) -> bool:
-        """사용자가 온라인인지 확인"""
+        """사용자가 이 워커에 연결되어 있는지 확인 (전체 워커 기준은 presence.get_many)"""
         return user_id in self.active_connections and len(self.active_connections[user_id]) > 0
 
 
 # 전역 연결 관리자 인스턴스
 manager = ConnectionManager()
+
+registry.gauge(
+    "websocket_connections", "Open chat WebSocket connections in this worker",
+    callback=lambda: len(manager.clients)
+)
+registry.gauge(
+    "websocket_connected_users", "Users with at least one open chat WebSocket in this worker",
+    callback=lambda: len(manager.active_connections)
+)
+registry.gauge(
+    "websocket_send_queue_depth", "Messages waiting in chat WebSocket send queues in this worker",
+    callback=lambda: sum(client.depth() for client in manager.clients.values())
+)
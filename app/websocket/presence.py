@@ -0,0 +1,206 @@
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import logging
+import os
+import socket
+import time
+from app.core.config import settings
+from app.websocket.pubsub import PubSubBackend, PRESENCE_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+def _status(user_id: str, online: bool, last_seen: Optional[float]) -> dict:
+    return {
+        "user_id": user_id,
+        "online": online,
+        "last_seen": int(last_seen) if last_seen is not None else None
+    }
+
+
+class PresenceStore:
+    """사용자별 접속 상태 저장소
+
+    워커별로 "이 사용자가 언제까지 접속 중인지" 만료 시각을 기록하므로
+    한 워커가 비정상 종료되어도 TTL이 지나면 오프라인으로 판정됨
+    """
+
+    async def stop(self):
+        pass
+
+    async def set_online(self, user_ids: Iterable[str], worker_id: str, ttl: float):
+        raise NotImplementedError
+
+    async def set_offline(self, user_id: str, worker_id: str):
+        raise NotImplementedError
+
+    async def get_many(self, user_ids: List[str]) -> Dict[str, dict]:
+        raise NotImplementedError
+
+
+class InMemoryPresenceStore(PresenceStore):
+    """단일 프로세스용 (개발/테스트)"""
+
+    def __init__(self):
+        # user_id -> {worker_id: 만료 시각}
+        self._workers: Dict[str, Dict[str, float]] = {}
+        self._last_seen: Dict[str, float] = {}
+
+    async def set_online(self, user_ids: Iterable[str], worker_id: str, ttl: float):
+        expires_at = time.time() + ttl
+        for user_id in user_ids:
+            self._workers.setdefault(user_id, {})[worker_id] = expires_at
+
+    async def set_offline(self, user_id: str, worker_id: str):
+        workers = self._workers.get(user_id)
+        if workers is not None:
+            workers.pop(worker_id, None)
+            if not workers:
+                del self._workers[user_id]
+        self._last_seen[user_id] = time.time()
+
+    async def get_many(self, user_ids: List[str]) -> Dict[str, dict]:
+        now = time.time()
+        return {
+            user_id: _status(
+                user_id,
+                any(expires_at > now for expires_at in self._workers.get(user_id, {}).values()),
+                self._last_seen.get(user_id)
+            )
+            for user_id in user_ids
+        }
+
+
+class RedisPresenceStore(PresenceStore):
+    """Redis 기반 (멀티 워커). 사용자별 해시 presence:user:{id} = {worker_id: 만료 시각}"""
+
+    KEY_PREFIX = "presence:user:"
+    LAST_SEEN_KEY = "presence:last_seen"
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CHAT_PUBSUB_BACKEND=redis requires the 'redis' package") from e
+        self._redis = redis.from_url(url, decode_responses=True)
+
+    async def stop(self):
+        await self._redis.close()
+
+    async def set_online(self, user_ids: Iterable[str], worker_id: str, ttl: float):
+        expires_at = time.time() + ttl
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                key = f"{self.KEY_PREFIX}{user_id}"
+                pipe.hset(key, worker_id, expires_at)
+                # 모든 워커가 갱신을 멈추면 키 자체도 정리
+                pipe.expire(key, int(ttl) + 1)
+            await pipe.execute()
+
+    async def set_offline(self, user_id: str, worker_id: str):
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hdel(f"{self.KEY_PREFIX}{user_id}", worker_id)
+            pipe.hset(self.LAST_SEEN_KEY, user_id, time.time())
+            await pipe.execute()
+
+    async def get_many(self, user_ids: List[str]) -> Dict[str, dict]:
+        if not user_ids:
+            return {}
+        # 한 번의 왕복으로 조회
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.hvals(f"{self.KEY_PREFIX}{user_id}")
+            pipe.hmget(self.LAST_SEEN_KEY, user_ids)
+            *workers, last_seen = await pipe.execute()
+
+        now = time.time()
+        return {
+            user_id: _status(
+                user_id,
+                any(float(expires_at) > now for expires_at in expires),
+                float(seen) if seen is not None else None
+            )
+            for user_id, expires, seen in zip(user_ids, workers, last_seen)
+        }
+
+
+def create_presence_store(backend: str, redis_url: str) -> PresenceStore:
+    if backend == "redis":
+        return RedisPresenceStore(redis_url)
+    return InMemoryPresenceStore()
+
+
+class PresenceTracker:
+    """이 워커의 접속 상태 변경을 저장소에 기록하고, 모아서 한 번에 발행
+
+    짧은 시간 안의 재연결/연결 해제는 디바운스 주기 동안 합쳐져
+    실제 상태가 바뀐 사용자만 PRESENCE_CHANNEL로 전달됨
+    """
+
+    def __init__(self, debounce: float, ttl: float):
+        self.debounce = debounce
+        self.ttl = ttl
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.store: PresenceStore = InMemoryPresenceStore()
+        self.pubsub: Optional[PubSubBackend] = None
+        # 디바운스 주기 동안 상태가 바뀐 사용자
+        self._changed: set = set()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self, pubsub: PubSubBackend):
+        self.store = create_presence_store(settings.CHAT_PUBSUB_BACKEND, settings.REDIS_URL)
+        self.pubsub = pubsub
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self):
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
+        self.pubsub = None
+        await self.store.stop()
+
+    async def user_connected(self, user_id: str):
+        """이 워커에서 사용자의 첫 연결이 열림"""
+        await self.store.set_online([user_id], self.worker_id, self.ttl)
+        self._changed.add(user_id)
+
+    async def user_disconnected(self, user_id: str):
+        """이 워커에서 사용자의 마지막 연결이 닫힘 (다른 워커 연결은 flush 시 확인)"""
+        await self.store.set_offline(user_id, self.worker_id)
+        self._changed.add(user_id)
+
+    async def refresh(self, user_ids: List[str]):
+        """접속 중인 사용자의 만료 시각 연장 (하트비트 주기마다 호출)"""
+        if user_ids:
+            await self.store.set_online(user_ids, self.worker_id, self.ttl)
+
+    async def get_many(self, user_ids: List[str]) -> Dict[str, dict]:
+        return await self.store.get_many(user_ids)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.debounce)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"[Presence] Failed to publish presence changes: {e}")
+
+    async def flush(self):
+        if not self._changed or self.pubsub is None:
+            return
+        changed, self._changed = list(self._changed), set()
+        try:
+            # 다른 워커의 연결까지 반영된 현재 상태를 발행
+            statuses = await self.store.get_many(changed)
+            await self.pubsub.publish(PRESENCE_CHANNEL, {"users": list(statuses.values())})
+        except Exception:
+            # 다음 주기에 다시 시도
+            self._changed.update(changed)
+            raise
+
+
+presence = PresenceTracker(
+    debounce=settings.PRESENCE_DEBOUNCE_MS / 1000,
+    # 하트비트 두 번을 놓치면 오프라인으로 판정
+    ttl=settings.WS_HEARTBEAT_INTERVAL * 2 + 5
+)
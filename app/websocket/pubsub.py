@@ -0,0 +1,152 @@
+from typing import Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (채널, 메시지) -> 로컬 전달
+MessageHandler = Callable[[str, dict], Awaitable[None]]
+
+USER_CHANNEL_PREFIX = "chat:user:"
+ROOM_CHANNEL_PREFIX = "chat:room:"
+# 접속 상태 변경 (모든 워커가 구독)
+PRESENCE_CHANNEL = "chat:presence"
+
+
+def user_channel(user_id: str) -> str:
+    return f"{USER_CHANNEL_PREFIX}{user_id}"
+
+
+def room_channel(room_id: str) -> str:
+    return f"{ROOM_CHANNEL_PREFIX}{room_id}"
+
+
+class PubSubBackend:
+    """워커 간 메시지 전달 백본. 각 워커는 로컬에 연결된 사용자/열린 채팅방 채널만 구독"""
+
+    def __init__(self):
+        self.handler: Optional[MessageHandler] = None
+        self.channels: Set[str] = set()
+        # 채팅 외 용도의 채널별 handler (예: 캐시 무효화)
+        self.channel_handlers: Dict[str, MessageHandler] = {}
+
+    async def start(self, handler: MessageHandler):
+        self.handler = handler
+
+    async def stop(self):
+        self.channels.clear()
+
+    async def publish(self, channel: str, message: dict):
+        raise NotImplementedError
+
+    async def subscribe(self, channel: str):
+        self.channels.add(channel)
+
+    async def unsubscribe(self, channel: str):
+        self.channels.discard(channel)
+
+    async def listen(self, channel: str, handler: MessageHandler):
+        """채널을 구독하고 기본 handler 대신 지정한 handler로 전달"""
+        self.channel_handlers[channel] = handler
+        await self.subscribe(channel)
+
+    async def _dispatch(self, channel: str, message: dict):
+        handler = self.channel_handlers.get(channel, self.handler)
+        if handler is None or channel not in self.channels:
+            return
+        try:
+            await handler(channel, message)
+        except Exception as e:
+            logger.error(f"[PubSub] Handler failed for {channel}: {e}")
+
+
+class InMemoryPubSub(PubSubBackend):
+    """단일 프로세스용 (개발/테스트). 발행 즉시 같은 프로세스의 구독자에게 전달"""
+
+    async def publish(self, channel: str, message: dict):
+        await self._dispatch(channel, message)
+
+
+class RedisPubSub(PubSubBackend):
+    """Redis PUBLISH/SUBSCRIBE 기반 멀티 워커 전달"""
+
+    def __init__(self, url: str, reconnect_delay_max: float = 10.0):
+        super().__init__()
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CHAT_PUBSUB_BACKEND=redis requires the 'redis' package") from e
+
+        self.url = url
+        self.reconnect_delay_max = reconnect_delay_max
+        self._redis = redis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._has_channels = asyncio.Event()
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, handler: MessageHandler):
+        await super().start(handler)
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"[PubSub] Redis backend started ({self.url.split('@')[-1]})")
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await super().stop()
+        await self._pubsub.close()
+        await self._redis.close()
+
+    async def publish(self, channel: str, message: dict):
+        await self._redis.publish(channel, json.dumps(message, default=str))
+
+    async def subscribe(self, channel: str):
+        await super().subscribe(channel)
+        await self._pubsub.subscribe(channel)
+        self._has_channels.set()
+
+    async def unsubscribe(self, channel: str):
+        await super().unsubscribe(channel)
+        await self._pubsub.unsubscribe(channel)
+
+    async def _listen(self):
+        delay = 0.5
+        while True:
+            try:
+                # 구독 채널이 생기기 전에는 pubsub 커넥션이 없으므로 대기
+                if not self._pubsub.subscribed:
+                    self._has_channels.clear()
+                    await self._has_channels.wait()
+                    continue
+
+                raw = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                delay = 0.5
+                if raw is None or raw.get("type") != "message":
+                    continue
+
+                channel = raw["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                await self._dispatch(channel, json.loads(raw["data"]))
+            except asyncio.CancelledError:
+                raise
+            except ValueError as e:
+                logger.error(f"[PubSub] Invalid message payload: {e}")
+            except Exception as e:
+                # 재연결 시 redis-py가 기존 채널을 다시 구독함
+                logger.error(f"[PubSub] Redis listener error, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.reconnect_delay_max)
+
+
+def create_pubsub(backend: str, redis_url: str) -> PubSubBackend:
+    if backend == "redis":
+        return RedisPubSub(redis_url)
+    if backend != "memory":
+        logger.warning(f"[PubSub] Unknown backend '{backend}', using in-memory pub/sub")
+    return InMemoryPubSub()
@@ -0,0 +1,211 @@
+"""
+벤치마크용 합성 데이터 생성기
+사용자, 가이드, 스토리, 좋아요, 댓글, 매칭 요청, 채팅방/메시지를 고정 시드로 생성합니다.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, date
+from typing import List, Dict
+import random
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.region_data import REGION_DATA
+from app.models.user import User
+from app.models.guide import Guide
+from app.models.story import Story, StoryLike, StoryComment
+from app.models.matching import MatchingRequest, MatchingStatus, MatchingType, ChatMessage
+from app.models.chat import ChatRoom, ChatUnreadCounter
+
+CATEGORIES = ["맛집", "역사", "자연", "축제", "카페", "야경", "전통시장", "체험"]
+
+
+@dataclass
+class DatasetSize:
+    users: int = 200
+    guides: int = 20
+    stories: int = 500
+    likes: int = 3000
+    comments: int = 2000
+    chat_rooms: int = 100
+    messages_per_room: int = 50
+
+
+@dataclass
+class Dataset:
+    """시나리오에서 사용할 ID 목록"""
+    user_ids: List[str] = field(default_factory=list)
+    guide_user_ids: List[str] = field(default_factory=list)
+    guide_ids: List[str] = field(default_factory=list)
+    story_ids: List[str] = field(default_factory=list)
+    # 채팅방 ID -> (여행자 user_id, 가이드 user_id)
+    chat_rooms: Dict[str, tuple] = field(default_factory=dict)
+
+
+def _timestamp(base: datetime, seconds: int) -> datetime:
+    return base + timedelta(seconds=seconds)
+
+
+def generate(db: Session, size: DatasetSize, seed: int = 42) -> Dataset:
+    """고정 시드로 데이터를 생성해 커밋하고 ID 목록을 반환"""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    dataset = Dataset()
+
+    users = []
+    for i in range(size.users):
+        user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        users.append({
+            "id": user_id,
+            "kakao_id": f"bench-{i}",
+            "nickname": f"사용자{i}",
+            "profile_image": f"/uploads/profiles/{i}.jpg",
+        })
+        dataset.user_ids.append(user_id)
+    db.execute(insert(User), users)
+
+    guides = []
+    for i, user_id in enumerate(dataset.user_ids[:size.guides]):
+        guide_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        guides.append({
+            "id": guide_id,
+            "user_id": user_id,
+            "bio": f"가이드 {i} 소개",
+            "rating": round(rng.uniform(3.0, 5.0), 2),
+            "total_reviews": rng.randint(0, 300),
+            "is_approved": True,
+            "created_at": _timestamp(base, i),
+            "updated_at": _timestamp(base, i),
+        })
+        dataset.guide_ids.append(guide_id)
+        dataset.guide_user_ids.append(user_id)
+    db.execute(insert(Guide), guides)
+
+    region_pairs = [(category, city) for category, cities in REGION_DATA.items() for city in cities]
+    stories = []
+    for i in range(size.stories):
+        story_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        guide_index = rng.randrange(len(dataset.guide_ids))
+        category, city = rng.choice(region_pairs)
+        created_at = _timestamp(base, 3600 * i)
+        stories.append({
+            "id": story_id,
+            "user_id": dataset.guide_user_ids[guide_index],
+            "guide_id": dataset.guide_ids[guide_index],
+            "region_id1": category,
+            "region_id2": city,
+            "title": f"{city} 여행 이야기 {i}",
+            "content": f"{city}에서 즐기는 {rng.choice(CATEGORIES)} 코스 소개",
+            "media_type": "image",
+            "media_url": f"/uploads/stories/{i}.jpg",
+            "thumbnail_url": f"/uploads/thumbnails/{i}.jpg",
+            "category": rng.choice(CATEGORIES),
+            "view_count": rng.randint(0, 5000),
+            "like_count": 0,
+            "is_active": True,
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+        dataset.story_ids.append(story_id)
+
+    like_pairs = set()
+    while len(like_pairs) < min(size.likes, size.users * size.stories):
+        like_pairs.add((rng.choice(dataset.user_ids), rng.choice(dataset.story_ids)))
+    like_counts: Dict[str, int] = {}
+    likes = []
+    for n, (user_id, story_id) in enumerate(sorted(like_pairs)):
+        likes.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "user_id": user_id,
+            "story_id": story_id,
+            "created_at": _timestamp(base, n),
+        })
+        like_counts[story_id] = like_counts.get(story_id, 0) + 1
+    for story in stories:
+        story["like_count"] = like_counts.get(story["id"], 0)
+    db.execute(insert(Story), stories)
+    db.execute(insert(StoryLike), likes)
+
+    comments = []
+    parent_ids = []
+    for i in range(size.comments):
+        comment_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        # 약 30%는 대댓글
+        parent = rng.choice(parent_ids) if parent_ids and rng.random() < 0.3 else None
+        story_id = parent[1] if parent else rng.choice(dataset.story_ids)
+        comments.append({
+            "id": comment_id,
+            "story_id": story_id,
+            "user_id": rng.choice(dataset.user_ids),
+            "content": f"댓글 {i}",
+            "parent_id": parent[0] if parent else None,
+            "created_at": _timestamp(base, 60 * i),
+            "updated_at": _timestamp(base, 60 * i),
+        })
+        if not parent:
+            parent_ids.append((comment_id, story_id))
+    db.execute(insert(StoryComment), comments)
+
+    requests = []
+    rooms = []
+    messages = []
+    unread_counters = []
+    travelers = dataset.user_ids[size.guides:]
+    room_pairs = set()
+    while len(room_pairs) < min(size.chat_rooms, len(travelers) * size.guides):
+        room_pairs.add((rng.randrange(len(travelers)), rng.randrange(size.guides)))
+    for n, (traveler_index, guide_index) in enumerate(sorted(room_pairs)):
+        traveler_id = travelers[traveler_index]
+        guide_user_id = dataset.guide_user_ids[guide_index]
+        request_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        room_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        requests.append({
+            "id": request_id,
+            "user_id": traveler_id,
+            "guide_id": dataset.guide_ids[guide_index],
+            "matching_type": MatchingType.online_chat,
+            "status": MatchingStatus.accepted,
+            "requested_date": date(2025, 6, 1) + timedelta(days=n % 30),
+            "message": "함께 여행하고 싶어요",
+            "created_at": _timestamp(base, 600 * n),
+            "updated_at": _timestamp(base, 600 * n + 300),
+        })
+        last_message_at = base + timedelta(seconds=600 * n + size.messages_per_room * 30)
+        rooms.append({
+            "id": room_id,
+            "user_id": traveler_id,
+            "guide_id": guide_user_id,
+            "matching_request_id": request_id,
+            "last_message": f"메시지 {size.messages_per_room - 1}",
+            "last_message_at": last_message_at,
+            "is_active": True,
+        })
+        for m in range(size.messages_per_room):
+            sender_id, receiver_id = (traveler_id, guide_user_id) if m % 2 == 0 else (guide_user_id, traveler_id)
+            messages.append({
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "chat_room_id": room_id,
+                "matching_request_id": request_id,
+                "sender_id": sender_id,
+                "receiver_id": receiver_id,
+                "message": f"메시지 {m}",
+                "is_read": m < size.messages_per_room - 5,
+                "created_at": _timestamp(base, 600 * n + m * 30),
+            })
+        unread = {}
+        for message in messages[-size.messages_per_room:]:
+            if not message["is_read"]:
+                unread[message["receiver_id"]] = unread.get(message["receiver_id"], 0) + 1
+        unread_counters.extend(
+            {"chat_room_id": room_id, "user_id": user_id, "count": count} for user_id, count in unread.items()
+        )
+        dataset.chat_rooms[room_id] = (traveler_id, guide_user_id)
+    db.execute(insert(MatchingRequest), requests)
+    db.execute(insert(ChatRoom), rooms)
+    db.execute(insert(ChatMessage), messages)
+    if unread_counters:
+        db.execute(insert(ChatUnreadCounter), unread_counters)
+
+    db.commit()
+    return dataset
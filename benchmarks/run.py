@@ -0,0 +1,299 @@
+"""
+핵심 API 흐름 벤치마크 실행기
+
+합성 데이터를 생성한 SQLite(또는 지정한 DB)에 대해 시나리오별로 요청을 보내고
+RPS, p50/p95/p99 지연 시간, 요청당 쿼리 수를 측정해 저장된 baseline과 비교합니다.
+
+사용 예:
+    python -m benchmarks.run                                   # 실행 후 baseline과 비교 (회귀 시 exit 1)
+    python -m benchmarks.run --update-baseline                 # 현재 결과를 baseline으로 저장
+    python -m benchmarks.run --scenarios home_feed,chat_history --requests 500 --concurrency 16
+    python -m benchmarks.run --database-url mysql+mysqlconnector://... --base-url http://localhost:8005
+        (실행 중인 서버 대상: 서버와 같은 DB, 같은 SECRET_KEY를 사용해야 함)
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 크기를 보고할 테이블 (쓰기 시나리오로 행이 늘어나는 테이블)
+STORAGE_TABLES = ("chat_messages", "story_likes")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Story Book API benchmark")
+    parser.add_argument("--database-url", help="벤치마크 DB URL (기본: 임시 SQLite 파일)")
+    parser.add_argument("--base-url", help="실행 중인 서버 URL (기본: 프로세스 내 ASGI 호출)")
+    parser.add_argument("--scenarios", help="쉼표로 구분한 시나리오 이름 (기본: 전체)")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 측정 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="시나리오별 워밍업 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=float, default=1.0, help="데이터셋 크기 배율")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="결과를 baseline으로 저장")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5,
+                        help="p95 증가 / RPS 감소 허용 비율 (기본 50%%, 머신 차이 고려)")
+    parser.add_argument("--query-tolerance", type=float, default=0.1, help="요청당 쿼리 수 증가 허용 비율")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    return parser.parse_args()
+
+
+def percentile(sorted_values, p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client, scenario, data, total_requests: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    counter = itertools.count()
+    latencies = []
+    query_counts = []
+    status_errors = {}
+
+    async def worker():
+        while next(counter) < total_requests:
+            start = time.perf_counter()
+            response = await scenario(client, data, rng)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                status_errors[response.status_code] = status_errors.get(response.status_code, 0) + 1
+            query_count = response.headers.get("x-db-query-count")
+            if query_count is not None:
+                query_counts.append(int(query_count))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(status_errors.values()),
+        "error_statuses": {str(k): v for k, v in status_errors.items()},
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_request": round(statistics.mean(query_counts), 2) if query_counts else None,
+    }
+
+
+def compare(results: dict, baseline: dict, latency_tolerance: float, query_tolerance: float) -> list:
+    """baseline 대비 회귀 목록 반환"""
+    regressions = []
+    for name, current in results.items():
+        if current["errors"]:
+            regressions.append(f"{name}: {current['errors']} error responses {current['error_statuses']}")
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + latency_tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']}ms > baseline {base['p95_ms']}ms")
+        if current["rps"] < base["rps"] * (1 - latency_tolerance):
+            regressions.append(f"{name}: RPS {current['rps']} < baseline {base['rps']}")
+        if (
+            current["queries_per_request"] is not None
+            and base.get("queries_per_request") is not None
+            and current["queries_per_request"] > base["queries_per_request"] * (1 + query_tolerance) + 0.5
+        ):
+            regressions.append(
+                f"{name}: queries/request {current['queries_per_request']} > baseline {base['queries_per_request']}"
+            )
+    return regressions
+
+
+def table_sizes(engine, tables) -> dict:
+    """테이블별 행 수와 데이터/인덱스 크기 (bytes)
+
+    MySQL은 ANALYZE TABLE 후 information_schema 값, SQLite는 dbstat 가상 테이블의 페이지 합계
+    """
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    sizes = {}
+    with engine.connect() as conn:
+        for table in tables:
+            rows = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            if engine.dialect.name == "mysql":
+                conn.execute(text(f"ANALYZE TABLE {table}")).fetchall()
+                data_bytes, index_bytes = conn.execute(text(
+                    "SELECT data_length, index_length FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = :table"
+                ), {"table": table}).one()
+            elif engine.dialect.name == "sqlite":
+                try:
+                    pages = dict(conn.execute(text(
+                        "SELECT name, SUM(pgsize) FROM dbstat WHERE name = :table "
+                        "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table) "
+                        "GROUP BY name"
+                    ), {"table": table}).all())
+                except OperationalError:
+                    # SQLITE_ENABLE_DBSTAT_VTAB 없이 빌드된 SQLite
+                    return {}
+                data_bytes = pages.pop(table, 0)
+                index_bytes = sum(pages.values())
+            else:
+                continue
+            sizes[table] = {"rows": rows, "data_bytes": int(data_bytes), "index_bytes": int(index_bytes)}
+    return sizes
+
+
+def print_report(results: dict, baseline: dict):
+    header = f"{'scenario':<16}{'RPS':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}   baseline p95 / queries"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        base = baseline.get("scenarios", {}).get(name, {})
+        base_text = f"{base.get('p95_ms', '-')} / {base.get('queries_per_request', '-')}" if base else "-"
+        queries = "-" if r["queries_per_request"] is None else r["queries_per_request"]
+        print(f"{name:<16}{r['rps']:>9}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{queries:>9}{r['errors']:>8}   {base_text}")
+
+
+def print_storage(sizes: dict, baseline: dict):
+    header = f"{'table':<16}{'rows':>9}{'data KB':>10}{'index KB':>10}   baseline data / index KB"
+    print(header)
+    print("-" * len(header))
+    for table, size in sizes.items():
+        base = baseline.get("storage", {}).get(table)
+        base_text = f"{base['data_bytes'] // 1024} / {base['index_bytes'] // 1024}" if base else "-"
+        print(f"{table:<16}{size['rows']:>9}{size['data_bytes'] // 1024:>10}{size['index_bytes'] // 1024:>10}   {base_text}")
+
+
+async def main_async(args) -> int:
+    import httpx
+    from app.core.database import SessionLocal, Base, engine
+    from app.models.user import User
+    from benchmarks.datagen import DatasetSize, generate
+    from benchmarks.scenarios import SCENARIOS
+
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+        return 2
+
+    default_size = DatasetSize()
+    size = DatasetSize(**{k: max(1, int(v * args.scale)) for k, v in vars(default_size).items()})
+
+    app = None
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+        Base.metadata.create_all(bind=engine)
+    else:
+        import main as app_main  # 테이블 생성 포함
+        app = app_main.app
+        await app.router.startup()
+        client = httpx.AsyncClient(app=app, base_url="http://benchmark", timeout=30)
+
+    # 요청 로그가 측정값에 영향을 주지 않도록 로그 레벨 조정
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app.core.query_stats").setLevel(logging.ERROR)
+
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.kakao_id.like("bench-%")).count():
+            print("Benchmark DB is not empty; use a fresh --database-url")
+            return 2
+        started = time.perf_counter()
+        data = generate(db, size, seed=args.seed)
+        print(f"Generated dataset {vars(size)} in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+    results = {}
+    try:
+        for index, name in enumerate(names):
+            scenario = SCENARIOS[name]
+            if args.warmup:
+                await run_scenario(client, scenario, data, args.warmup, args.concurrency, args.seed + 1000 + index)
+            results[name] = await run_scenario(
+                client, scenario, data, args.requests, args.concurrency, args.seed + index
+            )
+    finally:
+        await client.aclose()
+        if app is not None:
+            await app.router.shutdown()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    # 쓰기 시나리오 이후의 테이블 크기 (ID 컬럼 타입 등 저장 형식 변경 효과 확인용)
+    sizes = table_sizes(engine, STORAGE_TABLES)
+
+    print()
+    print_report(results, baseline)
+    if sizes:
+        print()
+        print_storage(sizes, baseline)
+
+    meta = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "scale": args.scale,
+        "database": "sqlite" if not args.database_url else args.database_url.split(":", 1)[0],
+    }
+    output = {"meta": meta, "scenarios": results, "storage": sizes}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    if baseline and baseline.get("meta") != meta:
+        print(f"\nWarning: baseline was recorded with {baseline.get('meta')}, current run uses {meta}")
+
+    regressions = compare(results, baseline, args.latency_tolerance, args.query_tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("\nNo regressions against baseline" if baseline else "\nNo baseline to compare against")
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+
+    # 앱 모듈 import 전에 DB URL 지정 (settings는 import 시점에 로드됨)
+    tmp_dir = None
+    if not args.database_url:
+        tmp_dir = tempfile.mkdtemp(prefix="storybook-bench-")
+        os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    else:
+        os.environ["SQLALCHEMY_DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SQL_QUERY_STATS_ENABLED", "true")
+    os.environ.setdefault("SQL_N_PLUS_ONE_RAISE", "false")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    try:
+        return asyncio.run(main_async(args))
+    finally:
+        if tmp_dir:
+            import shutil
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
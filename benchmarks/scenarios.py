@@ -0,0 +1,100 @@
+"""
+벤치마크 시나리오 정의
+각 시나리오는 (클라이언트, 데이터셋, 난수 생성기)를 받아 요청 하나를 보내고 응답을 반환합니다.
+"""
+from typing import Callable, Dict, Awaitable
+import random
+
+import httpx
+
+from app.core.security import create_access_token
+from benchmarks.datagen import Dataset
+
+API = "/api/v1"
+
+_token_cache: Dict[str, str] = {}
+
+
+def auth_headers(user_id: str) -> Dict[str, str]:
+    token = _token_cache.get(user_id)
+    if token is None:
+        token = _token_cache[user_id] = create_access_token({"sub": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def home_feed(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> httpx.Response:
+    """홈 피드 (로그인 사용자, 최신순)"""
+    user_id = rng.choice(data.user_ids)
+    return await client.get(f"{API}/stories/", params={"page": 1, "limit": 20}, headers=auth_headers(user_id))
+
+
+async def story_detail(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> httpx.Response:
+    """스토리 상세"""
+    user_id = rng.choice(data.user_ids)
+    story_id = rng.choice(data.story_ids)
+    return await client.get(f"{API}/stories/{story_id}", headers=auth_headers(user_id))
+
+
+async def comments(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> httpx.Response:
+    """댓글 목록"""
+    story_id = rng.choice(data.story_ids)
+    return await client.get(f"{API}/stories/{story_id}/comments")
+
+
+async def like_toggle(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> httpx.Response:
+    """좋아요 토글 (쓰기)"""
+    user_id = rng.choice(data.user_ids)
+    story_id = rng.choice(data.story_ids)
+    return await client.post(f"{API}/stories/{story_id}/like", headers=auth_headers(user_id))
+
+
+async def matching_list(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> httpx.Response:
+    """가이드가 받은 매칭 요청 목록"""
+    user_id = rng.choice(data.guide_user_ids)
+    return await client.get(
+        f"{API}/matching/requests",
+        params={"as_guide": "true", "page": 1, "limit": 20},
+        headers=auth_headers(user_id)
+    )
+
+
+async def chat_history(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> httpx.Response:
+    """채팅 메시지 목록"""
+    room_id = rng.choice(list(data.chat_rooms))
+    user_id = data.chat_rooms[room_id][rng.randrange(2)]
+    return await client.get(
+        f"{API}/matching/chat-rooms/{room_id}/messages",
+        params={"limit": 50},
+        headers=auth_headers(user_id)
+    )
+
+
+async def chat_rooms(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> httpx.Response:
+    """채팅 탭 (가이드의 채팅방 목록)"""
+    user_id = rng.choice(data.guide_user_ids)
+    return await client.get(f"{API}/matching/chat-rooms", params={"limit": 20}, headers=auth_headers(user_id))
+
+
+async def chat_send(client: httpx.AsyncClient, data: Dataset, rng: random.Random) -> httpx.Response:
+    """채팅 메시지 전송 (쓰기, chat_messages INSERT)"""
+    room_id = rng.choice(list(data.chat_rooms))
+    user_id = data.chat_rooms[room_id][rng.randrange(2)]
+    return await client.post(
+        f"{API}/matching/chat-rooms/{room_id}/messages",
+        json={"message": f"benchmark message {rng.getrandbits(32):08x}"},
+        headers=auth_headers(user_id)
+    )
+
+
+Scenario = Callable[[httpx.AsyncClient, Dataset, random.Random], Awaitable[httpx.Response]]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "home_feed": home_feed,
+    "story_detail": story_detail,
+    "comments": comments,
+    "like_toggle": like_toggle,
+    "matching_list": matching_list,
+    "chat_history": chat_history,
+    "chat_rooms": chat_rooms,
+    "chat_send": chat_send,
+}
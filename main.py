@@ -5,6 +5,16 @@ from app.api.api import api_router
 from app.api.endpoints.websocket import router as websocket_router
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.pool_monitor import get_pool_status
+from app.core.query_stats import install_query_listeners, query_stats_scope, report_query_stats, current_query_stats
+from app.core import metrics
+from app.websocket.chat_websocket import manager as chat_manager
+from app.services.chat_writer import chat_writer
+from app.services.guide_directory import guide_directory
+from app.services.guide_index import guide_index
+from app.services.story_search import story_search_index
+from app.services import region_counters  # noqa: F401 (스토리 변경 시 regions.story_count 갱신 이벤트 등록)
+import asyncio
 import logging
 import time
 import os
@@ -30,7 +40,7 @@ app = FastAPI(
 
 # 422 에러 핸들러
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -85,6 +95,59 @@ async def log_requests(request: Request, call_next):
     
     return response
 
+# 요청 지표 미들웨어 (라우트 템플릿별 지연 시간, 응답 크기, DB 시간)
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    if not settings.METRICS_ENABLED:
+        return await call_next(request)
+    
+    start_time = time.perf_counter()
+    metrics.http_requests_in_flight.inc()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        metrics.http_requests_in_flight.dec()
+        route = metrics.route_template(request.app, request.scope)
+        metrics.http_requests_total.inc(method=request.method, route=route, status=status_code)
+        metrics.http_request_duration_seconds.observe(
+            time.perf_counter() - start_time, method=request.method, route=route
+        )
+    
+    content_length = response.headers.get("content-length")
+    if content_length:
+        metrics.http_response_size_bytes.observe(int(content_length), route=route)
+    
+    stats = current_query_stats()
+    if stats is not None and stats.count:
+        metrics.http_request_db_seconds.observe(stats.total_time, route=route)
+        metrics.http_request_db_queries.observe(stats.count, route=route)
+    
+    return response
+
+# SQL 쿼리 통계 미들웨어 (Server-Timing 헤더, N+1 감지)
+if settings.SQL_QUERY_STATS_ENABLED:
+    install_query_listeners()
+
+@app.middleware("http")
+async def track_query_stats(request: Request, call_next):
+    if not settings.SQL_QUERY_STATS_ENABLED:
+        return await call_next(request)
+    
+    with query_stats_scope() as stats:
+        response = await call_next(request)
+    
+    report_query_stats(
+        request.method,
+        request.url.path,
+        response,
+        stats,
+        threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+        strict=settings.SQL_N_PLUS_ONE_RAISE
+    )
+    return response
+
 # API 라우터 등록
 app.include_router(api_router, prefix="/api/v1")
 
@@ -131,9 +194,64 @@ async def add_cors_headers_for_static(request: Request, call_next):
         response.headers["Access-Control-Allow-Headers"] = "*"
     return response
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    # 다른 워커의 스냅샷은 flush 주기의 3배가 지나면 게이지를 제외 (종료된 워커)
+    body = metrics.registry.render(gauge_max_age=settings.METRICS_FLUSH_INTERVAL * 3)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    # 커넥션 풀 사용률이 경고 기준을 넘으면 degraded로 보고
+    pools = get_pool_status()
+    saturated = any(pool["saturated"] for pool in pools.values())
+    return {
+        "status": "degraded" if saturated else "healthy",
+        "db_pool": pools
+    }
+
+# 워커별 지표 스냅샷 기록 (uvicorn --workers N 집계용)
+async def _flush_metrics_periodically():
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL)
+        try:
+            metrics.registry.write_snapshot()
+        except OSError as e:
+            logger.error(f"Failed to write metrics snapshot: {e}")
+
+@app.on_event("startup")
+async def start_metrics_flush():
+    if settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR:
+        metrics.registry.multiproc_dir = settings.METRICS_MULTIPROC_DIR
+        metrics.registry.write_snapshot()
+        app.state.metrics_flush_task = asyncio.create_task(_flush_metrics_periodically())
+
+@app.on_event("shutdown")
+async def stop_metrics_flush():
+    task = getattr(app.state, "metrics_flush_task", None)
+    if task:
+        task.cancel()
+        metrics.registry.write_snapshot(final=True)
+
+# 채팅 pub/sub 백본 (워커 간 WebSocket 메시지 전달), 메시지 그룹 커밋 저장기, 가이드 캐시/검색 인덱스, 스토리 검색 색인
+@app.on_event("startup")
+async def start_chat_pubsub():
+    await chat_manager.start()
+    chat_writer.start()
+    await guide_directory.start(chat_manager.pubsub)
+    guide_index.start()
+    story_search_index.start()
+
+@app.on_event("shutdown")
+async def stop_chat_pubsub():
+    guide_directory.stop()
+    await guide_index.stop()
+    await story_search_index.stop()
+    # 대기 중인 메시지를 먼저 저장
+    await chat_writer.stop()
+    await chat_manager.stop()
 
 if __name__ == "__main__":
     import uvicorn
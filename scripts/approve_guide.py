@@ -0,0 +1,63 @@
+"""
+가이드 승인 스크립트
+가이드 신청을 승인하거나(--revoke: 승인 취소) 실행 중인 서버의 가이드 정보 캐시를 무효화합니다.
+DB를 직접 수정하는 대신 이 스크립트를 사용해야 승인 취소가 GUIDE_CACHE_TTL을 기다리지 않고 반영됩니다.
+
+사용 예:
+    python scripts/approve_guide.py <user_id 또는 guide_id>
+    python scripts/approve_guide.py <user_id 또는 guide_id> --revoke
+"""
+import sys
+import os
+import argparse
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Guide
+from app.services.guide_directory import GUIDE_INVALIDATION_CHANNEL
+from app.websocket.pubsub import create_pubsub
+
+async def publish_invalidation(user_id: str):
+    """서버 워커들의 가이드 캐시 무효화 (CHAT_PUBSUB_BACKEND=redis일 때만 다른 프로세스에 전달됨)"""
+    pubsub = create_pubsub(settings.CHAT_PUBSUB_BACKEND, settings.REDIS_URL)
+    try:
+        await pubsub.publish(GUIDE_INVALIDATION_CHANNEL, {"user_ids": [user_id]})
+    finally:
+        await pubsub.stop()
+
+def main():
+    """가이드 승인 / 승인 취소"""
+    parser = argparse.ArgumentParser(description="가이드 승인")
+    parser.add_argument("id", help="가이드 ID 또는 사용자 ID")
+    parser.add_argument("--revoke", action="store_true", help="승인 취소")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    
+    try:
+        guide = db.query(Guide).filter((Guide.id == args.id) | (Guide.user_id == args.id)).first()
+        if not guide:
+            print(f"가이드를 찾을 수 없습니다: {args.id}")
+            return
+        
+        guide.is_approved = not args.revoke
+        db.commit()
+        print(f"가이드 {guide.id} (사용자 {guide.user_id}) {'승인 취소' if args.revoke else '승인'} 완료")
+        
+        if settings.CHAT_PUBSUB_BACKEND == "redis":
+            asyncio.run(publish_invalidation(guide.user_id))
+            print("서버 가이드 캐시 무효화 완료")
+        elif args.revoke:
+            # 미승인 가이드는 캐시하지 않으므로 승인은 바로 반영되지만, 승인 취소는 캐시 만료를 기다려야 함
+            print(f"CHAT_PUBSUB_BACKEND={settings.CHAT_PUBSUB_BACKEND}: 실행 중인 서버에는 최대 {settings.GUIDE_CACHE_TTL}초 후 반영")
+        
+    except Exception as e:
+        print(f"오류 발생: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
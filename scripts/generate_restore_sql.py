@@ -0,0 +1,102 @@
+"""
+복원 스크립트 생성 스크립트
+모델 정의(alembic 최신 리비전과 같은 스키마)로 restore_database.sql을 다시 만듭니다.
+모델이나 마이그레이션을 바꾼 뒤 실행합니다. (DB 연결 불필요)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import glob
+import re
+
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.core.database import Base
+from app.core.region_data import REGION_DATA
+from app.models import user, story, guide, region, matching, bookmark, chat, report  # noqa: F401 (테이블 등록)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_PATH = os.path.join(ROOT, "restore_database.sql")
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _alembic_head() -> str:
+    """alembic/versions에서 다른 리비전이 가리키지 않는 리비전 (프로젝트의 alembic 디렉토리가 패키지를 가려 파일을 직접 읽음)"""
+    revisions, parents = set(), set()
+    for path in glob.glob(os.path.join(ROOT, "alembic", "versions", "*.py")):
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        revisions.add(re.search(r"^revision = '([^']+)'", source, re.M).group(1))
+        parent = re.search(r"^down_revision = '([^']+)'", source, re.M)
+        if parent:
+            parents.add(parent.group(1))
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise RuntimeError(f"alembic head is not unique: {sorted(heads)}")
+    return heads.pop()
+
+
+def _ddl(element, dialect) -> str:
+    # SQLAlchemy 출력의 탭/줄 끝 공백 정리
+    return "\n".join(line.rstrip().replace("\t", "    ") for line in str(element.compile(dialect=dialect)).strip().splitlines()) + ";"
+
+
+def generate() -> str:
+    dialect = mysql.dialect()
+    head = _alembic_head()
+
+    lines = [
+        "-- StoryBook 데이터베이스 복원 스크립트",
+        "-- scripts/generate_restore_sql.py로 생성 (직접 수정하지 말 것)",
+        f"-- 설명: MySQL 8.0+ 데이터베이스 완전 복원 (alembic 리비전 {head} 기준 스키마)",
+        "-- ID는 BINARY(16) UUID, 시각은 DATETIME(6)",
+        "",
+        "-- 1. 데이터베이스 생성",
+        "CREATE DATABASE IF NOT EXISTS storybook CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;",
+        "USE storybook;",
+    ]
+
+    step = 2
+    for table in Base.metadata.sorted_tables:
+        lines += ["", f"-- {step}. {table.name} 테이블", _ddl(CreateTable(table), dialect)]
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            lines.append(_ddl(CreateIndex(index), dialect))
+        step += 1
+
+    lines += ["", f"-- {step}. 지역 데이터 삽입"]
+    for category, cities in REGION_DATA.items():
+        lines += [f"-- {category}", "INSERT INTO regions (id, region_name, city, district, story_count) VALUES"]
+        lines += [
+            f"(UUID_TO_BIN(UUID()), {_quote(f'{category} - {city}')}, {_quote(category)}, {_quote(city)}, 0)"
+            + (";" if i == len(cities) - 1 else ",")
+            for i, city in enumerate(cities)
+        ]
+        lines.append("")
+    step += 1
+
+    # 복원한 DB에 alembic upgrade를 실행해도 이미 반영된 마이그레이션을 다시 적용하지 않도록 표시
+    lines += [
+        f"-- {step}. 마이그레이션 리비전 표시",
+        "CREATE TABLE IF NOT EXISTS alembic_version (",
+        "    version_num VARCHAR(32) NOT NULL,",
+        "    CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num)",
+        ");",
+        "DELETE FROM alembic_version;",
+        f"INSERT INTO alembic_version (version_num) VALUES ({_quote(head)});",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """restore_database.sql 생성"""
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        f.write(generate())
+    print(f"{OUTPUT_PATH} 생성 완료")
+
+if __name__ == "__main__":
+    main()
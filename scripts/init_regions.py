@@ -9,7 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.core.database import SessionLocal
 from app.models.region import Region
 from app.core.region_data import REGION_DATA
-import uuid
+from app.core.ids import new_id
 
 def init_regions():
     """지역 데이터 초기화"""
@@ -28,7 +28,7 @@ def init_regions():
         for category, cities in REGION_DATA.items():
             for city in cities:
                 region = Region(
-                    id=str(uuid.uuid4()),
+                    id=new_id(),
                     region_name=f"{category} - {city}",
                     city=category,  # 큰 카테고리를 city로 사용
                     district=city,  # 실제 도시명을 district로 사용
@@ -0,0 +1,30 @@
+"""
+지역 스토리 수 재계산 스크립트
+regions.story_count를 활성 스토리 수(region_id1/region_id2 기준)로 다시 계산합니다.
+카운터 도입 이전 데이터를 반영하거나 벌크 작업 후 값을 맞출 때 실행합니다.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.region_counters import recompute_region_counts
+
+def main():
+    """지역 스토리 수 재계산"""
+    db = SessionLocal()
+    
+    try:
+        print("지역 스토리 수 재계산 중...")
+        updated = recompute_region_counts(db)
+        db.commit()
+        print(f"총 {updated}개 지역 갱신 완료")
+        
+    except Exception as e:
+        print(f"오류 발생: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()